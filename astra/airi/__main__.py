@@ -4,8 +4,8 @@ import argparse
 import sys
 
 from astra.game.actions import apply_action
-from astra.game.logbook import append_command, append_events
-from astra.game.storage import load_state, save_state
+from astra.game.logbook import append_command, append_events, logbook_path
+from astra.game.storage import load_state, save_state, state_format, state_path
 
 from .stub import StubAiri
 
@@ -75,8 +75,8 @@ def main(argv: list[str] | None = None) -> int:
         save_state(s1, profile=profile)
         append_command(profile, pr0.action, **pr0.kwargs)
         append_events(profile, events)
-        print(f"- saved: data/profiles/{profile}/game_state.json")
-        print(f"- logbook: data/profiles/{profile}/logbook.jsonl")
+        print(f"- saved: {state_path(profile, fmt=state_format(profile)).as_posix()}")
+        print(f"- logbook: {logbook_path(profile).as_posix()}")
     else:
         print("- not saved (SAFE default). Use: --write")
     return 0
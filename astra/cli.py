@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import argparse
 import sys
+from pathlib import Path
 
 from .doctor import run_doctor
 from .game.actions import apply_action
-from .game.logbook import append_snapshot, append_tx
-from .game.storage import load_state, save_state
+from .game.logbook import append_snapshot, append_tx, logbook_path
+from .game.storage import load_state, save_state, state_format, state_path
 from .report import make_latest_report_zip
 from .router import dispatch
 
@@ -75,8 +76,8 @@ def _run_game_tick(*, profile: str, write: bool, seed: int | None) -> int:
         save_state(s1, profile=profile)
         append_tx(profile, "tick", events, seed=seed)
         append_snapshot(profile, s1)
-        print(f"- saved: data/profiles/{profile}/game_state.json")
-        print(f"- logbook: data/profiles/{profile}/logbook.jsonl")
+        print(f"- saved: {state_path(profile, fmt=state_format(profile)).as_posix()}")
+        print(f"- logbook: {logbook_path(profile).as_posix()}")
     else:
         print("- not saved (SAFE default). Use: --write")
     return 0
@@ -86,10 +87,13 @@ def _run_game_snapshot(*, profile: str) -> int:
     from .game.storage import load_state
 
     s = load_state(profile=profile)
-    append_snapshot(profile, s)
+    kind = append_snapshot(profile, s)
     print("SNAPSHOT")
     print(f"- profile: {profile}")
-    print("- appended: snapshot -> logbook.jsonl")
+    if kind == "skipped":
+        print("- skipped: state unchanged since the last snapshot")
+    else:
+        print(f"- appended: {kind} snapshot -> logbook.jsonl")
     return 0
 
 
@@ -108,7 +112,7 @@ def _run_game_move(*, profile: str, write: bool, sector: str) -> int:
         save_state(s1, profile=profile)
         append_tx(profile, "move", events, sector=sector)
         append_snapshot(profile, s1)
-        print(f"- saved: data/profiles/{profile}/game_state.json")
+        print(f"- saved: {state_path(profile, fmt=state_format(profile)).as_posix()}")
     else:
         print("- not saved (SAFE default). Use: --write")
     return 0
@@ -129,6 +133,159 @@ def _run_game_replay(*, profile: str) -> int:
     return 0
 
 
+def _int_list(raw: str | None, default: int) -> list[int]:
+    if not raw:
+        return [default]
+    return [int(x) for x in raw.split(",") if x.strip()]
+
+
+def _run_balance_sweep(*, profile: str, ns: argparse.Namespace) -> int:
+    from .game.balance import load_balance
+    from .game.profiles import profile_dir
+    from .game.sweep import make_grid, sweep, write_csv, write_npz
+
+    base = load_balance(profile=profile)
+    grid = make_grid(
+        _int_list(ns.xp, base.xp_per_tick),
+        _int_list(ns.hull_loss, base.anomaly_hull_loss),
+        _int_list(ns.power_loss, base.anomaly_power_loss),
+    )
+    seeds = range(ns.seed_start, ns.seed_start + ns.seeds)
+    results = sweep(grid, seeds, ns.days, jobs=ns.jobs)
+
+    print("BALANCE SWEEP")
+    print(f"- profile: {profile}")
+    print(f"- grid: {len(grid)} x seeds: {len(seeds)} x days: {ns.days} (jobs={ns.jobs})")
+    for r in results:
+        sm = r.summary()
+        print(
+            f"- xp={sm['xp_per_tick']} hull_loss={sm['anomaly_hull_loss']} power_loss={sm['anomaly_power_loss']}"
+            f" game_over={sm['game_over_rate']} day_p50={sm['game_over_day_p50']}"
+            f" level_mean={sm['level_mean']} power_down={sm['power_down_freq']}"
+        )
+
+    out = Path(ns.out) if ns.out else profile_dir(profile, create=True) / "balance_sweep.csv"
+    if out.suffix == ".npz":
+        write_npz(results, out)
+    else:
+        write_csv(results, out)
+    print(f"- out: {out}")
+    return 0
+
+
+def _run_profiles(cmd: str | None, *, profile: str, ns: argparse.Namespace) -> int:
+    from .game.profiles import enable_sharding, is_sharded, list_profiles, rebuild_index
+    from .paths import profiles_root
+
+    if cmd == "list":
+        names = list_profiles()
+        print("PROFILES")
+        print(f"- layout: {'sharded' if is_sharded() else 'flat'}")
+        print(f"- count: {len(names)}")
+        for name in names:
+            print(f"  * {name}")
+        return 0
+    if cmd == "reindex":
+        print("PROFILES REINDEX")
+        print(f"- added: {rebuild_index()}")
+        return 0
+    if cmd == "shard":
+        enable_sharding()
+        print("PROFILES SHARD")
+        print(f"- new profiles go to {profiles_root().as_posix()}/ab/cd/<name>; existing ones stay where they are")
+        return 0
+    if cmd == "export":
+        from .game.archive import export_profiles
+
+        names = None if ns.all else (ns.names or [profile])
+        counts = export_profiles(sys.stdout.buffer if ns.file == "-" else ns.file, names)
+        if ns.file != "-":  # stdout carries the archive
+            print("PROFILES EXPORT")
+            print(f"- to: {ns.file}")
+            for k, v in counts.items():
+                print(f"- {k}: {v}")
+        return 0
+    if cmd == "import":
+        from .game.archive import ArchiveError, import_profiles
+
+        print("PROFILES IMPORT")
+        try:
+            r = import_profiles(sys.stdin.buffer if ns.file == "-" else ns.file, jobs=ns.jobs, replace=ns.replace)
+        except (ArchiveError, OSError) as e:
+            print(f"- error: {e}")
+            return 1
+        for k in ("profiles", "imported", "skipped", "files", "errors"):
+            print(f"- {k}: {r[k]}")
+        for line in r["error_list"]:
+            print(f"  ! {line}")
+        return 1 if r["errors"] else 0
+    print("Use: python -m astra profiles (list|reindex|shard|export|import)")
+    return 1
+
+
+def _run_migrate(*, profile: str, ns: argparse.Namespace) -> int:
+    from .game.db import active_db
+    from .game.migrate_all import migrate_all
+    from .game.migrations import LATEST_SCHEMA_VERSION
+    from .game.profiles import safe_profile
+    from .paths import profiles_root
+
+    print("MIGRATE" + (" (dry run)" if ns.dry_run else ""))
+    if active_db() is not None:
+        print("- SQLite backend: states are stored by the current code, nothing to migrate")
+        return 0
+    r = migrate_all(
+        profiles=None if ns.all else [safe_profile(profile)], jobs=ns.jobs, dry_run=ns.dry_run, reindex=ns.reindex
+    )
+    print(f"- root: {profiles_root().as_posix()} (target schema_version={LATEST_SCHEMA_VERSION})")
+    for k in ("profiles", "resumed", "migrated", "current", "errors"):
+        print(f"- {k}: {r[k]}")
+    for sv, n in r["by_version"].items():
+        print(f"- schema_version {sv}: {n}")
+    for line in r["error_list"]:
+        print(f"  ! {line}")
+    return 1 if r["errors"] else 0
+
+
+def _run_db_migrate() -> int:
+    from .game.db import DB_FILE, db_path, enable_db, open_db
+    from .game.storage import migrate_profiles_to_db
+    from .paths import profiles_root
+
+    path = db_path()
+    fresh = not path.exists()
+    db = open_db(path)
+    try:
+        counts = migrate_profiles_to_db(db)
+    except BaseException:
+        if fresh:
+            _drop_db(path)
+        raise
+    print("DB MIGRATE")
+    print(f"- from: {profiles_root().as_posix()}")
+    print(f"- to: {path.as_posix()} (SQLite, WAL)")
+    for k in ("profiles", "skipped", "states", "records", "files", "errors"):
+        print(f"- {k}: {counts[k]}")
+    for line in counts["error_list"]:
+        print(f"  ! {line}")
+    if counts["errors"]:
+        if fresh:  # the file alone would switch every load to the database: leave none behind
+            _drop_db(path)
+            print(f"- {DB_FILE} removed: fix the profiles above and run again; nothing was changed")
+        return 1
+    enable_db()
+    print("- load/save/logbook now use the database; the profile directories were left in place")
+    return 0
+
+
+def _drop_db(path: Path) -> None:
+    from .game.db import close_all
+
+    close_all()
+    for p in (path, path.with_name(path.name + "-wal"), path.with_name(path.name + "-shm")):
+        p.unlink(missing_ok=True)
+
+
 def main(argv: list[str] | None = None) -> int:
     if argv is None:
         argv = sys.argv[1:]
@@ -145,6 +302,42 @@ def main(argv: list[str] | None = None) -> int:
     p_report = sub.add_parser("report")
     p_report.add_argument("--zip", action="store_true")
 
+    p_balance = sub.add_parser("balance")
+    balance_sub = p_balance.add_subparsers(dest="balance_cmd")
+    p_sweep = balance_sub.add_parser("sweep")
+    p_sweep.add_argument("--xp", help="comma list of xp_per_tick values")
+    p_sweep.add_argument("--hull-loss", help="comma list of anomaly_hull_loss values")
+    p_sweep.add_argument("--power-loss", help="comma list of anomaly_power_loss values")
+    p_sweep.add_argument("--seeds", type=int, default=100)
+    p_sweep.add_argument("--seed-start", type=int, default=1)
+    p_sweep.add_argument("--days", type=int, default=100)
+    p_sweep.add_argument("--jobs", type=int, default=1)
+    p_sweep.add_argument("--out", help="*.csv (default) or *.npz")
+
+    p_profiles = sub.add_parser("profiles", aliases=["profile"])
+    profiles_sub = p_profiles.add_subparsers(dest="profiles_cmd")
+    profiles_sub.add_parser("list")
+    profiles_sub.add_parser("reindex")
+    profiles_sub.add_parser("shard")
+    p_export = profiles_sub.add_parser("export")
+    p_export.add_argument("file", help="*.tar, *.tar.gz/*.tgz, or - for stdout")
+    p_export.add_argument("names", nargs="*", help="profiles (default: --profile)")
+    p_export.add_argument("--all", action="store_true")
+    p_import = profiles_sub.add_parser("import")
+    p_import.add_argument("file", help="archive from profiles export, or - for stdin")
+    p_import.add_argument("--jobs", type=int, default=1)
+    p_import.add_argument("--replace", action="store_true", help="overwrite existing profiles (default: skip)")
+
+    p_migrate = sub.add_parser("migrate")
+    p_migrate.add_argument("--all", action="store_true", help="every profile (default: --profile only)")
+    p_migrate.add_argument("--jobs", type=int, default=1)
+    p_migrate.add_argument("--dry-run", action="store_true", help="only count profiles per source schema_version")
+    p_migrate.add_argument("--reindex", action="store_true", help="rescan for profile dirs copied in by hand first")
+
+    p_db = sub.add_parser("db")
+    db_sub = p_db.add_subparsers(dest="db_cmd")
+    db_sub.add_parser("migrate")
+
     p_game = sub.add_parser("game")
     game_sub = p_game.add_subparsers(dest="game_cmd")
 
@@ -177,6 +370,24 @@ def main(argv: list[str] | None = None) -> int:
         print("Use: python -m astra report --zip [--profile X]")
         return 1
 
+    if ns.cmd == "balance":
+        if ns.balance_cmd == "sweep":
+            return _run_balance_sweep(profile=profile, ns=ns)
+        print("Use: python -m astra balance sweep [--xp 3,5] [--hull-loss 1,2] [--power-loss 1] ...")
+        return 1
+
+    if ns.cmd in ("profiles", "profile"):
+        return _run_profiles(ns.profiles_cmd, profile=profile, ns=ns)
+
+    if ns.cmd == "migrate":
+        return _run_migrate(profile=profile, ns=ns)
+
+    if ns.cmd == "db":
+        if ns.db_cmd == "migrate":
+            return _run_db_migrate()
+        print("Use: python -m astra db migrate")
+        return 1
+
     if ns.cmd == "game":
         if ns.game_cmd == "status":
             return _run_game_status(profile=profile)
@@ -5,51 +5,76 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from .game.db import active_db
+from .game.profiles import profile_dir
+from .paths import profiles_root
+
+STATE_FORMATS = ("json", "bin")  # game_state.json (indented, human-readable) / game_state.bin (astra.game.codec)
+
 
 @dataclass(frozen=True)
 class Config:
     profile: str = "offline"
     log_enabled: bool = False
     root: Path = Path(".")
+    state_format: str = "json"
+    migrate_on_read: bool = False  # rewrite old-schema state files in the current schema when loaded
 
 
 def config_path(root: Path | None = None, *, profile: str = "offline") -> Path:
     r = Path.cwd() if root is None else Path(root)
-    return r / "data" / "profiles" / str(profile) / "config.json"
+    return profile_dir(str(profile), root=profiles_root(root=r)) / "config.json"
 
 
 def load_config(root: Path | None = None, *, profile: str = "offline") -> Config:
     # Backward compatible: may be called as load_config() with no args.
     r = Path.cwd() if root is None else Path(root)
-    p = config_path(r, profile=profile)
-    if not p.exists():
+    db = active_db(r)
+    if db is not None:
+        text = db.read_file(str(profile), "config.json")
+    else:
+        p = config_path(r, profile=profile)
+        text = p.read_text(encoding="utf-8") if p.exists() else None
+    if text is None:
         return Config(profile=str(profile), log_enabled=False, root=r)
 
     try:
-        obj: dict[str, Any] = json.loads(p.read_text(encoding="utf-8"))
+        obj: dict[str, Any] = json.loads(text)
     except Exception:
         return Config(profile=str(profile), log_enabled=False, root=r)
 
+    state_format = str(obj.get("state_format", "json"))
     return Config(
         profile=str(obj.get("profile", profile)),
         log_enabled=bool(obj.get("log_enabled", False)),
         root=r,
+        state_format=state_format if state_format in STATE_FORMATS else "json",
+        migrate_on_read=bool(obj.get("migrate_on_read", False)),
     )
 
 
 def save_config(cfg: Config) -> Path:
-    p = config_path(cfg.root, profile=cfg.profile)
-    p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_text(
+    text = (
         json.dumps(
-            {"profile": cfg.profile, "log_enabled": cfg.log_enabled},
+            {
+                "profile": cfg.profile,
+                "log_enabled": cfg.log_enabled,
+                "state_format": cfg.state_format,
+                "migrate_on_read": cfg.migrate_on_read,
+            },
             ensure_ascii=False,
             indent=2,
         )
-        + "\n",
-        encoding="utf-8",
+        + "\n"
     )
+    db = active_db(cfg.root)
+    if db is not None:
+        db.write_file(cfg.profile, "config.json", text)
+        return db.path
+    profile_dir(cfg.profile, root=profiles_root(root=Path(cfg.root)), create=True)
+    p = config_path(cfg.root, profile=cfg.profile)
+    p.write_text(text, encoding="utf-8")
     return p
 
 
-__all__ = ["Config", "config_path", "load_config", "save_config"]
+__all__ = ["STATE_FORMATS", "Config", "config_path", "load_config", "save_config"]
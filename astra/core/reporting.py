@@ -5,16 +5,23 @@ import zipfile
 from datetime import datetime
 from pathlib import Path
 
-ERROR_DIR = Path("data") / "errors"
-ERROR_DIR.mkdir(parents=True, exist_ok=True)
+from ..game.profiles import profile_dir
+from ..paths import data_root, profiles_root
+
+
+def error_dir() -> Path:
+    """Error logs live on the cold tier (see astra.paths)."""
+    return data_root("cold") / "errors"
 
 
 def _next_error_file() -> Path:
-    logs = sorted(ERROR_DIR.glob("error_*.log"))
+    d = error_dir()
+    d.mkdir(parents=True, exist_ok=True)
+    logs = sorted(d.glob("error_*.log"))
     if not logs:
-        return ERROR_DIR / "error_0001.log"
+        return d / "error_0001.log"
     last = int(logs[-1].stem.split("_")[-1])
-    return ERROR_DIR / f"error_{last + 1:04d}.log"
+    return d / f"error_{last + 1:04d}.log"
 
 
 def log_exception(exc_type, exc, tb) -> None:
@@ -38,12 +45,11 @@ def log_exception(exc_type, exc, tb) -> None:
 
 
 def make_latest_report_zip(profile: str) -> Path | None:
-    logs = sorted(ERROR_DIR.glob("error_*.log"))
+    logs = sorted(error_dir().glob("error_*.log"))
     if not logs:
         return None
     latest = logs[-1]
-    out = Path("data") / "profiles" / profile / "report_latest.zip"
-    out.parent.mkdir(parents=True, exist_ok=True)
+    out = profile_dir(profile, root=profiles_root("cold"), create=True) / "report_latest.zip"
     with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as z:
         z.write(latest, arcname=latest.name)
     return out
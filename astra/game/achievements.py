@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
+
 from .state import GameState
 
 
-def check_achievements(state: GameState) -> list[str]:
+def unlocked_achievements(*, day: int, level: int, have: Iterable[str]) -> list[str]:
+    have_set = set(have)
     unlocked: list[str] = []
-    if state.day >= 1 and "Pierwszy dzień" not in state.achievements:
+    if day >= 1 and "Pierwszy dzień" not in have_set:
         unlocked.append("Pierwszy dzień")
-    if state.player.level >= 2 and "Awans: Poziom 2" not in state.achievements:
+    if level >= 2 and "Awans: Poziom 2" not in have_set:
         unlocked.append("Awans: Poziom 2")
     return unlocked
+
+
+def check_achievements(state: GameState) -> list[str]:
+    return unlocked_achievements(day=state.day, level=state.player.level, have=state.achievements)
@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import re
+import shutil
+import tarfile
+import tempfile
+import time
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Any
+
+from ..paths import profiles_root
+from .codec import encode_state
+from .db import ProfileDB, active_db
+from .logbook import SEGMENTS_DIR, segment_paths
+from .profiles import list_profiles, profile_dir, rebuild_index, safe_profile
+from .storage import STATE_FILES, read_state_file
+
+ARCHIVE_FORMAT = "astra-profiles"
+ARCHIVE_VERSION = 1
+MANIFEST = "MANIFEST.json"
+
+# Layout (a tar stream, gzip when the file name ends in .gz/.tgz):
+#   MANIFEST.json                          first member: {"format", "version", "profiles": [...]}
+#   profiles/<name>/<file>                 hot profile files (state, logbook tail, config/balance, ...)
+#   profiles/<name>/logbook/NNNNNN.jsonl   archived logbook segments (cold tier)
+# Members of one profile are contiguous, so an import can install a profile as soon as the stream moves on.
+_FILE = re.compile(r"[A-Za-z0-9_][A-Za-z0-9_.-]{0,63}")  # no dotfiles: temp files of atomic writes stay out
+_SEGMENT = re.compile(r"\d{6}\.jsonl")
+_DB_FILES = (".json",)  # with the SQLite backend these live in its files table, the rest in the profile dir
+_APPEND_BATCH = 1000
+
+
+class ArchiveError(ValueError):
+    """Data is not a profile archive this version can import."""
+
+
+def _write_mode(name: str | None) -> str:
+    return "w|gz" if name and name.endswith((".gz", ".tgz")) else "w|"
+
+
+def _add_stream(tar: tarfile.TarFile, arcname: str, f: IO[bytes], size: int) -> None:
+    info = tarfile.TarInfo(arcname)
+    info.size = size
+    info.mtime = int(time.time())
+    tar.addfile(info, f)
+
+
+def _add_bytes(tar: tarfile.TarFile, arcname: str, data: bytes) -> None:
+    _add_stream(tar, arcname, io.BytesIO(data), len(data))
+
+
+def _export_db(tar: tarfile.TarFile, db: ProfileDB, name: str) -> int:
+    n = 0
+    state = db.load_state(name)
+    if state is not None:
+        _add_bytes(tar, f"profiles/{name}/{STATE_FILES['bin']}", encode_state(state))
+        n += 1
+    with tempfile.SpooledTemporaryFile(max_size=1 << 20) as f:  # spills to disk: memory stays bounded
+        for obj in db.iter_records(name):
+            f.write((json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8"))
+        if f.tell():
+            size = f.tell()
+            f.seek(0)
+            _add_stream(tar, f"profiles/{name}/logbook.jsonl", f, size)
+            n += 1
+    for fname in db.file_names(name):
+        _add_bytes(tar, f"profiles/{name}/{fname}", (db.read_file(name, fname) or "").encode("utf-8"))
+        n += 1
+    return n
+
+
+def _export_dir(tar: tarfile.TarFile, name: str) -> int:
+    n = 0
+    d = profile_dir(name)
+    for p in sorted(d.iterdir()) if d.is_dir() else ():
+        if p.is_file() and _FILE.fullmatch(p.name):
+            tar.add(p, arcname=f"profiles/{name}/{p.name}", recursive=False)  # streamed in blocks
+            n += 1
+    for seg in segment_paths(name):
+        tar.add(seg, arcname=f"profiles/{name}/{SEGMENTS_DIR}/{seg.name}", recursive=False)
+        n += 1
+    return n
+
+
+def export_profiles(dst: Path | str | IO[bytes], profiles: Sequence[str] | None = None) -> dict[str, int]:
+    """
+    Stream profiles (default: all; the root is rescanned first so a backup never misses a dir the index
+    does not know yet) into one tar archive at dst (a path, or a binary stream such as stdout). Files are
+    copied block by block, so memory does not grow with profile size. Returns counts.
+    """
+    db = active_db()
+    if profiles is None:
+        if db is not None:
+            names = db.profiles()
+        else:
+            rebuild_index()
+            names = list_profiles()
+    else:
+        known = set(db.profiles()) if db is not None else None
+        names = [
+            n
+            for n in dict.fromkeys(safe_profile(p) for p in profiles)
+            if (n in known if known is not None else profile_dir(n).is_dir())
+        ]
+
+    to_file = isinstance(dst, (str, Path))
+    tar = tarfile.open(
+        name=os.fspath(dst) if to_file else None,
+        fileobj=None if to_file else dst,
+        mode=_write_mode(os.fspath(dst) if to_file else None),
+        format=tarfile.PAX_FORMAT,
+    )
+    counts = {"profiles": len(names), "files": 0}
+    with tar:
+        manifest = json.dumps({"format": ARCHIVE_FORMAT, "version": ARCHIVE_VERSION, "profiles": names}).encode()
+        _add_bytes(tar, MANIFEST, manifest)
+        for name in names:
+            counts["files"] += _export_db(tar, db, name) if db is not None else _export_dir(tar, name)
+    return counts
+
+
+def _member_path(m: tarfile.TarInfo) -> tuple[str, str]:
+    """(profile, path inside the profile) of a member, or ArchiveError for anything unexpected."""
+    parts = m.name.split("/")
+    ok = m.isfile() and len(parts) in (3, 4) and parts[0] == "profiles" and safe_profile(parts[1]) == parts[1]
+    if ok and len(parts) == 3:
+        ok = bool(_FILE.fullmatch(parts[2]))
+    elif ok:
+        ok = parts[2] == SEGMENTS_DIR and bool(_SEGMENT.fullmatch(parts[3]))
+    if not ok:
+        raise ArchiveError(f"unexpected archive member: {m.name!r}")
+    return parts[1], "/".join(parts[2:])
+
+
+def _read_lines(paths: Sequence[Path]) -> Iterator[dict[str, Any]]:
+    for p in paths:
+        with p.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    obj = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(obj, dict):
+                    yield obj
+
+
+def _install(name: str, staged: Path, replace: bool) -> tuple[str, int]:
+    """Move one staged profile into place (validating its state first) -> (outcome, files)."""
+    files = sorted(p for p in staged.iterdir() if p.is_file())
+    segs = sorted((staged / SEGMENTS_DIR).glob("*.jsonl"))
+    state_file = next((p for p in files if p.name in STATE_FILES.values()), None)
+    state = read_state_file(state_file) if state_file is not None else None  # raises on a corrupt state
+
+    db = active_db()
+    if db is not None:
+        if name in db.profiles() and not replace:
+            return "skipped", 0
+        with db.batch():
+            db.drop_profile(name)
+            if state is not None:
+                db.save_state(name, state)
+            tail = [p for p in files if p.name == "logbook.jsonl"]
+            batch: list[dict[str, Any]] = []
+            for obj in _read_lines([*segs, *tail]):
+                batch.append(obj)
+                if len(batch) >= _APPEND_BATCH:
+                    db.append(name, batch)
+                    batch = []
+            db.append(name, batch)
+            rest = []
+            for p in files:
+                if p in tail or p == state_file:
+                    continue
+                if p.suffix in _DB_FILES:
+                    db.write_file(name, p.name, p.read_text(encoding="utf-8"))
+                else:
+                    rest.append(p)
+            # last step inside the transaction: a failure here rolls the rows back
+            if rest:
+                d = profile_dir(name, create=True)
+                for p in rest:
+                    os.replace(p, d / p.name)
+        return "imported", len(files) + len(segs)
+
+    d = profile_dir(name)
+    if d.is_dir() and not replace:
+        return "skipped", 0
+    cold_root = profiles_root("cold")
+    cold_root.mkdir(parents=True, exist_ok=True)
+    cold_new = Path(tempfile.mkdtemp(prefix=".import-", dir=cold_root))  # same volume as the segments
+    aside: list[tuple[Path, Path]] = []  # (moved-aside old dir, where it came from)
+    try:
+        for p in segs:
+            shutil.move(p, cold_new / p.name)  # may cross volumes: nothing installed yet if it fails
+        if (staged / SEGMENTS_DIR).is_dir():
+            (staged / SEGMENTS_DIR).rmdir()
+
+        d = profile_dir(name, create=True)  # indexes a new profile; an existing one is swapped out below
+        _swap(d, staged, aside)
+        cold = profile_dir(name, root=cold_root) / SEGMENTS_DIR  # stale segments never survive an install
+        cold.parent.mkdir(parents=True, exist_ok=True)
+        _swap(cold, cold_new, aside)
+    except BaseException:
+        for old, orig in reversed(aside):
+            shutil.rmtree(orig, ignore_errors=True)
+            os.rename(old, orig)
+        shutil.rmtree(cold_new, ignore_errors=True)
+        raise
+    for old, _orig in aside:
+        shutil.rmtree(old, ignore_errors=True)
+    return "imported", len(files) + len(segs)
+
+
+def _swap(dst: Path, new: Path, aside: list[tuple[Path, Path]]) -> None:
+    """Rename new to dst; an existing dst is renamed aside first (recorded for rollback/cleanup)."""
+    if dst.exists():
+        old = dst.with_name(f".{dst.name}.old-{os.getpid()}-{time.monotonic_ns()}")
+        os.rename(dst, old)
+        aside.append((old, dst))
+    os.rename(new, dst)
+
+
+def import_profiles(src: Path | str | IO[bytes], *, jobs: int = 1, replace: bool = False) -> dict[str, Any]:
+    """
+    Read an export_profiles archive from src (a path, or a binary stream such as stdin) in one pass.
+    Each profile is extracted to a staging directory and installed as soon as the stream moves past it,
+    by `jobs` threads in parallel with the rest of the extraction. Existing profiles are skipped
+    unless replace=True. Returns counts; per-profile failures are listed in error_list.
+    """
+    from_file = isinstance(src, (str, Path))
+    try:
+        # stream mode, any compression: one sequential pass, stdin works
+        tar = tarfile.open(name=os.fspath(src) if from_file else None, fileobj=None if from_file else src, mode="r|*")
+    except tarfile.TarError as e:
+        raise ArchiveError(f"not a profile archive: {e}") from e
+
+    base = profiles_root()
+    base.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=".import-", dir=base))  # not a valid profile name: never indexed
+    pool = ThreadPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    results: dict[str, Future[tuple[str, int]] | tuple[str, int] | Exception] = {}
+
+    def install(name: str) -> None:
+        if pool is not None:
+            results[name] = pool.submit(_install, name, staging / name, replace)
+            return
+        try:
+            results[name] = _install(name, staging / name, replace)
+        except Exception as e:
+            results[name] = e
+
+    try:
+        with tar:
+            members = iter(tar)  # one iterator: a second iter() would restart at the manifest
+            first = next(members, None)
+            f = tar.extractfile(first) if first is not None and first.name == MANIFEST else None
+            try:
+                manifest = json.loads(f.read()) if f is not None else None
+            except ValueError:
+                manifest = None
+            if not isinstance(manifest, dict) or manifest.get("format") != ARCHIVE_FORMAT:
+                raise ArchiveError(f"not a profile archive (no {MANIFEST} first)")
+            if manifest.get("version") != ARCHIVE_VERSION:
+                raise ArchiveError(f"unsupported profile archive version: {manifest.get('version')!r}")
+
+            current: str | None = None
+            for m in members:
+                name, rel = _member_path(m)
+                if name != current:
+                    if name in results:
+                        raise ArchiveError(f"members of profile {name!r} are not contiguous")
+                    if current is not None:
+                        install(current)
+                    current = name
+                out = staging / name / rel
+                out.parent.mkdir(parents=True, exist_ok=True)
+                src_f = tar.extractfile(m)
+                assert src_f is not None  # regular file, checked by _member_path
+                with src_f, out.open("wb") as dst_f:
+                    shutil.copyfileobj(src_f, dst_f)
+            if current is not None:
+                install(current)
+    except tarfile.TarError as e:
+        raise ArchiveError(f"truncated or corrupt profile archive: {e}") from e
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
+        shutil.rmtree(staging, ignore_errors=True)
+
+    names = [str(n) for n in manifest.get("profiles", [])]
+    counts: dict[str, Any] = {"profiles": len(names), "imported": 0, "skipped": 0, "files": 0, "errors": 0}
+    errors: list[str] = []
+    for name in names:
+        r = results.get(name)
+        if isinstance(r, Future):
+            try:
+                r = r.result()
+            except Exception as e:
+                r = e
+        if r is None:
+            r = ArchiveError("missing from the archive")
+        if isinstance(r, Exception):
+            counts["errors"] += 1
+            errors.append(f"{name}: {r}")
+            continue
+        outcome, n = r
+        counts[outcome] += 1
+        counts["files"] += n
+    return {**counts, "error_list": errors}
+
+
+__all__ = ["ARCHIVE_FORMAT", "ARCHIVE_VERSION", "ArchiveError", "export_profiles", "import_profiles"]
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
 import json
+import os
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
+
+from .db import active_db
+from .profiles import profile_dir
 
 
 @dataclass(frozen=True)
@@ -13,15 +18,32 @@ class BalanceConfig:
 
 
 def _balance_path(*, profile: str) -> Path:
-    return Path("data") / "profiles" / profile / "balance.json"
+    return profile_dir(profile) / "balance.json"
 
 
 def load_balance(*, profile: str) -> BalanceConfig:
+    db = active_db()
+    if db is not None:
+        return _parse_balance(db.read_file(profile, "balance.json"))
     p = _balance_path(profile=profile)
     if not p.exists():
         return BalanceConfig()
+    return _read_balance(p)
+
+
+def _read_balance(p: Path) -> BalanceConfig:
+    try:
+        text = p.read_text(encoding="utf-8")
+    except Exception:
+        return BalanceConfig()
+    return _parse_balance(text)
+
+
+def _parse_balance(text: str | None) -> BalanceConfig:
+    if text is None:
+        return BalanceConfig()
     try:
-        obj = json.loads(p.read_text(encoding="utf-8"))
+        obj = json.loads(text)
     except Exception:
         return BalanceConfig()
 
@@ -35,21 +57,86 @@ def load_balance(*, profile: str) -> BalanceConfig:
     )
 
 
+class BalanceCache:
+    """
+    profile -> BalanceConfig, re-read only when balance.json's (st_mtime_ns, st_size) changes.
+    A hit costs one stat(); use invalidate() after writing the file behind the cache's back.
+    With the SQLite backend (astra.game.db) the key is the database's files_version(), so a hit
+    costs one PRAGMA instead of a query and a parse.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[tuple[Any, ...] | None, BalanceConfig]] = {}
+
+    def get(self, *, profile: str) -> BalanceConfig:
+        db = active_db()
+        p: Path | None = None
+        key: tuple[Any, ...] | None
+        if db is not None:
+            key = (os.fspath(db.path), *db.files_version())
+        else:
+            p = _balance_path(profile=profile)
+            try:
+                st = p.stat()
+                key = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                key = None
+
+        hit = self._entries.get(profile)
+        if hit is not None and hit[0] == key:
+            return hit[1]
+
+        if db is not None:
+            cfg = _parse_balance(db.read_file(profile, "balance.json"))
+        else:
+            cfg = BalanceConfig() if p is None or key is None else _read_balance(p)
+        self._entries[profile] = (key, cfg)
+        return cfg
+
+    def invalidate(self, *, profile: str | None = None) -> None:
+        if profile is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(profile, None)
+
+
+BALANCE_CACHE = BalanceCache()
+
+
+def cached_balance(*, profile: str) -> BalanceConfig:
+    return BALANCE_CACHE.get(profile=profile)
+
+
+def invalidate_balance(*, profile: str | None = None) -> None:
+    BALANCE_CACHE.invalidate(profile=profile)
+
+
 def save_balance(*, profile: str, cfg: BalanceConfig) -> None:
-    p = _balance_path(profile=profile)
-    p.parent.mkdir(parents=True, exist_ok=True)
-    p.write_text(
-        json.dumps(
-            {
-                "xp_per_tick": cfg.xp_per_tick,
-                "anomaly_hull_loss": cfg.anomaly_hull_loss,
-                "anomaly_power_loss": cfg.anomaly_power_loss,
-            },
-            ensure_ascii=False,
-            indent=2,
-        ),
-        encoding="utf-8",
+    text = json.dumps(
+        {
+            "xp_per_tick": cfg.xp_per_tick,
+            "anomaly_hull_loss": cfg.anomaly_hull_loss,
+            "anomaly_power_loss": cfg.anomaly_power_loss,
+        },
+        ensure_ascii=False,
+        indent=2,
     )
+    db = active_db()
+    if db is not None:
+        db.write_file(profile, "balance.json", text)
+        return
+    profile_dir(profile, create=True)
+    p = _balance_path(profile=profile)
+    p.write_text(text, encoding="utf-8")
+    invalidate_balance(profile=profile)
 
 
-__all__ = ["BalanceConfig", "load_balance", "save_balance"]
+__all__ = [
+    "BalanceConfig",
+    "BalanceCache",
+    "BALANCE_CACHE",
+    "load_balance",
+    "cached_balance",
+    "invalidate_balance",
+    "save_balance",
+]
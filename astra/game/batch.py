@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - optional: pip install astra-airi[sim]
+    raise ImportError("astra.game.batch requires numpy (pip install astra-airi[sim])") from e
+
+from .balance import BalanceConfig, cached_balance
+from .rng import rng_raw15_batch
+from .state import GameState, default_state
+
+
+@dataclass
+class Population:
+    """
+    N ships/players as columns (struct-of-arrays), ticked all at once.
+    One tick per ship = reduce(state, "tick"): blocked at hull==0, engine.tick_day, then apply_rules clamping.
+    Quests/achievements are not tracked here.
+    """
+
+    day: np.ndarray
+    hull: np.ndarray
+    power: np.ndarray
+    xp: np.ndarray
+    level: np.ndarray
+    last_seed: np.ndarray
+    game_over_day: np.ndarray  # day on which hull hit 0, -1 while alive
+    power_down: np.ndarray  # ticks that ended with power == 0
+
+    @classmethod
+    def from_states(cls, states: Iterable[Any]) -> Population:
+        rows = [
+            (int(s.day), int(s.ship.hull), int(s.ship.power), int(s.player.xp), int(s.player.level), int(s.last_seed))
+            for s in states
+        ]
+        cols = np.array(rows, dtype=np.int64).reshape(-1, 6).T
+        n = cols.shape[1]
+        return cls(
+            day=cols[0].copy(),
+            hull=cols[1].copy(),
+            power=cols[2].copy(),
+            xp=cols[3].copy(),
+            level=cols[4].copy(),
+            last_seed=cols[5].copy(),
+            game_over_day=np.where(cols[1] == 0, cols[0], -1),
+            power_down=np.zeros(n, dtype=np.int64),
+        )
+
+    @classmethod
+    def uniform(cls, n: int, state: GameState | None = None) -> Population:
+        s = default_state() if state is None else state
+        one = cls.from_states([s])
+        return cls(**{k: np.repeat(v, int(n)) for k, v in vars(one).items()})
+
+    def __len__(self) -> int:
+        return int(self.day.shape[0])
+
+    @property
+    def alive(self) -> np.ndarray:
+        return self.hull > 0
+
+    def tick(self, seeds: Any = None, *, profile: str = "offline", balance: BalanceConfig | None = None) -> None:
+        """
+        Advance every live ship by one day, in place.
+        seeds: None (keep last_seed, like tick(seed=None)), one int for all ships, or an array of N seeds.
+        Balance comes from the profile's cached balance.json unless passed in (as in engine.tick_day).
+        """
+        cfg = cached_balance(profile=profile) if balance is None else balance
+        live = self.hull > 0  # policy: tick is blocked once game_over
+
+        if seeds is None:
+            use_seed = self.last_seed
+        else:
+            use_seed = np.broadcast_to(np.asarray(seeds, dtype=np.int64), self.day.shape)
+
+        raw15 = rng_raw15_batch(use_seed).astype(np.int64)
+        hull = self.hull - (raw15 & 1) * cfg.anomaly_hull_loss
+        power = self.power - ((raw15 >> 2) & 1) * cfg.anomaly_power_loss
+        xp = self.xp + cfg.xp_per_tick
+        level = np.maximum(1, xp // 10 + 1)
+
+        # rules.apply_rules: clamp to 0..100
+        np.clip(hull, 0, 100, out=hull)
+        np.clip(power, 0, 100, out=power)
+
+        np.copyto(self.hull, hull, where=live)
+        np.copyto(self.power, power, where=live)
+        np.copyto(self.xp, xp, where=live)
+        np.copyto(self.level, level, where=live)
+        np.copyto(self.last_seed, use_seed, where=live)
+        self.day += live
+
+        self.power_down += live & (self.power == 0)
+        over = live & (self.hull == 0)
+        self.game_over_day[over] = self.day[over]
+
+    def run(
+        self, days: int, seeds: Any = None, *, profile: str = "offline", balance: BalanceConfig | None = None
+    ) -> None:
+        """days ticks; seeds is None or a (days, N) / (days,) schedule. Balance is resolved once, as in tick."""
+        balance = cached_balance(profile=profile) if balance is None else balance
+        sched = None if seeds is None else np.asarray(seeds, dtype=np.int64)
+        for d in range(int(days)):
+            self.tick(None if sched is None else sched[d], balance=balance)
+
+    def state(self, i: int, base: GameState | None = None) -> GameState:
+        """Ship i as a GameState (quests/achievements taken from base)."""
+        b = default_state() if base is None else base
+        return replace(
+            b,
+            day=int(self.day[i]),
+            ship=replace(b.ship, hull=int(self.hull[i]), power=int(self.power[i])),
+            player=replace(b.player, xp=int(self.xp[i]), level=int(self.level[i])),
+            last_seed=int(self.last_seed[i]),
+        )
+
+
+__all__ = ["Population"]
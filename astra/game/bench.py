@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+from itertools import repeat
+from typing import Any
+
+from .balance import BalanceConfig
+from .codec import decode_state, encode_state
+from .kernel import ENGINE_KERNEL, StageTimer
+from .migrations import migrate_dict
+from .reducer import reduce
+from .state import GameState, default_state
+
+
+def tick_allocations(n: int = 1000, *, seed: int | None = 123) -> dict[str, Any]:
+    """
+    reduce(state, "tick") under tracemalloc, always from the same mid-game state
+    (chaining would end in game_over and measure the policy-blocked path instead).
+    - blocks/bytes_per_tick: memory still allocated per tick when every ActionResult is kept alive
+      (successor state + text + events, i.e. what one tick really costs to keep)
+    - peak_bytes_per_tick: worst transient peak of a single tick, temporaries included
+    """
+    n_i = max(1, int(n))
+    cfg = BalanceConfig()
+    state = default_state()
+    state = reduce(state, "tick", seed=seed, balance=cfg).state  # warm-up: imports, regex cache, day-0 award
+
+    tracemalloc.start()
+    try:
+        kept: list[Any] = []
+        before = tracemalloc.take_snapshot()
+        for _ in range(n_i):
+            kept.append(reduce(state, "tick", seed=seed, balance=cfg))
+        after = tracemalloc.take_snapshot()
+        diff = [d for d in after.compare_to(before, "filename") if d.size_diff > 0]
+        blocks = sum(d.count_diff for d in diff)
+        size = sum(d.size_diff for d in diff)
+        del kept
+
+        peak = 0
+        for _ in range(n_i):
+            base, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            reduce(state, "tick", seed=seed, balance=cfg)
+            _, top = tracemalloc.get_traced_memory()
+            peak = max(peak, top - base)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ticks": n_i,
+        "blocks_per_tick": round(blocks / n_i, 2),
+        "bytes_per_tick": round(size / n_i, 1),
+        "peak_bytes_per_tick": peak,
+    }
+
+
+def state_memory(n: int = 10000, *, seed: int | None = 123) -> dict[str, Any]:
+    """
+    Memory per retained GameState, bytes counted by tracemalloc (shared sub-objects count once):
+    - bytes_per_state: n successive reducer states (tick/move mix, like an undo history) kept alive
+    - bytes_per_loaded_state: the same history rebuilt with GameState.from_dict from decoded JSON
+    """
+    n_i = max(1, int(n))
+    cfg = BalanceConfig(anomaly_hull_loss=0, anomaly_power_loss=0)  # stay clear of game_over
+    sectors = ("Mostek", "AIRI", "Sektor A-1")
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        history: list[Any] = []
+        s = default_state()
+        for i in range(n_i):
+            if i % 4 == 3:
+                s = reduce(s, "move", sector=sectors[i % 3], balance=cfg).state
+            else:
+                s = reduce(s, "tick", seed=seed, balance=cfg).state
+            history.append(s)
+        after, _ = tracemalloc.get_traced_memory()
+
+        docs = [json.loads(json.dumps(x.to_dict())) for x in history]
+        del history
+        before_l, _ = tracemalloc.get_traced_memory()
+        loaded = [GameState.from_dict(d) for d in docs]
+        after_l, _ = tracemalloc.get_traced_memory()
+        del loaded
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "states": n_i,
+        "bytes_per_state": round((after - before) / n_i, 1),
+        "bytes_per_loaded_state": round((after_l - before_l) / n_i, 1),
+    }
+
+
+def state_codec(n: int = 5000) -> dict[str, dict[str, float]]:
+    """Size and save/load time of one mid-game state: indented JSON (storage default) vs astra.game.codec."""
+    n_i = max(1, int(n))
+    state = reduce(default_state(), "tick", seed=123).state
+
+    def dump_json(s: GameState) -> bytes:
+        return (json.dumps(s.to_dict(), ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+
+    def load_json(b: bytes) -> GameState:
+        return GameState.from_dict(migrate_dict(json.loads(b.decode("utf-8"))))
+
+    out: dict[str, dict[str, float]] = {}
+    for name, dump, load in (("json", dump_json, load_json), ("bin", encode_state, decode_state)):
+        data = dump(state)
+        t0 = time.perf_counter_ns()
+        for _ in range(n_i):
+            dump(state)
+        t1 = time.perf_counter_ns()
+        for _ in range(n_i):
+            load(data)
+        t2 = time.perf_counter_ns()
+        out[name] = {
+            "bytes": len(data),
+            "save_us": round((t1 - t0) / n_i / 1e3, 2),
+            "load_us": round((t2 - t1) / n_i / 1e3, 2),
+        }
+    return out
+
+
+def stage_timings(n: int = 10000, *, seed: int | None = 123) -> dict[str, dict[str, float]]:
+    """Per-stage wall time of the tick kernel over n days (one frame, no reducer overhead)."""
+    timer = StageTimer()
+    ENGINE_KERNEL.run(default_state(), cfg=BalanceConfig(), seeds=repeat(seed, max(1, int(n))), timer=timer)
+    return timer.report()
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(prog="astra.game.bench")
+    sub = p.add_subparsers(dest="cmd")
+    p_alloc = sub.add_parser("tick-alloc")
+    p_alloc.add_argument("--n", type=int, default=1000)
+    p_mem = sub.add_parser("state-mem")
+    p_mem.add_argument("--n", type=int, default=10000)
+    p_codec = sub.add_parser("codec")
+    p_codec.add_argument("--n", type=int, default=5000)
+    p_stages = sub.add_parser("stages")
+    p_stages.add_argument("--n", type=int, default=10000)
+    ns = p.parse_args(argv)
+
+    if ns.cmd == "tick-alloc":
+        print("BENCH tick-alloc")
+        for k, v in tick_allocations(ns.n).items():
+            print(f"- {k}: {v}")
+        return 0
+
+    if ns.cmd == "state-mem":
+        print("BENCH state-mem")
+        for k, v in state_memory(ns.n).items():
+            print(f"- {k}: {v}")
+        return 0
+
+    if ns.cmd == "codec":
+        print("BENCH codec")
+        for name, r in state_codec(ns.n).items():
+            print(f"- {name}: {r['bytes']} bytes, save {r['save_us']} us, load {r['load_us']} us")
+        return 0
+
+    if ns.cmd == "stages":
+        print("BENCH stages")
+        for name, r in stage_timings(ns.n).items():
+            print(f"- {name}: {r['ns_per_call']} ns/tick ({r['calls']} calls, {r['total_ms']} ms)")
+        return 0
+
+    print("Use: python -m astra.game.bench (tick-alloc|state-mem|codec|stages) [--n N]")
+    return 1
+
+
+__all__ = ["tick_allocations", "state_memory", "state_codec", "stage_timings"]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import sys
+from functools import lru_cache
+from typing import Any
+
+from .migrations import LATEST_SCHEMA_VERSION, migrate_dict
+from .state import GameState, PlayerState, QuestState, ShipState, with_default_quests
+
+MAGIC = b"ASTB"
+CODEC_VERSION = 1
+
+# Layout (v1), ints are LEB128 varints, signed ones zigzag-encoded:
+#   MAGIC | u8 codec version | schema_version | body byte length | body | string blob
+#   body (varints only, decoded in one pass):
+#     string count, utf-8 byte length per string (the strings follow the body, concatenated)
+#     day, hull, power, xp, level, last_seed (signed)
+#     sector (string index)
+#     achievements: count, string index per entry
+#     quests: count, then (quest_id index, status index, progress (signed)) per entry
+
+
+class CodecError(ValueError):
+    """Data is not a binary state this codec can read."""
+
+
+def _put_uint(out: bytearray, n: int) -> None:
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _put_int(out: bytearray, n: int) -> None:
+    _put_uint(out, (n << 1) if n >= 0 else ((-n << 1) - 1))
+
+
+def _uints(buf: bytes, start: int, end: int) -> list[int]:
+    """All varints in buf[start:end]."""
+    out: list[int] = []
+    n = 0
+    shift = 0
+    for b in buf[start:end]:
+        if b < 0x80:
+            out.append(n | (b << shift))
+            n = 0
+            shift = 0
+        else:
+            n |= (b & 0x7F) << shift
+            shift += 7
+    if shift:
+        raise CodecError("truncated varint in binary game state")
+    return out
+
+
+def _header(buf: bytes) -> tuple[int, int, int]:
+    """(schema_version, body start, body end)."""
+    if buf[:4] != MAGIC:
+        raise CodecError("not a binary game state (bad magic)")
+    if len(buf) < 5 or buf[4] != CODEC_VERSION:
+        raise CodecError(f"unsupported binary state codec version: {buf[4] if len(buf) > 4 else None}")
+    pos = 5
+    vals: list[int] = []
+    while len(vals) < 2:  # schema_version, body length
+        end = pos
+        while end < len(buf) and buf[end] & 0x80:
+            end += 1
+        if end >= len(buf):
+            raise CodecError("truncated binary game state header")
+        vals += _uints(buf, pos, end + 1)
+        pos = end + 1
+    schema_version, body_len = vals
+    if pos + body_len > len(buf):
+        raise CodecError("truncated binary game state")
+    return schema_version, pos, pos + body_len
+
+
+@lru_cache(maxsize=1024)
+def _quest(quest_id: str, status: str, progress: int) -> QuestState:
+    # few distinct quest states exist: loaded states share the instances
+    return QuestState(quest_id, status, progress)
+
+
+def _signed(z: int) -> int:
+    return (z >> 1) if not z & 1 else -((z + 1) >> 1)
+
+
+def encode_state(state: GameState) -> bytes:
+    """GameState -> bytes (same content as to_dict())."""
+    table: dict[str, int] = {}
+
+    def ref(s: Any) -> int:
+        return table.setdefault(str(s), len(table))
+
+    body = bytearray()
+    ship = state.ship
+    player = state.player
+    for n in (state.day, ship.hull, ship.power, player.xp, player.level, state.last_seed):
+        _put_int(body, int(n))
+    _put_uint(body, ref(ship.sector))
+    _put_uint(body, len(state.achievements))
+    for a in state.achievements:
+        _put_uint(body, ref(a))
+    _put_uint(body, len(state.quests))
+    for q in state.quests:
+        _put_uint(body, ref(q.quest_id))
+        _put_uint(body, ref(q.status))
+        _put_int(body, int(q.progress))
+
+    blobs = [s.encode("utf-8") for s in table]  # insertion order == index order
+    head = bytearray()
+    _put_uint(head, len(blobs))
+    for b in blobs:
+        _put_uint(head, len(b))
+
+    out = bytearray(MAGIC)
+    out.append(CODEC_VERSION)
+    _put_uint(out, int(state.schema_version))
+    _put_uint(out, len(head) + len(body))
+    out += head
+    out += body
+    out += b"".join(blobs)
+    return bytes(out)
+
+
+def decode_state(data: bytes) -> GameState:
+    """
+    bytes -> GameState; strings are interned, quests are merged over the defaults like from_dict.
+    An older schema_version goes through the migration chain as JSON does; an unknown one is a CodecError.
+    """
+    buf = bytes(data)
+    schema_version, start, end = _header(buf)
+    v = _uints(buf, start, end)
+    try:
+        n = v[0]
+        strings: list[str] = []
+        pos = end
+        for size in v[1 : n + 1]:
+            strings.append(sys.intern(buf[pos : pos + size].decode("utf-8")))
+            pos += size
+        if pos != len(buf):
+            raise CodecError(f"string blob has {len(buf) - pos} unexpected bytes")
+
+        i = n + 1
+        day, hull, power, xp, level, last_seed = map(_signed, v[i : i + 6])
+        sector = strings[v[i + 6]]
+        n = v[i + 7]
+        i += 8
+        achievements = tuple(strings[k] for k in v[i : i + n])
+        i += n
+        n = v[i]
+        i += 1
+        quests = [_quest(strings[v[k]], strings[v[k + 1]], _signed(v[k + 2])) for k in range(i, i + 3 * n, 3)]
+        if i + 3 * n != len(v):
+            raise CodecError("unexpected values in binary game state body")
+    except (IndexError, UnicodeDecodeError) as e:
+        raise CodecError("truncated or corrupt binary game state") from e
+
+    state = GameState(
+        schema_version=schema_version,
+        day=day,
+        ship=ShipState(sector=sector, hull=hull, power=power),
+        player=PlayerState(xp=xp, level=level),
+        achievements=achievements,
+        quests=with_default_quests(quests),
+        last_seed=last_seed,
+    )
+    if schema_version == LATEST_SCHEMA_VERSION:
+        return state
+    try:
+        return GameState.from_dict(migrate_dict(state.to_dict()))
+    except ValueError as e:
+        raise CodecError(str(e)) from e
+
+
+def is_binary_state(data: bytes) -> bool:
+    return bytes(data[:4]) == MAGIC
+
+
+__all__ = ["MAGIC", "CODEC_VERSION", "CodecError", "encode_state", "decode_state", "is_binary_state"]
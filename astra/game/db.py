@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from ..paths import data_root
+from .codec import decode_state, encode_state
+from .state import GameState
+
+DB_FILE = "astra.sqlite3"  # in the hot data root
+# The backend is an explicit switch, never inferred from DB_FILE existing: ASTRA_BACKEND ("files" or
+# "sqlite") when set, else BACKEND_FILE in the hot data root, which `astra db migrate` writes only after
+# a complete copy. Unset, profiles live in their directories.
+ENV_BACKEND = "ASTRA_BACKEND"
+BACKEND_FILE = "BACKEND"
+BACKENDS = ("files", "sqlite")
+
+# Fixed SQL texts: sqlite3 keeps them prepared in the connection's statement cache.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    profile TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    updated_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS logbook (
+    id INTEGER PRIMARY KEY,
+    profile TEXT NOT NULL,
+    rec TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS logbook_profile ON logbook (profile, id);
+CREATE TABLE IF NOT EXISTS files (
+    profile TEXT NOT NULL,
+    name TEXT NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (profile, name)
+);
+"""
+_GET_STATE = "SELECT data FROM state WHERE profile = ?"
+_PUT_STATE = "INSERT OR REPLACE INTO state (profile, data, updated_ns) VALUES (?, ?, ?)"
+_ADD_REC = "INSERT INTO logbook (profile, rec) VALUES (?, ?)"
+_GET_RECS = "SELECT rec FROM logbook WHERE profile = ? ORDER BY id"
+_GET_FILE = "SELECT body FROM files WHERE profile = ? AND name = ?"
+_PUT_FILE = "INSERT OR REPLACE INTO files (profile, name, body) VALUES (?, ?, ?)"
+_DROP = (
+    "DELETE FROM state WHERE profile = ?",
+    "DELETE FROM logbook WHERE profile = ?",
+    "DELETE FROM files WHERE profile = ?",
+)
+_FILE_NAMES = "SELECT name FROM files WHERE profile = ? ORDER BY name"
+_PROFILES = "SELECT profile FROM state UNION SELECT profile FROM logbook UNION SELECT profile FROM files"
+
+
+class ProfileDB:
+    """
+    All profiles in one SQLite file (WAL mode): state (astra.game.codec blobs), logbook records
+    (one JSON text per record, same as a logbook.jsonl line) and small per-profile files
+    (config.json, balance.json). Writes outside batch() commit one by one; inside batch()
+    they share a single transaction. Safe to share between threads.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._file_writes = 0
+        self._con = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")  # WAL: durable at checkpoints, never corrupt
+        self._con.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._con.close()
+
+    @contextmanager
+    def batch(self) -> Iterator[ProfileDB]:
+        """One transaction for everything inside (nested batches join the outer one)."""
+        with self._lock:
+            if self._depth == 0:
+                self._con.execute("BEGIN")
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._con.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self._con.execute("COMMIT")
+
+    def load_state(self, profile: str) -> GameState | None:
+        with self._lock:
+            row = self._con.execute(_GET_STATE, (profile,)).fetchone()
+        return None if row is None else decode_state(row[0])
+
+    def save_state(self, profile: str, state: GameState) -> None:
+        with self.batch():
+            self._con.execute(_PUT_STATE, (profile, encode_state(state), time.time_ns()))
+
+    def append(self, profile: str, objs: Iterable[dict[str, Any]]) -> None:
+        rows = [(profile, json.dumps(o, ensure_ascii=False)) for o in objs]
+        with self.batch():
+            self._con.executemany(_ADD_REC, rows)
+
+    def iter_records(self, profile: str) -> Iterator[dict[str, Any]]:
+        with self._lock:
+            rows = self._con.execute(_GET_RECS, (profile,)).fetchall()
+        for (rec,) in rows:
+            try:
+                obj = json.loads(rec)
+            except ValueError:
+                continue
+            if isinstance(obj, dict):
+                yield obj
+
+    def read_file(self, profile: str, name: str) -> str | None:
+        with self._lock:
+            row = self._con.execute(_GET_FILE, (profile, name)).fetchone()
+        return None if row is None else str(row[0])
+
+    def write_file(self, profile: str, name: str, body: str) -> None:
+        with self.batch():
+            self._con.execute(_PUT_FILE, (profile, name, body))
+            self._file_writes += 1
+
+    def drop_profile(self, profile: str) -> None:
+        """Delete the profile's state, logbook and files (one transaction)."""
+        with self.batch():
+            for sql in _DROP:
+                self._con.execute(sql, (profile,))
+            self._file_writes += 1
+
+    def files_version(self) -> tuple[int, int]:
+        """
+        Changes whenever the files table may have changed: PRAGMA data_version moves on commits of other
+        connections, the counter on this connection's file writes (state saves leave both alone).
+        """
+        with self._lock:
+            return int(self._con.execute("PRAGMA data_version").fetchone()[0]), self._file_writes
+
+    def file_names(self, profile: str) -> list[str]:
+        with self._lock:
+            return [r[0] for r in self._con.execute(_FILE_NAMES, (profile,))]
+
+    def profiles(self) -> list[str]:
+        with self._lock:
+            return sorted(r[0] for r in self._con.execute(_PROFILES))
+
+
+_OPEN: dict[str, ProfileDB] = {}
+_OPEN_LOCK = threading.Lock()
+
+
+def db_path(root: Path | None = None) -> Path:
+    return data_root(root=root) / DB_FILE
+
+
+def open_db(path: Path | None = None) -> ProfileDB:
+    """Shared connection per database file (created when missing)."""
+    key = os.path.abspath(db_path() if path is None else path)
+    with _OPEN_LOCK:
+        db = _OPEN.get(key)
+        if db is None:
+            db = _OPEN[key] = ProfileDB(Path(key))
+        return db
+
+
+def backend(root: Path | None = None) -> str:
+    """The configured backend: ASTRA_BACKEND, else BACKEND_FILE in the hot data root, else "files"."""
+    raw = os.environ.get(ENV_BACKEND)
+    if raw is None:
+        try:
+            raw = (data_root(root=root) / BACKEND_FILE).read_text(encoding="utf-8")
+        except OSError:
+            return "files"
+    name = raw.strip().lower() or "files"
+    if name not in BACKENDS:
+        raise ValueError(f"unknown backend: {name!r} (expected one of: {', '.join(BACKENDS)})")
+    return name
+
+
+def enable_db(root: Path | None = None) -> ProfileDB:
+    """Switch the data root to the SQLite backend (writes BACKEND_FILE) and open it."""
+    db = open_db(db_path(root))
+    (data_root(root=root) / BACKEND_FILE).write_text("sqlite\n", encoding="utf-8")
+    return db
+
+
+def active_db(root: Path | None = None) -> ProfileDB | None:
+    """The SQLite backend when switched on (see backend(); root = app root, default cwd), else None."""
+    if backend(root) != "sqlite":
+        return None
+    return open_db(db_path(root))
+
+
+def close_all() -> None:
+    with _OPEN_LOCK:
+        for db in _OPEN.values():
+            db.close()
+        _OPEN.clear()
+
+
+__all__ = [
+    "DB_FILE",
+    "ENV_BACKEND",
+    "BACKEND_FILE",
+    "BACKENDS",
+    "ProfileDB",
+    "db_path",
+    "open_db",
+    "backend",
+    "enable_db",
+    "active_db",
+    "close_all",
+]
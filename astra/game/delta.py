@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from .state import QuestBook
+
+_SCALARS = ("schema_version", "day", "last_seed")
+_NESTED = {"ship": ("sector", "hull", "power"), "player": ("xp", "level")}
+
+
+def _quest_dicts(qs: Any) -> list[dict[str, Any]]:
+    return QuestBook.of(qs).to_list()
+
+
+@dataclass(frozen=True)
+class StateDelta:
+    """
+    Changed field paths -> new values, e.g. {"day": 2, "ship.hull": 98}.
+    achievements/quests are replaced as whole lists when they change. Values are JSON-ready.
+    """
+
+    changes: dict[str, Any] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.changes)
+
+    def apply(self, state: Any) -> Any:
+        top: dict[str, Any] = {}
+        nested: dict[str, dict[str, Any]] = {}
+        for path, value in self.changes.items():
+            head, _, leaf = path.partition(".")
+            if leaf:
+                nested.setdefault(head, {})[leaf] = value
+            elif head in ("achievements", "quests"):
+                top[head] = tuple(value)
+            else:
+                top[head] = value
+        for head, vals in nested.items():
+            top[head] = replace(getattr(state, head), **vals)
+        return replace(state, **top) if top else state
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"changes": dict(self.changes)}
+
+    @classmethod
+    def from_dict(cls, d: dict[str, Any]) -> StateDelta:
+        ch = d.get("changes", {})
+        return cls(changes=dict(ch) if isinstance(ch, dict) else {})
+
+
+def diff(old: Any, new: Any) -> StateDelta:
+    """Field-by-field delta old -> new; shared sub-objects (same identity) are skipped without comparing."""
+    ch: dict[str, Any] = {}
+    for name in _SCALARS:
+        v = getattr(new, name)
+        if v != getattr(old, name):
+            ch[name] = v
+
+    for head, leaves in _NESTED.items():
+        a = getattr(old, head)
+        b = getattr(new, head)
+        if a is b:
+            continue
+        for leaf in leaves:
+            v = getattr(b, leaf)
+            if v != getattr(a, leaf):
+                ch[f"{head}.{leaf}"] = v
+
+    if old.achievements is not new.achievements and list(old.achievements) != list(new.achievements):
+        ch["achievements"] = [str(x) for x in new.achievements]
+
+    if old.quests is not new.quests:
+        qb = _quest_dicts(new.quests)
+        if qb != _quest_dicts(old.quests):
+            ch["quests"] = qb
+
+    return StateDelta(ch)
+
+
+__all__ = ["StateDelta", "diff"]
@@ -1,113 +1,71 @@
 from __future__ import annotations
 
-from dataclasses import replace
+from collections.abc import Sequence
+from itertools import repeat
 from typing import Any
 
-from .balance import load_balance
-from .rng import rng_raw15
+from .balance import BalanceConfig, cached_balance
+from .kernel import ENGINE_KERNEL, StageTimer, TickFrame
 
 
-def _quest_to_dict(q: Any) -> dict[str, Any] | None:
-    # dict-style
-    if isinstance(q, dict):
-        return {
-            "quest_id": str(q.get("quest_id", "")),
-            "status": str(q.get("status", "")),
-            "progress": int(q.get("progress", 0)),
-        }
-
-    # object/dataclass-style
-    if hasattr(q, "quest_id") and hasattr(q, "status") and hasattr(q, "progress"):
-        return {
-            "quest_id": str(getattr(q, "quest_id")),
-            "status": str(getattr(q, "status")),
-            "progress": int(getattr(q, "progress")),
-        }
-
-    return None
-
-
-def _quest_tick_progress(state: Any) -> Any:
-    qs = getattr(state, "quests", [])
-    out: list[dict[str, Any]] = []
-
-    for q in qs:
-        qd = _quest_to_dict(q)
-        if qd is None:
-            continue
-
-        if qd["quest_id"] == "q_ticks_3" and qd["status"] == "active":
-            p = int(qd.get("progress", 0)) + 1
-            qd["progress"] = 3 if p >= 3 else p
-            qd["status"] = "completed" if p >= 3 else "active"
-
-        out.append(qd)
-
-    return replace(state, quests=out)
-
-
-def _award_first_day(state: Any) -> Any:
-    ach = getattr(state, "achievements", None)
-    if not isinstance(ach, list):
-        return state
-    if "Pierwszy dzień" in ach:
-        return state
-    return replace(state, achievements=[*ach, "Pierwszy dzień"])
-
-
-def tick_day(state: Any, *, seed: int | None = None, profile: str = "offline"):
+def tick_day(
+    state: Any,
+    *,
+    seed: int | None = None,
+    profile: str = "offline",
+    balance: BalanceConfig | None = None,
+    timer: StageTimer | None = None,
+):
     """
-    Deterministic tick by seed.
-    Balance (xp/anomaly) is loaded per profile.
+    Deterministic tick by seed: ENGINE_KERNEL (seeded anomaly, xp//10+1 levels, first-day award, q_ticks_3 counter).
+    Balance (xp/anomaly) comes from the per-profile cache unless passed in.
     Golden-compat: hull and power anomaly are rolled independently from raw15 bits.
+    The successor is built in one pass: one replace() per object, unchanged quests/achievements are shared.
     """
-    cfg = load_balance(profile=profile)
-
-    last_seed = int(getattr(state, "last_seed", 0))
-    use_seed = int(last_seed if seed is None else seed)
-
-    day0 = int(getattr(state, "day", 0))
-    day1 = day0 + 1
-
-    ship = state.ship
-    player = state.player
-
-    raw15 = rng_raw15(use_seed)
-    hull_roll = raw15 & 1
-    power_roll = (raw15 >> 2) & 1
-
-    hull = int(getattr(ship, "hull", 100))
-    power = int(getattr(ship, "power", 100))
-
-    txt: list[str] = [f"Dzień {day0} -> {day1}"]
-    if hull_roll == 1:
-        hull -= cfg.anomaly_hull_loss
-        txt.append(f"- hull: -{cfg.anomaly_hull_loss} (anomalia)")
-    if power_roll == 1:
-        power -= cfg.anomaly_power_loss
-        txt.append(f"- power: -{cfg.anomaly_power_loss}")
-
-    xp0 = int(getattr(player, "xp", 0))
-    lvl0 = int(getattr(player, "level", 1))
-    xp1 = xp0 + cfg.xp_per_tick
-    txt.append(f"+XP {cfg.xp_per_tick} (xp={xp1}, lvl={lvl0})")
-
-    lvl1 = max(1, (xp1 // 10) + 1)
-    if lvl1 > lvl0:
-        txt.append(f"ACHIEVEMENT: Awans: Poziom {lvl1}")
-
-    ship1 = replace(ship, hull=hull, power=power)
-    player1 = replace(player, xp=xp1, level=lvl1)
-    state1 = replace(state, day=day1, ship=ship1, player=player1, last_seed=use_seed)
-
-    if day0 == 0:
-        state1 = _award_first_day(state1)
-
-    # golden expectations: quests must be dicts with only quest_id/status/progress
-    state1 = _quest_tick_progress(state1)
+    cfg = cached_balance(profile=profile) if balance is None else balance
+    return ENGINE_KERNEL.run(state, cfg=cfg, seeds=(seed,), timer=timer)
+
+
+def tick_day_inplace(
+    ws: Any,
+    *,
+    seed: int | None = None,
+    profile: str = "offline",
+    balance: BalanceConfig | None = None,
+) -> tuple[list[str], list[dict[str, Any]]]:
+    """tick_day for a mutable WorkingState: same text/events, the state is updated in place."""
+    cfg = cached_balance(profile=profile) if balance is None else balance
+    f = TickFrame.of(ws, cfg)
+    ENGINE_KERNEL.advance(f, seed)
+    f.store(ws)
+    return f.txt, f.events
+
+
+def tick_days(
+    state: Any,
+    n: int,
+    *,
+    seed_schedule: Sequence[int | None] | None = None,
+    profile: str = "offline",
+    balance: BalanceConfig | None = None,
+    timer: StageTimer | None = None,
+):
+    """
+    n sequential tick_day calls in one pass: same final state, text and events.
+    seed_schedule[i] is the seed of day i (None keeps last_seed, as tick_day(seed=None) does);
+    balance is resolved once, state objects are built once.
+    """
+    n_i = int(n)
+    if n_i < 0:
+        raise ValueError("tick_days: n must be >= 0")
+    if seed_schedule is not None and len(seed_schedule) != n_i:
+        raise ValueError(f"tick_days: seed_schedule has {len(seed_schedule)} entries, expected {n_i}")
+    if n_i == 0:
+        return state, [], []
 
-    events = [{"type": "tick_done", "amount": 1, "day": day1}]
-    return state1, txt, events
+    cfg = cached_balance(profile=profile) if balance is None else balance
+    seeds = repeat(None, n_i) if seed_schedule is None else seed_schedule
+    return ENGINE_KERNEL.run(state, cfg=cfg, seeds=seeds, timer=timer)
 
 
-__all__ = ["tick_day"]
+__all__ = ["tick_day", "tick_day_inplace", "tick_days"]
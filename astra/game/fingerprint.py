@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import hashlib
+import struct
+from collections.abc import Iterable
+from typing import Any
+
+from .state import GameState, QuestBook
+
+_INTS = struct.Struct("<7q")  # schema_version, day, hull, power, xp, level, last_seed
+_LEN = struct.Struct("<q")
+
+
+_WIDE = b"astra-fp-wide"  # blake2b personalization of states with a head int beyond int64
+
+
+def _blake(data: bytes = b"", *, person: bytes = b"") -> Any:
+    return hashlib.blake2b(data, digest_size=16, person=person)
+
+
+def _put_int(h: Any, x: int) -> None:
+    try:
+        h.update(_LEN.pack(x))
+    except struct.error:  # beyond int64: length-prefixed decimal, never equal to a packed value
+        _put_strs(h, ("int", str(x)))
+
+
+def _put_strs(h: Any, xs: Iterable[str]) -> None:
+    # length prefixes: no string can be forged from the bytes of its neighbours
+    for x in xs:
+        b = x.encode("utf-8", "surrogatepass")
+        h.update(_LEN.pack(len(b)))
+        h.update(b)
+
+
+def _quest_digest(book: QuestBook) -> bytes:
+    """Digest of a quest book, memoized on the (immutable, shared between states) book."""
+    if book._digest is None:
+        h = _blake()
+        h.update(_LEN.pack(len(book)))
+        for q in book:
+            _put_strs(h, (q.quest_id, q.status))
+            _put_int(h, int(q.progress))
+        object.__setattr__(book, "_digest", h.digest())
+    return book._digest
+
+
+def _digest(state: Any) -> str:
+    ship = state.ship
+    player = state.player
+    ints = (state.schema_version, state.day, ship.hull, ship.power, player.xp, player.level, state.last_seed)
+    try:
+        head = _INTS.pack(*map(int, ints))
+    except struct.error:
+        # Any 56 bytes are a valid packed head, so no in-band marker can tell the wide encoding apart;
+        # it is hashed under its own personalization instead (a separate hash domain, outside the data).
+        h = _blake(person=_WIDE)
+        for x in ints:
+            _put_int(h, int(x))
+    else:
+        h = _blake()
+        h.update(head)
+    _put_strs(h, (str(ship.sector),))
+    h.update(_LEN.pack(len(state.achievements)))
+    _put_strs(h, map(str, state.achievements))
+    h.update(_quest_digest(QuestBook.of(state.quests)))
+    return h.hexdigest()
+
+
+def state_fingerprint(state: Any) -> str:
+    """
+    Stable 128-bit content hash (32 hex chars) of the canonical state content (the fields of to_dict):
+    equal for equal states, across runs and processes. Memoized on frozen GameState instances
+    (and the quest part on the shared QuestBook); a WorkingState is hashed on every call.
+    """
+    if type(state) is not GameState:
+        return _digest(state)
+    if state._fp is None:
+        object.__setattr__(state, "_fp", _digest(state))
+    return state._fp
+
+
+__all__ = ["state_fingerprint"]
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - optional: pip install astra-airi[sim]
+    raise ImportError("astra.game.forecast requires numpy (pip install astra-airi[sim])") from e
+
+from .balance import BalanceConfig, cached_balance
+from .batch import Population
+from .rng import rng_raw15_batch
+
+
+def forecast(
+    state: Any, horizon: int, seeds: Any = None, *, profile: str = "offline", balance: BalanceConfig | None = None
+) -> dict[str, Any]:
+    """
+    Projected trajectories for the next `horizon` ticks (reduce(state, "tick") semantics:
+    tick_day, apply_rules clamping, ticks blocked after game_over).
+
+    seeds: None (every tick reuses last_seed), a (horizon,) schedule, or (S, horizon) for S schedules.
+    Returns arrays of shape (S, horizon) - "hull", "power", "xp", "level", "day" - where column t is the
+    state after tick t+1, plus "game_over_day" (S,), -1 when the ship survives the horizon.
+    One vectorized pass over all schedules; no per-tick state objects are built.
+    Balance comes from the profile's cached balance.json unless passed in (as in engine.tick_day).
+    """
+    cfg = cached_balance(profile=profile) if balance is None else balance
+    h = int(horizon)
+    if h < 0:
+        raise ValueError("forecast: horizon must be >= 0")
+
+    if seeds is None:
+        sched = np.full((1, h), int(state.last_seed), dtype=np.int64)
+    else:
+        sched = np.atleast_2d(np.asarray(seeds, dtype=np.int64))
+        if sched.shape[1] != h:
+            raise ValueError(f"forecast: seed schedule has {sched.shape[1]} columns, expected {h}")
+    n = sched.shape[0]
+
+    if h == 0 or int(state.ship.hull) <= 0 or cfg.anomaly_hull_loss < 0 or cfg.anomaly_power_loss < 0:
+        return _forecast_stepwise(state, sched, cfg)
+
+    # Losses only ever lower hull/power, so clamping is max(0, start - cumulative loss);
+    # the tick that brings hull to 0 is the last one applied (policy blocks the rest).
+    raw15 = rng_raw15_batch(sched.ravel()).astype(np.int64).reshape(n, h)
+    hull = np.maximum(0, int(state.ship.hull) - np.cumsum((raw15 & 1) * cfg.anomaly_hull_loss, axis=1))
+    power = np.maximum(0, int(state.ship.power) - np.cumsum(((raw15 >> 2) & 1) * cfg.anomaly_power_loss, axis=1))
+
+    dead = hull == 0
+    over = dead.any(axis=1)
+    first = np.where(over, dead.argmax(axis=1), h)  # column of the game_over tick
+    ticks = np.minimum(np.arange(1, h + 1, dtype=np.int64), first[:, None] + 1)  # ticks applied so far
+
+    xp = int(state.player.xp) + ticks * cfg.xp_per_tick
+    return {
+        "day": int(state.day) + ticks,
+        "hull": np.take_along_axis(hull, ticks - 1, axis=1),
+        "power": np.take_along_axis(power, ticks - 1, axis=1),
+        "xp": xp,
+        "level": np.maximum(1, xp // 10 + 1),
+        "game_over_day": np.where(over, int(state.day) + first + 1, -1),
+    }
+
+
+def _forecast_stepwise(state: Any, sched: Any, cfg: BalanceConfig) -> dict[str, Any]:
+    """Repairs (negative losses) make the clamp path-dependent; step the population tick by tick."""
+    n, h = sched.shape
+    pop = Population.uniform(n, state)
+    out = {k: np.empty((n, h), dtype=np.int64) for k in ("day", "hull", "power", "xp", "level")}
+    for d in range(h):
+        pop.tick(sched[:, d], balance=cfg)
+        for k, arr in out.items():
+            arr[:, d] = getattr(pop, k)
+    out["game_over_day"] = pop.game_over_day
+    return out
+
+
+__all__ = ["forecast"]
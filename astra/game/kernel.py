@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field, replace
+from time import perf_counter_ns
+from typing import Any
+
+from .balance import BalanceConfig
+from .rng import rng_raw15
+from .state import QuestBook, QuestState
+
+STAGE_ORDER = ("anomaly", "xp_level", "achievements", "quests")
+
+
+@dataclass(slots=True)
+class TickFrame:
+    """
+    Scratch values of a tick in flight. Stages update plain fields; the successor state is
+    built once at the end (or written back into a WorkingState).
+    """
+
+    cfg: BalanceConfig
+    day: int
+    hull: int
+    power: int
+    xp: int
+    level: int
+    last_seed: int
+    achievements: Any
+    quests: QuestBook
+    seed: int | None = None
+    mark: int = 0  # index in events where the current day starts
+    txt: list[str] = field(default_factory=list)
+    events: list[dict[str, Any]] = field(default_factory=list)
+
+    @classmethod
+    def of(cls, state: Any, cfg: BalanceConfig) -> TickFrame:
+        ship = state.ship
+        player = state.player
+        return cls(
+            cfg=cfg,
+            day=int(getattr(state, "day", 0)),
+            hull=int(getattr(ship, "hull", 100)),
+            power=int(getattr(ship, "power", 100)),
+            xp=int(getattr(player, "xp", 0)),
+            level=int(getattr(player, "level", 1)),
+            last_seed=int(getattr(state, "last_seed", 0)),
+            achievements=getattr(state, "achievements", None),
+            quests=QuestBook.of(getattr(state, "quests", ())),
+        )
+
+    def build(self, state: Any) -> Any:
+        return replace(
+            state,
+            day=self.day,
+            ship=replace(state.ship, hull=self.hull, power=self.power),
+            player=replace(state.player, xp=self.xp, level=self.level),
+            achievements=self.achievements,
+            quests=self.quests,
+            last_seed=self.last_seed,
+        )
+
+    def store(self, ws: Any) -> None:
+        ws.day = self.day
+        ws.ship.hull = self.hull
+        ws.ship.power = self.power
+        ws.player.xp = self.xp
+        ws.player.level = self.level
+        ws.achievements = self.achievements
+        ws.quests = self.quests
+        ws.last_seed = self.last_seed
+
+
+Stage = Callable[[TickFrame], None]
+
+
+@dataclass
+class StageTimer:
+    """Accumulated wall time per stage name (perf_counter_ns)."""
+
+    ns: dict[str, int] = field(default_factory=dict)
+    calls: dict[str, int] = field(default_factory=dict)
+
+    def add(self, name: str, dt_ns: int) -> None:
+        self.ns[name] = self.ns.get(name, 0) + dt_ns
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def report(self) -> dict[str, dict[str, float]]:
+        return {
+            name: {
+                "calls": self.calls[name],
+                "total_ms": round(self.ns[name] / 1e6, 3),
+                "ns_per_call": round(self.ns[name] / self.calls[name], 1),
+            }
+            for name in STAGE_ORDER
+            if name in self.ns
+        }
+
+
+@dataclass(frozen=True)
+class TickKernel:
+    """
+    One tick = header (day text + tick_done event) followed by the stages in STAGE_ORDER.
+    Each slot holds a pluggable stage, or None to skip it; the order itself is fixed.
+    """
+
+    anomaly: Stage | None = None
+    xp_level: Stage | None = None
+    achievements: Stage | None = None
+    quests: Stage | None = None
+    stages: tuple[tuple[str, Stage], ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        staged = tuple((name, fn) for name in STAGE_ORDER if (fn := getattr(self, name)) is not None)
+        object.__setattr__(self, "stages", staged)
+
+    def advance(self, f: TickFrame, seed: int | None = None, timer: StageTimer | None = None) -> None:
+        """One day on the frame."""
+        f.seed = seed
+        f.mark = len(f.events)
+        f.txt.append(f"Dzień {f.day} -> {f.day + 1}")
+        f.day += 1
+        f.events.append({"type": "tick_done", "amount": 1, "day": f.day})
+
+        if timer is None:
+            for _name, stage in self.stages:
+                stage(f)
+            return
+        for name, stage in self.stages:
+            t0 = perf_counter_ns()
+            stage(f)
+            timer.add(name, perf_counter_ns() - t0)
+
+    def run(
+        self,
+        state: Any,
+        *,
+        cfg: BalanceConfig,
+        seeds: Iterable[int | None] = (None,),
+        timer: StageTimer | None = None,
+    ) -> tuple[Any, list[str], list[dict[str, Any]]]:
+        """One day per entry of seeds; the successor state is built once."""
+        f = TickFrame.of(state, cfg)
+        for seed in seeds:
+            self.advance(f, seed, timer)
+        return f.build(state), f.txt, f.events
+
+
+# --- quests helpers (QuestBook: golden to_dict format quest_id/status/progress) ---
+
+
+def _tick_quests(qs: QuestBook, ticks: int) -> QuestBook:
+    """Quests after `ticks` days; the same book when nothing changed."""
+    q = qs.get("q_ticks_3")
+    if q is None or q.status != "active":
+        return qs
+    p = q.progress + ticks
+    return qs.put(QuestState(q.quest_id, "completed" if p >= 3 else "active", 3 if p >= 3 else p))
+
+
+def _add_achievements(ach: Any, newly: list[str]) -> Any:
+    if not newly:
+        return ach
+    return (*ach, *newly) if isinstance(ach, tuple) else [*ach, *newly]
+
+
+def _award_first_day(ach: Any) -> Any:
+    if not isinstance(ach, (list, tuple)):
+        return ach
+    if "Pierwszy dzień" in ach:
+        return ach
+    return _add_achievements(ach, ["Pierwszy dzień"])
+
+
+# --- engine stages (golden-compat) ---
+
+
+def seeded_anomaly(f: TickFrame) -> None:
+    """Hull and power anomaly rolled independently from raw15 bits of the tick seed (None keeps last_seed)."""
+    if f.seed is not None:
+        f.last_seed = int(f.seed)
+    raw15 = rng_raw15(f.last_seed)
+    if raw15 & 1:
+        f.hull -= f.cfg.anomaly_hull_loss
+        f.txt.append(f"- hull: -{f.cfg.anomaly_hull_loss} (anomalia)")
+    if (raw15 >> 2) & 1:
+        f.power -= f.cfg.anomaly_power_loss
+        f.txt.append(f"- power: -{f.cfg.anomaly_power_loss}")
+
+
+def xp_level(f: TickFrame) -> None:
+    f.xp += f.cfg.xp_per_tick
+    f.txt.append(f"+XP {f.cfg.xp_per_tick} (xp={f.xp}, lvl={f.level})")
+    lvl1 = max(1, (f.xp // 10) + 1)
+    if lvl1 > f.level:
+        f.txt.append(f"ACHIEVEMENT: Awans: Poziom {lvl1}")
+    f.level = lvl1
+
+
+def first_day(f: TickFrame) -> None:
+    if f.day == 1:
+        f.achievements = _award_first_day(f.achievements)
+
+
+def quest_counter(f: TickFrame) -> None:
+    f.quests = _tick_quests(f.quests, 1)
+
+
+ENGINE_KERNEL = TickKernel(anomaly=seeded_anomaly, xp_level=xp_level, achievements=first_day, quests=quest_counter)
+
+
+__all__ = [
+    "STAGE_ORDER",
+    "TickFrame",
+    "StageTimer",
+    "TickKernel",
+    "ENGINE_KERNEL",
+    "seeded_anomaly",
+    "xp_level",
+    "first_day",
+    "quest_counter",
+]
@@ -1,42 +1,109 @@
 from __future__ import annotations
 
+import base64
 import json
+import os
+import shutil
+from collections import OrderedDict
 from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
+from ..paths import profiles_root
+from .codec import decode_state, encode_state
+from .db import active_db
+from .delta import StateDelta, diff
+from .fingerprint import state_fingerprint
+from .profiles import profile_dir
+from .state import GameState
+from .storage import atomic_write, state_format
 
-def _logbook_path(*, profile: str) -> Path:
-    return Path("data") / "profiles" / profile / "logbook.jsonl"
+# The tail (logbook.jsonl, hot tier) is appended to; once it reaches SEGMENT_BYTES it is moved
+# whole to <cold profile dir>/logbook/NNNNNN.jsonl and a new tail starts. Readers see segments
+# in order, then the tail.
+SEGMENT_BYTES = 4 * 1024 * 1024
+SEGMENTS_DIR = "logbook"
 
+# Snapshots: one equal to the previous snapshot is skipped; otherwise every KEYFRAME_EVERY-th is a
+# full keyframe and the ones between are deltas against it ({"base": keyframe fp, "changes": ...}).
+# The writer's position ({"fp", "key_fp", "n"}) is kept next to the tail in SNAPSHOT_HEAD and rewritten
+# per snapshot; the keyframe itself ({"fp", "state"}) goes to SNAPSHOT_KEY only when a new one is cut.
+KEYFRAME_EVERY = 16
+SNAPSHOT_HEAD = "snapshot_head.json"
+SNAPSHOT_KEY = "snapshot_key.json"
+_KEYS: OrderedDict[tuple[str, str], tuple[str, GameState]] = OrderedDict()  # last keyframe per profile
+_KEYS_MAX = 64
 
-def _append_line(*, profile: str, obj: dict[str, Any]) -> None:
-    p = _logbook_path(profile=profile)
-    p.parent.mkdir(parents=True, exist_ok=True)
+
+def logbook_path(profile: str) -> Path:
+    """The hot tail of the profile's logbook."""
+    return profile_dir(profile) / "logbook.jsonl"
+
+
+def segment_paths(profile: str, *, root: Path | None = None) -> list[Path]:
+    """Archived segments under the profiles root `root` (default: the cold tier), oldest first."""
+    d = profile_dir(profile, root=profiles_root("cold") if root is None else root) / SEGMENTS_DIR
+    return sorted(d.glob("*.jsonl")) if d.is_dir() else []
+
+
+def _rotate(profile: str, tail: Path) -> Path:
+    segs = segment_paths(profile)
+    n = int(segs[-1].stem) + 1 if segs else 1
+    d = profile_dir(profile, root=profiles_root("cold")) / SEGMENTS_DIR
+    d.mkdir(parents=True, exist_ok=True)
+    dst = d / f"{n:06d}.jsonl"
+    try:
+        os.replace(tail, dst)  # same volume: atomic
+    except OSError:
+        shutil.move(tail, dst)  # hot and cold on different volumes: copy + unlink
+    return dst
+
+
+def _append_lines(*, profile: str, objs: list[dict[str, Any]]) -> None:
+    """All records in one write (one transaction with the SQLite backend)."""
+    if not objs:
+        return
+    db = active_db()
+    if db is not None:
+        db.append(profile, objs)
+        return
+    profile_dir(profile, create=True)
+    p = logbook_path(profile)
     with p.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+        f.write("".join(json.dumps(obj, ensure_ascii=False) + "\n" for obj in objs))
+        size = f.tell()
+    if size >= SEGMENT_BYTES:
+        _rotate(profile, p)
+
+
+def _append_line(*, profile: str, obj: dict[str, Any]) -> None:
+    _append_lines(profile=profile, objs=[obj])
 
 
 def iter_logbook(profile: str) -> Iterator[dict[str, Any]]:
-    p = _logbook_path(profile=profile)
-    if not p.exists():
+    db = active_db()
+    if db is not None:
+        yield from db.iter_records(profile)
         return
-    for raw in p.read_text(encoding="utf-8").splitlines():
-        line = raw.strip()
-        if not line:
-            continue
+    for p in [*segment_paths(profile), logbook_path(profile)]:
         try:
-            obj = json.loads(line)
-        except Exception:
+            text = p.read_text(encoding="utf-8")
+        except FileNotFoundError:
             continue
-        if isinstance(obj, dict):
-            yield obj
+        for raw in text.splitlines():
+            line = raw.strip()
+            if not line:
+                continue
+            try:
+                obj = json.loads(line)
+            except Exception:
+                continue
+            if isinstance(obj, dict):
+                yield obj
 
 
 def append_events(profile: str, events: list[dict[str, Any]]) -> None:
-    for ev in events:
-        if isinstance(ev, dict):
-            _append_line(profile=profile, obj=ev)
+    _append_lines(profile=profile, objs=[ev for ev in events if isinstance(ev, dict)])
 
 
 def append_command(profile: str, action: str, **kwargs: Any) -> None:
@@ -45,21 +112,152 @@ def append_command(profile: str, action: str, **kwargs: Any) -> None:
     _append_line(profile=profile, obj=obj)
 
 
-def append_snapshot(profile: str, state: Any) -> None:
-    payload: Any = state.to_dict() if hasattr(state, "to_dict") else state
-    _append_line(profile=profile, obj={"type": "snapshot", "state": payload})
+def _read_small(profile: str, fname: str) -> dict[str, Any]:
+    db = active_db()
+    if db is not None:
+        text = db.read_file(profile, fname)
+    else:
+        try:
+            text = (profile_dir(profile) / fname).read_text(encoding="utf-8")
+        except OSError:
+            text = None
+    try:
+        obj = json.loads(text) if text else {}
+    except ValueError:
+        return {}
+    return obj if isinstance(obj, dict) else {}
+
+
+def _write_small(profile: str, fname: str, obj: dict[str, Any]) -> None:
+    text = json.dumps(obj, ensure_ascii=False)
+    db = active_db()
+    if db is not None:
+        db.write_file(profile, fname, text)
+        return
+    atomic_write(profile_dir(profile, create=True) / fname, text.encode("utf-8"), fsync="never")
+
+
+def _key_slot(profile: str) -> tuple[str, str]:
+    db = active_db()
+    return ("" if db is None else os.fspath(db.path), os.path.abspath(profile_dir(profile)))
+
+
+def _read_key(profile: str, key_fp: str) -> GameState | None:
+    """The keyframe with fingerprint key_fp: from memory while it is current, else from SNAPSHOT_KEY."""
+    slot = _key_slot(profile)
+    hit = _KEYS.get(slot)
+    if hit is not None and hit[0] == key_fp:
+        return hit[1]
+    obj = _read_small(profile, SNAPSHOT_KEY)
+    if obj.get("fp") != key_fp or not isinstance(obj.get("state"), dict):
+        return None  # missing, or left over from an interrupted write: cut a new keyframe
+    state = GameState.from_dict(obj["state"])
+    _remember_key(slot, key_fp, state)
+    return state
+
+
+def _remember_key(slot: tuple[str, str], key_fp: str, state: GameState) -> None:
+    _KEYS[slot] = (key_fp, state)
+    _KEYS.move_to_end(slot)
+    while len(_KEYS) > _KEYS_MAX:
+        _KEYS.popitem(last=False)
+
+
+def _full_snapshot(state: Any, fmt: str, fp: str | None) -> dict[str, Any]:
+    obj: dict[str, Any] = {"type": "snapshot"}
+    if fmt == "bin" and hasattr(state, "ship"):
+        obj.update(codec="bin", state=base64.b64encode(encode_state(state)).decode("ascii"))
+    else:
+        obj["state"] = state.to_dict() if hasattr(state, "to_dict") else state
+    if fp is not None:
+        obj["fp"] = fp
+    return obj
+
+
+def append_snapshot(
+    profile: str, state: Any, *, fmt: str | None = None, keyframe_every: int | None = None
+) -> str | None:
+    """
+    Snapshot record. fmt "bin" stores the astra.game.codec encoding (base64) instead of the
+    state dict; None follows the profile's state_format. For a GameState: skipped when it equals
+    the previous snapshot, else a delta against the last keyframe except every keyframe_every-th
+    (default KEYFRAME_EVERY; 1 = always full). Returns "skipped", "delta" or "full" (None for dicts).
+    """
+    if fmt is None:
+        fmt = state_format(profile)
+    if not isinstance(state, GameState):
+        _append_line(profile=profile, obj=_full_snapshot(state, fmt, None))
+        return None
+    every = KEYFRAME_EVERY if keyframe_every is None else max(1, int(keyframe_every))
+    fp = state_fingerprint(state)
+    head = _read_small(profile, SNAPSHOT_HEAD)
+    if head.get("fp") == fp:
+        return "skipped"
+    n = int(head.get("n", 0))
+    key_fp = head.get("key_fp")
+    key = _read_key(profile, key_fp) if isinstance(key_fp, str) and n + 1 < every else None
+    if key is not None:
+        delta = diff(key, state)
+        _append_line(profile=profile, obj={"type": "snapshot", "base": key_fp, "fp": fp, **delta.to_dict()})
+        _write_small(profile, SNAPSHOT_HEAD, {"fp": fp, "key_fp": key_fp, "n": n + 1})
+        return "delta"
+    _append_line(profile=profile, obj=_full_snapshot(state, fmt, fp))
+    _write_small(profile, SNAPSHOT_KEY, {"fp": fp, "state": state.to_dict()})  # before the head that points to it
+    _write_small(profile, SNAPSHOT_HEAD, {"fp": fp, "key_fp": fp, "n": 0})
+    _remember_key(_key_slot(profile), fp, state)
+    return "full"
+
+
+def is_snapshot(obj: dict[str, Any]) -> bool:
+    if obj.get("type") != "snapshot":
+        return False
+    st = obj.get("state")
+    return isinstance(st, dict) or (obj.get("codec") == "bin" and isinstance(st, str))
+
+
+def is_delta_snapshot(obj: dict[str, Any]) -> bool:
+    return obj.get("type") == "snapshot" and isinstance(obj.get("base"), str) and isinstance(obj.get("changes"), dict)
+
+
+def delta_snapshot(obj: dict[str, Any]) -> StateDelta:
+    """Changes of a delta snapshot, to apply to its keyframe (the full snapshot with fp == obj["base"])."""
+    return StateDelta.from_dict(obj)
+
+
+def snapshot_state(obj: dict[str, Any]) -> Any:
+    """State of a snapshot record: a GameState for binary records, the plain dict otherwise."""
+    if obj.get("codec") == "bin":
+        return decode_state(base64.b64decode(obj["state"]))
+    return obj["state"]
+
+
+def append_delta(profile: str, delta: Any, **kwargs: Any) -> None:
+    obj: dict[str, Any] = {"type": "delta"}
+    obj.update(kwargs)
+    obj.update(delta.to_dict() if hasattr(delta, "to_dict") else {"changes": dict(delta)})
+    _append_line(profile=profile, obj=obj)
 
 
 def append_tx(profile: str, action: str, events: list[dict[str, Any]], **kwargs: Any) -> None:
     # Back-compat for older CLI: append_tx(profile, action, events, seed=..., sector=...)
-    append_command(profile, action, **kwargs)
-    append_events(profile, events)
+    obj: dict[str, Any] = {"type": "command", "action": action}
+    obj.update(kwargs)
+    _append_lines(profile=profile, objs=[obj, *(ev for ev in events if isinstance(ev, dict))])
 
 
 __all__ = [
+    "SEGMENT_BYTES",
+    "KEYFRAME_EVERY",
+    "logbook_path",
+    "segment_paths",
     "iter_logbook",
     "append_events",
     "append_command",
     "append_snapshot",
+    "is_snapshot",
+    "is_delta_snapshot",
+    "delta_snapshot",
+    "snapshot_state",
+    "append_delta",
     "append_tx",
 ]
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import json
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+from ..paths import profiles_root
+from .codec import decode_state
+from .migrations import LATEST_SCHEMA_VERSION, is_current, migrate_dict
+from .profiles import list_profiles, profile_dir, rebuild_index
+from .state import GameState
+from .storage import STATE_FILES, write_state_file
+
+CHECKPOINT_FILE = ".migrate.checkpoint"  # profiles done by an interrupted run, one name per line
+
+
+def _state_file(d: Path) -> Path | None:
+    for fname in STATE_FILES.values():
+        if (d / fname).is_file():
+            return d / fname
+    return None
+
+
+def migrate_file(path: str, *, dry_run: bool = False, fsync: str = "always") -> tuple[int | None, str]:
+    """
+    One state file -> (source schema_version, outcome); outcome is "current", "migrated",
+    "would_migrate" (dry run) or "error: ...". Old JSON is written back atomically in the current schema.
+    """
+    p = Path(path)
+    try:
+        if p.suffix == ".bin":  # written by the codec, always in the schema of the code that saved it
+            return decode_state(p.read_bytes()).schema_version, "current"
+        raw: dict[str, Any] = json.loads(p.read_text("utf-8"))
+        if is_current(raw):
+            return LATEST_SCHEMA_VERSION, "current"
+        sv = int(raw.get("schema_version", 0))
+        state = GameState.from_dict(migrate_dict(raw))
+        if dry_run:
+            return sv, "would_migrate"
+        write_state_file(state, p, fsync=fsync)
+        return sv, "migrated"
+    except (OSError, ValueError, TypeError) as e:
+        return None, f"error: {e}"
+
+
+def _migrate_many(paths: Sequence[str], *, dry_run: bool, fsync: str) -> list[tuple[int | None, str]]:
+    return [migrate_file(p, dry_run=dry_run, fsync=fsync) for p in paths]
+
+
+def _chunks(items: Sequence[str], size: int) -> Iterable[Sequence[str]]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def read_checkpoint(root: Path | None = None) -> set[str]:
+    p = (profiles_root() if root is None else Path(root)) / CHECKPOINT_FILE
+    try:
+        return set(p.read_text(encoding="utf-8").split())
+    except OSError:
+        return set()
+
+
+def migrate_all(
+    *,
+    root: Path | None = None,
+    profiles: Sequence[str] | None = None,
+    jobs: int = 1,
+    dry_run: bool = False,
+    fsync: str = "always",
+    chunk: int = 64,
+    reindex: bool = False,
+) -> dict[str, Any]:
+    """
+    Bring every profile's state file under root (default: the hot profiles root, flat or sharded) to the current
+    schema, `chunk` files per task in a process pool when jobs > 1. Finished profiles are appended to
+    the checkpoint file as results arrive, so a rerun after an interruption skips them; the checkpoint
+    is removed once a run completes without errors. dry_run only reads and counts (no checkpoint).
+    Profiles come from the index (a tree from before it is indexed on first use); reindex=True first rescans
+    the root for profile dirs copied in by hand.
+    Returns counts ("migrated" = would be migrated in a dry run); by_version maps source
+    schema_version -> profiles.
+    """
+    base = profiles_root() if root is None else Path(root)
+    counts: dict[str, Any] = {"profiles": 0, "resumed": 0, "migrated": 0, "current": 0, "errors": 0}
+    by_version: Counter[int] = Counter()
+    errors: list[str] = []
+    if not base.is_dir():
+        return {**counts, "by_version": {}, "error_list": errors}
+
+    if profiles is None:
+        if reindex:
+            rebuild_index(base)
+        profiles = list_profiles(base)
+    done = set() if dry_run else read_checkpoint(base)
+    names: list[str] = []
+    paths: list[str] = []
+    for name in profiles:
+        if name in done:
+            counts["resumed"] += 1
+            continue
+        f = _state_file(profile_dir(name, root=base))
+        if f is not None:
+            names.append(name)
+            paths.append(str(f))
+    counts["profiles"] = len(names)
+
+    size = max(1, int(chunk))
+    if jobs > 1 and len(paths) > size:
+        ex: ProcessPoolExecutor | None = ProcessPoolExecutor(max_workers=jobs)
+        batches = ex.map(partial(_migrate_many, dry_run=dry_run, fsync=fsync), _chunks(paths, size))
+    else:
+        ex = None
+        batches = (_migrate_many(c, dry_run=dry_run, fsync=fsync) for c in _chunks(paths, size))
+
+    ckpt = None if dry_run else (base / CHECKPOINT_FILE).open("a", encoding="utf-8")
+    try:
+        it = iter(names)
+        for results in batches:
+            finished: list[str] = []
+            for (sv, outcome), name in zip(results, it):
+                if sv is None:
+                    counts["errors"] += 1
+                    errors.append(f"{name}: {outcome.removeprefix('error: ')}")
+                    continue
+                by_version[sv] += 1
+                counts["current" if outcome == "current" else "migrated"] += 1
+                finished.append(name)
+            if ckpt is not None and finished:
+                ckpt.write("".join(f"{n}\n" for n in finished))
+                ckpt.flush()
+    finally:
+        if ckpt is not None:
+            ckpt.close()
+        if ex is not None:
+            ex.shutdown(cancel_futures=True)
+
+    if not dry_run and not counts["errors"]:
+        (base / CHECKPOINT_FILE).unlink(missing_ok=True)
+    return {**counts, "by_version": dict(sorted(by_version.items())), "error_list": errors}
+
+
+__all__ = ["CHECKPOINT_FILE", "migrate_file", "read_checkpoint", "migrate_all"]
@@ -1,31 +1,76 @@
 from __future__ import annotations
 
+from collections.abc import Callable
+from functools import cache
 from typing import Any
 
 LATEST_SCHEMA_VERSION = 3
 
+Step = Callable[[dict[str, Any]], None]  # edits a private copy of a vN document in place into vN+1
+
+MIGRATIONS: dict[int, Step] = {}  # source version N -> step N -> N+1
+
+
+@cache
+def _chain(sv: int) -> tuple[Step, ...]:
+    """Steps from sv to LATEST_SCHEMA_VERSION, composed once per source version."""
+    steps = []
+    v = sv
+    while v < LATEST_SCHEMA_VERSION:
+        fn = MIGRATIONS.get(v)
+        if fn is None:
+            supported = "/".join(str(x) for x in [*sorted(MIGRATIONS), LATEST_SCHEMA_VERSION])
+            raise ValueError(f"Unsupported schema_version={sv} (expected {supported})")
+        steps.append(fn)
+        v += 1
+    if v != LATEST_SCHEMA_VERSION:
+        raise ValueError(f"Unsupported schema_version={sv} (newer than {LATEST_SCHEMA_VERSION})")
+    return tuple(steps)
+
+
+def step(version: int) -> Callable[[Step], Step]:
+    """Register fn as the single migration step from `version` to `version + 1`."""
+
+    def deco(fn: Step) -> Step:
+        if version in MIGRATIONS:
+            raise ValueError(f"migration step from v{version} already registered")
+        MIGRATIONS[version] = fn
+        _chain.cache_clear()
+        return fn
+
+    return deco
+
+
+@step(1)
+def _v1_to_v2(d: dict[str, Any]) -> None:
+    # v1 had active_quests, v2+ uses a quests list merged over the catalog
+    d.pop("active_quests", None)
+    d.setdefault("quests", [])
+
+
+@step(2)
+def _v2_to_v3(d: dict[str, Any]) -> None:
+    d.setdefault("last_seed", 0)
+
+
+def is_current(d: dict[str, Any]) -> bool:
+    """Fast path: the document is already in the latest schema (one dict lookup)."""
+    return d.get("schema_version") == LATEST_SCHEMA_VERSION
+
 
 def migrate_dict(d: dict[str, Any]) -> dict[str, Any]:
+    """d in the latest schema: d itself when already current, else a migrated copy (d is left untouched)."""
+    if is_current(d):
+        return d
     sv = int(d.get("schema_version", 0))
-
-    if sv == LATEST_SCHEMA_VERSION:
+    steps = _chain(sv)
+    if not steps:
         return d
+    out = dict(d)
+    for fn in steps:
+        fn(out)
+    out["schema_version"] = LATEST_SCHEMA_VERSION
+    return out
+
 
-    if sv == 2:
-        # v2 -> v3: add last_seed
-        d2 = dict(d)
-        d2["schema_version"] = 3
-        d2.setdefault("last_seed", 0)
-        return d2
-
-    if sv == 1:
-        # v1 -> v3: v1 had active_quests, but v2+ uses quests list with catalog
-        d2 = dict(d)
-        d2.pop("active_quests", None)
-        d2["schema_version"] = 3
-        d2.setdefault("quests", [])
-        d2.setdefault("last_seed", 0)
-        return d2
-
-    # Unknown: fail fast
-    raise ValueError(f"Unsupported schema_version={sv} (expected 1/2/3)")
+__all__ = ["LATEST_SCHEMA_VERSION", "MIGRATIONS", "step", "is_current", "migrate_dict"]
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from pathlib import Path
+
+from ..paths import profiles_root
+
+LAYOUT_FILE = "LAYOUT"  # contains "sharded" once enable_sharding() ran
+INDEX_FILE = "index.tsv"  # append-only: "<name>\t<dir relative to the profiles root>" per line
+
+_SHARD = re.compile(r"[0-9a-f]{2}")
+_RESOLVED: dict[tuple[str, str], Path] = {}  # (abs root, name) -> existing dir; profile dirs never move
+_INDEXES: dict[str, tuple[tuple[int, int], dict[str, str]]] = {}
+
+
+def safe_profile(name: str) -> str:
+    name = (name or "default").strip()
+    if not re.fullmatch(r"[A-Za-z0-9_-]{1,32}", name):
+        return "default"
+    return name
+
+
+def shard_of(name: str) -> str:
+    """Two-level fan-out (256 x 256 dirs) from a stable hash of the name, e.g. "3f/a2"."""
+    h = hashlib.blake2b(name.encode("utf-8"), digest_size=2).hexdigest()
+    return f"{h[:2]}/{h[2:]}"
+
+
+def _base(root: Path | None) -> Path:
+    return profiles_root() if root is None else Path(root)
+
+
+def is_sharded(root: Path | None = None) -> bool:
+    p = _base(root) / LAYOUT_FILE
+    try:
+        return p.read_text(encoding="utf-8").strip() == "sharded"
+    except OSError:
+        return False
+
+
+def _resolve(base: Path, name: str) -> Path:
+    flat = base / name
+    if flat.is_dir():  # legacy flat profiles keep resolving
+        return flat
+    sharded = base / shard_of(name) / name
+    if sharded.is_dir():
+        return sharded
+    return sharded if is_sharded(base) else flat
+
+
+def profile_dir(profile: str, *, root: Path | None = None, create: bool = False) -> Path:
+    """
+    Directory of a profile: <root>/<name> (flat, default) or <root>/ab/cd/<name> once the root is
+    sharded. Existing directories win in either layout. create=True makes it and records it in the index.
+    """
+    base = _base(root)
+    name = safe_profile(profile)
+    key = (os.path.abspath(base), name)
+    d = _RESOLVED.get(key)
+    if d is not None:
+        if not create or d.is_dir():
+            return d
+        del _RESOLVED[key]  # removed behind our back (rmtree, wiped tmpfs): resolve and create again
+    d = _resolve(base, name)
+    if create and not d.is_dir():
+        d.mkdir(parents=True, exist_ok=True)
+        _append_index(base, name, d)
+    if d.is_dir():
+        _RESOLVED[key] = d
+    return d
+
+
+def _append_index(base: Path, name: str, d: Path) -> None:
+    base.mkdir(parents=True, exist_ok=True)
+    if not (base / INDEX_FILE).exists():  # first profile made in a tree from before the index
+        rebuild_index(base)  # records the existing profiles, d included
+        return
+    with (base / INDEX_FILE).open("a", encoding="utf-8") as f:
+        f.write(f"{name}\t{d.relative_to(base).as_posix()}\n")
+
+
+def _read_index_file(p: Path) -> dict[str, str] | None:
+    """Entries of an index file (re-read only when it changes); None when there is none."""
+    try:
+        st = p.stat()
+    except OSError:
+        return None
+    key = (st.st_mtime_ns, st.st_size)
+    name = os.path.abspath(p)
+    hit = _INDEXES.get(name)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    entries: dict[str, str] = {}
+    for line in p.read_text(encoding="utf-8").splitlines():
+        prof, sep, rel = line.partition("\t")
+        if sep and prof:
+            entries.setdefault(prof, rel)
+    _INDEXES[name] = (key, entries)
+    return entries
+
+
+def read_index(root: Path | None = None) -> dict[str, str]:
+    """
+    name -> dir relative to the root. A tree from before the index (no index file yet) is indexed by
+    one full scan on first use, so legacy flat profiles are listed like any other.
+    """
+    base = _base(root)
+    entries = _read_index_file(base / INDEX_FILE)
+    if entries is None:
+        if not base.is_dir():
+            return {}
+        rebuild_index(base)
+        entries = _read_index_file(base / INDEX_FILE) or {}
+    return entries
+
+
+def list_profiles(root: Path | None = None) -> list[str]:
+    """Profile names from the index (no directory listing); see rebuild_index() for dirs copied in by hand."""
+    return sorted(read_index(root))
+
+
+def _shard_leaves(d: Path) -> list[tuple[str, Path]]:
+    """Profiles under a candidate shard dir: <d>/<xx>/<name> where shard_of(name) is exactly "<d>/<xx>"."""
+    found = []
+    for sub in sorted(d.iterdir()):
+        if not (sub.is_dir() and _SHARD.fullmatch(sub.name)):
+            continue
+        for p in sorted(sub.iterdir()):
+            if p.is_dir() and safe_profile(p.name) == p.name and shard_of(p.name) == f"{d.name}/{sub.name}":
+                found.append((p.name, p))
+    return found
+
+
+def rebuild_index(root: Path | None = None) -> int:
+    """
+    One full scan (flat dirs and shard dirs) appending every profile missing from the index; returns how many.
+    A two-hex dir counts as a shard dir only in a sharded root and only when it holds profiles at their
+    hashed position, so a flat profile named e.g. "ab" (empty or not) stays a profile.
+    """
+    base = _base(root)
+    if not base.is_dir():
+        return 0
+    known = _read_index_file(base / INDEX_FILE) or {}
+    sharded = is_sharded(base)
+    found: list[tuple[str, Path]] = []
+    for d in sorted(base.iterdir()):
+        if not d.is_dir():
+            continue
+        leaves = _shard_leaves(d) if sharded and _SHARD.fullmatch(d.name) else []
+        found += leaves or [(d.name, d)]
+    lines = [
+        f"{name}\t{d.relative_to(base).as_posix()}\n"
+        for name, d in found
+        if name not in known and safe_profile(name) == name
+    ]
+    with (base / INDEX_FILE).open("a", encoding="utf-8") as f:  # created even when empty: the tree is indexed
+        f.write("".join(lines))
+    return len(lines)
+
+
+def enable_sharding(root: Path | None = None) -> None:
+    """New profiles go to <root>/ab/cd/<name> from now on; existing flat profiles stay where they are."""
+    base = _base(root)
+    base.mkdir(parents=True, exist_ok=True)
+    (base / LAYOUT_FILE).write_text("sharded\n", encoding="utf-8")
+    rebuild_index(base)
+
+
+__all__ = [
+    "safe_profile",
+    "shard_of",
+    "is_sharded",
+    "profile_dir",
+    "read_index",
+    "list_profiles",
+    "rebuild_index",
+    "enable_sharding",
+]
@@ -1,19 +1,20 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import replace
 from typing import Any
 
-from .engine import tick_day
+from .delta import diff
+from .engine import tick_day, tick_day_inplace
 from .events import EventBus
 from .policy import check_action_allowed
 from .result import ActionError, ActionResult, fail, ok
-from .rules import apply_rules
+from .rules import apply_rules, apply_rules_inplace
 from .validate import validate_move, validate_state, validate_tick
 
 
-def reduce(state: Any, action: str, **kwargs: Any) -> ActionResult:
-    bus = EventBus()
-
+def _check(state: Any, action: str, kwargs: dict[str, Any], bus: EventBus) -> ActionResult | None:
+    """Validation + policy shared by reduce/reduce_inplace; returns the failure result, or None to proceed."""
     st_errs = validate_state(state)
     if st_errs:
         return fail(state, errors=st_errs, text=["ERROR: state validation failed."])
@@ -28,8 +29,7 @@ def reduce(state: Any, action: str, **kwargs: Any) -> ActionResult:
         )
 
     if action == "tick":
-        seed = kwargs.get("seed")
-        v = validate_tick(seed=seed)
+        v = validate_tick(seed=kwargs.get("seed"))
         if v:
             return fail(
                 state,
@@ -37,14 +37,10 @@ def reduce(state: Any, action: str, **kwargs: Any) -> ActionResult:
                 text=["ERROR: tick validation failed."],
                 events=bus.drain(),
             )
-
-        s1, txt, events = tick_day(state, seed=seed, profile=str(kwargs.get("profile", "offline")))
-        s2, rtxt, rev = apply_rules(s1)
-        return ok(s2, text=list(txt) + list(rtxt), events=events + rev + bus.drain())
+        return None
 
     if action == "move":
-        sector = str(kwargs.get("sector", ""))
-        v = validate_move(sector=sector)
+        v = validate_move(sector=str(kwargs.get("sector", "")))
         if v:
             return fail(
                 state,
@@ -52,20 +48,7 @@ def reduce(state: Any, action: str, **kwargs: Any) -> ActionResult:
                 text=["ERROR: move validation failed."],
                 events=bus.drain(),
             )
-
-        ship0 = state.ship
-        # klucz: zachowujemy typ ShipState (nie dict)
-        s1 = replace(state, ship=replace(ship0, sector=sector))
-
-        txt = [f"SECTOR MOVE: {ship0.sector} -> {sector}"]
-        events = [{"type": "sector_moved", "sector": sector}]
-
-        s2, rtxt, rev = apply_rules(s1)
-        return ok(
-            s2,
-            text=txt + list(rtxt),
-            events=events + rev + bus.drain(),
-        )
+        return None
 
     return fail(
         state,
@@ -73,3 +56,80 @@ def reduce(state: Any, action: str, **kwargs: Any) -> ActionResult:
         text=["ERROR: unknown action."],
         events=bus.drain(),
     )
+
+
+def reduce(state: Any, action: str, **kwargs: Any) -> ActionResult:
+    """Apply one action. With delta=True the result also carries a StateDelta (state -> result.state)."""
+    r = _reduce(state, action, kwargs)
+    if kwargs.get("delta"):
+        return replace(r, delta=diff(state, r.state))
+    return r
+
+
+def _reduce(state: Any, action: str, kwargs: dict[str, Any]) -> ActionResult:
+    bus = EventBus()
+
+    blocked = _check(state, action, kwargs, bus)
+    if blocked is not None:
+        return blocked
+
+    if action == "tick":
+        s1, txt, events = tick_day(
+            state,
+            seed=kwargs.get("seed"),
+            profile=str(kwargs.get("profile", "offline")),
+            balance=kwargs.get("balance"),
+        )
+        s2, rtxt, rev = apply_rules(s1)
+        # hot path: txt/events are fresh lists owned by this call, so extend them instead of ok()'s copies
+        txt.extend(rtxt)
+        events.extend(rev)
+        events.extend(bus.drain())
+        return ActionResult(state=s2, text=txt, events=events)
+
+    # move
+    sector = sys.intern(str(kwargs.get("sector", "")))
+    ship0 = state.ship
+    # klucz: zachowujemy typ ShipState (nie dict)
+    s1 = replace(state, ship=replace(ship0, sector=sector))
+
+    txt = [f"SECTOR MOVE: {ship0.sector} -> {sector}"]
+    events = [{"type": "sector_moved", "sector": sector}]
+
+    s2, rtxt, rev = apply_rules(s1)
+    return ok(
+        s2,
+        text=txt + list(rtxt),
+        events=events + rev + bus.drain(),
+    )
+
+
+def reduce_inplace(ws: Any, action: str, **kwargs: Any) -> ActionResult:
+    """
+    reduce() for a mutable WorkingState: the state is updated in place and returned as result.state.
+    Same text/events/errors as reduce(); a failed action leaves ws untouched.
+    """
+    bus = EventBus()
+
+    blocked = _check(ws, action, kwargs, bus)
+    if blocked is not None:
+        return blocked
+
+    if action == "tick":
+        txt, events = tick_day_inplace(
+            ws,
+            seed=kwargs.get("seed"),
+            profile=str(kwargs.get("profile", "offline")),
+            balance=kwargs.get("balance"),
+        )
+    else:
+        sector = sys.intern(str(kwargs.get("sector", "")))
+        txt = [f"SECTOR MOVE: {ws.ship.sector} -> {sector}"]
+        events = [{"type": "sector_moved", "sector": sector}]
+        ws.ship.sector = sector
+
+    rtxt, rev = apply_rules_inplace(ws)
+    txt.extend(rtxt)
+    events.extend(rev)
+    events.extend(bus.drain())
+    return ActionResult(state=ws, text=txt, events=events)
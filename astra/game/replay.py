@@ -4,8 +4,9 @@ from dataclasses import fields, is_dataclass
 from typing import Any
 
 from .actions import apply_action
-from .logbook import iter_logbook
-from .state import default_state
+from .delta import StateDelta
+from .logbook import delta_snapshot, is_delta_snapshot, is_snapshot, iter_logbook, snapshot_state
+from .state import GameState, default_state
 
 
 def _dc_from_dict(proto: Any, data: dict[str, Any]) -> Any:
@@ -15,6 +16,8 @@ def _dc_from_dict(proto: Any, data: dict[str, Any]) -> Any:
 
     out: dict[str, Any] = {}
     for f in fields(proto):
+        if not f.init:
+            continue
         cur = getattr(proto, f.name)
         if f.name in data:
             v = data[f.name]
@@ -27,20 +30,43 @@ def _dc_from_dict(proto: Any, data: dict[str, Any]) -> Any:
     return proto.__class__(**out)
 
 
+def _full_state(obj: dict[str, Any]) -> Any:
+    snap = snapshot_state(obj)
+    return snap if isinstance(snap, GameState) else _dc_from_dict(default_state(), snap)
+
+
+def _keyframe(items: list[dict[str, Any]], end: int, fp: str) -> dict[str, Any] | None:
+    for i in range(end - 1, -1, -1):
+        obj = items[i]
+        if is_snapshot(obj) and obj.get("fp") == fp:
+            return obj
+    return None
+
+
 def replay_state(*, profile: str):
     items = list(iter_logbook(profile))
 
-    last_snap: dict[str, Any] | None = None
+    # latest resolvable snapshot: a full one, or a delta whose keyframe is still in the log
+    state = default_state()
     start_idx = 0
-    for i, obj in enumerate(items):
-        if obj.get("type") == "snapshot" and isinstance(obj.get("state"), dict):
-            last_snap = obj["state"]
+    for i in range(len(items) - 1, -1, -1):
+        obj = items[i]
+        if is_snapshot(obj):
+            state = _full_state(obj)
             start_idx = i + 1
-
-    proto = default_state()
-    state = _dc_from_dict(proto, last_snap) if last_snap else proto
+            break
+        if is_delta_snapshot(obj):
+            key = _keyframe(items, i, obj["base"])
+            if key is not None:
+                state = delta_snapshot(obj).apply(_full_state(key))
+                start_idx = i + 1
+                break
 
     for obj in items[start_idx:]:
+        if obj.get("type") == "delta":
+            # a delta record stands for its own transition (writers log it instead of a command)
+            state = StateDelta.from_dict(obj).apply(state)
+            continue
         if obj.get("type") != "command":
             continue
 
@@ -23,6 +23,7 @@ class ActionResult:
     text: list[str] = field(default_factory=list)
     events: list[dict[str, Any]] = field(default_factory=list)
     errors: list[ActionError] = field(default_factory=list)
+    delta: Any = None  # StateDelta when requested via reduce(..., delta=True)
 
     @property
     def ok(self) -> bool:
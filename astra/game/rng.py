@@ -1,19 +1,33 @@
 from __future__ import annotations
 
+import hashlib
+from array import array
 from collections.abc import Iterable
-from dataclasses import dataclass
-from typing import TypeVar
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+try:
+    import numpy as np
+except ImportError:  # optional: pip install astra-airi[sim]
+    np = None
 
 T = TypeVar("T")
 
+_LCG_A = 1103515245
+_LCG_C = 12345
+_LCG_MASK = 0x7FFFFFFF
+
+_U64 = 0xFFFFFFFFFFFFFFFF
+_GAMMA = 0x9E3779B97F4A7C15
+
 
 def _step(seed: int) -> tuple[int, int]:
     """
     Classic C LCG (31-bit), compatible with legacy golden tests.
     Returns: (new_seed, raw15) where raw15 is like (rand() >> 16) & 0x7fff.
     """
-    s = int(seed) & 0x7FFFFFFF
-    s = (1103515245 * s + 12345) & 0x7FFFFFFF
+    s = int(seed) & _LCG_MASK
+    s = (_LCG_A * s + _LCG_C) & _LCG_MASK
     raw15 = (s >> 16) & 0x7FFF
     return s, raw15
 
@@ -23,11 +37,83 @@ def next_seed(seed: int) -> int:
     return s
 
 
+def _affine_pow(n: int) -> tuple[int, int]:
+    """
+    Coefficients (a, c) of n composed LCG steps: s -> (a * s + c) mod 2^31.
+    The generator has full period 2^31, so n is reduced modulo the period.
+    """
+    a, c = 1, 0
+    sa, sc = _LCG_A, _LCG_C
+    n &= _LCG_MASK
+    while n:
+        if n & 1:
+            a, c = (sa * a) & _LCG_MASK, (sa * c + sc) & _LCG_MASK
+        sa, sc = (sa * sa) & _LCG_MASK, (sa * sc + sc) & _LCG_MASK
+        n >>= 1
+    return a, c
+
+
+def seed_at(seed: int, n: int) -> int:
+    """Seed after n draws from `seed` in O(log n), masked to 31 bits like every LCG state (n=0 included)."""
+    n_i = int(n)
+    if n_i < 0:
+        raise ValueError("seed_at: n must be >= 0")
+    if n_i == 0:
+        return int(seed) & _LCG_MASK
+    a, c = _affine_pow(n_i)
+    return (a * (int(seed) & _LCG_MASK) + c) & _LCG_MASK
+
+
 def rng_raw15(seed: int) -> int:
     _, raw15 = _step(int(seed))
     return raw15
 
 
+def rng_raw15_batch(seeds: Iterable[int]) -> Any:
+    """
+    Vectorized rng_raw15: one raw15 per input seed.
+    Returns ndarray[uint16], or array("H") when NumPy is not installed.
+    """
+    if np is None:
+        return array("H", (rng_raw15(s) for s in seeds))
+    s = np.asarray(seeds)
+    if s.dtype.kind in "iu":  # two's complement & mask == int(seed) & _LCG_MASK, negative seeds included
+        s = s.astype(np.uint64 if s.dtype.kind == "u" else np.int64) & _LCG_MASK
+    else:  # Python ints beyond 64 bits, floats, ...: mask one by one as _step does
+        s = np.array([int(x) & _LCG_MASK for x in s.ravel()], dtype=np.int64).reshape(s.shape)
+    s = (s.astype(np.int64) * _LCG_A + _LCG_C) & _LCG_MASK
+    return ((s >> 16) & 0x7FFF).astype(np.uint16)
+
+
+def seed_stream(seed: int, n: int) -> Any:
+    """
+    Seeds after 1..n draws from `seed` (successive next_seed values).
+    Returns ndarray[uint32], or array("I") when NumPy is not installed.
+    """
+    n_i = int(n)
+    if n_i < 0:
+        raise ValueError("seed_stream: n must be >= 0")
+    if np is None:
+        out = array("I")
+        s = int(seed)
+        for _ in range(n_i):
+            s = next_seed(s)
+            out.append(s)
+        return out
+
+    buf = np.empty(n_i, dtype=np.uint64)
+    if n_i:
+        buf[0] = next_seed(seed)
+    # doubling: the second half of a window is the first half jumped ahead by m steps
+    m = 1
+    while m < n_i:
+        k = min(m, n_i - m)
+        a, c = _affine_pow(m)
+        buf[m : m + k] = (buf[:k] * a + c) & _LCG_MASK
+        m += k
+    return buf.astype(np.uint32)
+
+
 def rng_int(seed: int, lo: int, hi: int) -> int:
     """Deterministic int in [lo, hi] inclusive (no mutation)."""
     lo_i = int(lo)
@@ -71,6 +157,23 @@ class Rng:
         self.seed, raw15 = _step(self.seed)
         return raw15 / 32768.0
 
+    def fill(self, n: int) -> Any:
+        """
+        Next n raw15 draws at once (what n calls to random() would consume).
+        Returns ndarray[uint16], or array("H") when NumPy is not installed.
+        """
+        seeds = seed_stream(self.seed, n)
+        if len(seeds):
+            self.seed = int(seeds[-1])
+        if np is None:
+            return array("H", ((s >> 16) & 0x7FFF for s in seeds))
+        return ((seeds >> 16) & 0x7FFF).astype(np.uint16)
+
+    def jump(self, n: int) -> Rng:
+        """Skip n draws without generating them (O(log n))."""
+        self.seed = seed_at(self.seed, n)
+        return self
+
     def choice(self, items: Iterable[T]) -> T:
         seq = list(items)
         if not seq:
@@ -79,6 +182,100 @@ class Rng:
         return seq[idx]
 
 
+def _mix64(z: int) -> int:
+    """SplitMix64 finalizer (bijective 64-bit mix)."""
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _U64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _U64
+    return z ^ (z >> 31)
+
+
+def _stream_key(profile: str, stream_id: int) -> int:
+    h = hashlib.blake2b(str(profile).encode("utf-8"), digest_size=8).digest()
+    return _mix64(int.from_bytes(h, "little") ^ _mix64((int(stream_id) * _GAMMA) & _U64))
+
+
+def _mix_gamma(z: int) -> int:
+    """SplitMix's mixGamma: an odd 64-bit increment with enough bit transitions (>= 24) to mix well."""
+    z = ((z ^ (z >> 33)) * 0xFF51AFD7ED558CCD) & _U64
+    z = ((z ^ (z >> 33)) * 0xC4CEB9FE1A85EC53) & _U64
+    z = (z ^ (z >> 33)) | 1
+    if (z ^ (z >> 1)).bit_count() < 24:
+        z ^= 0xAAAAAAAAAAAAAAAA
+    return z
+
+
+@dataclass
+class StreamRng:
+    """
+    Counter-based RNG (opt-in, independent of the legacy LCG).
+    Draw i of stream (profile, stream_id) is mix64(key + (i + 1) * gamma), a pure function of i, so any
+    draw is O(1). As in SplitMix's split(), every stream has its own odd gamma as well as its own key:
+    streams are distinct full-period (2^64) sequences, not offsets into one shared sequence.
+    """
+
+    profile: str = "offline"
+    stream_id: int = 0
+    counter: int = 0
+    key: int = field(init=False, repr=False)
+    gamma: int = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.key = _stream_key(self.profile, self.stream_id)
+        self.gamma = _mix_gamma(self.key ^ _GAMMA)
+
+    def at(self, i: int) -> int:
+        """64-bit draw number i (does not move the counter)."""
+        return _mix64((self.key + (int(i) + 1) * self.gamma) & _U64)
+
+    def next64(self) -> int:
+        v = self.at(self.counter)
+        self.counter += 1
+        return v
+
+    def randint(self, lo: int, hi: int) -> int:
+        lo_i = int(lo)
+        hi_i = int(hi)
+        if hi_i < lo_i:
+            lo_i, hi_i = hi_i, lo_i
+        return lo_i + (self.next64() % (hi_i - lo_i + 1))
+
+    def random(self) -> float:
+        return (self.next64() >> 11) / 9007199254740992.0
+
+    def choice(self, items: Iterable[T]) -> T:
+        seq = list(items)
+        if not seq:
+            raise ValueError("choice: empty sequence")
+        return seq[self.randint(0, len(seq) - 1)]
+
+    def jump(self, n: int) -> StreamRng:
+        self.counter += int(n)
+        return self
+
+    def split(self, k: int) -> list[StreamRng]:
+        """
+        k child streams derived from this stream's key (not from its counter),
+        so the same parent always yields the same children.
+        """
+        return [StreamRng(self.profile, _mix64(self.key ^ _mix64(i + 1))) for i in range(int(k))]
+
+    def fill(self, n: int) -> Any:
+        """
+        Next n 64-bit draws at once, advancing the counter.
+        Returns ndarray[uint64], or array("Q") when NumPy is not installed.
+        """
+        n_i = int(n)
+        start = self.counter
+        self.counter += n_i
+        if np is None:
+            return array("Q", (self.at(i) for i in range(start, start + n_i)))
+        idx = np.arange(start + 1, start + n_i + 1, dtype=np.uint64)
+        z = idx * np.uint64(self.gamma) + np.uint64(self.key)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
 # Back-compat aliases
 rand_int = rng_int
 det_int = rng_int
@@ -86,8 +283,12 @@ roll_int = rng_int
 
 __all__ = [
     "Rng",
+    "StreamRng",
     "next_seed",
+    "seed_at",
     "rng_raw15",
+    "rng_raw15_batch",
+    "seed_stream",
     "rng_int",
     "rng_float01",
     "rng_choice",
@@ -8,23 +8,10 @@ def _clamp(v: int, lo: int, hi: int) -> int:
     return max(lo, min(hi, int(v)))
 
 
-def apply_rules(state: Any) -> tuple[Any, list[str], list[dict[str, Any]]]:
-    """
-    Post-rules run AFTER reducer applies an action.
-    - clamp hull/power to 0..100
-    - emit power_down when power==0
-    - emit game_over when hull==0
-    """
+def _check(hull0: Any, power0: Any) -> tuple[int, int, list[str], list[dict[str, Any]]]:
     txt: list[str] = []
     events: list[dict[str, Any]] = []
 
-    ship = getattr(state, "ship", None)
-    if ship is None:
-        return state, txt, events
-
-    hull0 = getattr(ship, "hull", 0)
-    power0 = getattr(ship, "power", 0)
-
     hull = _clamp(hull0, 0, 100)
     power = _clamp(power0, 0, 100)
 
@@ -39,12 +26,43 @@ def apply_rules(state: Any) -> tuple[Any, list[str], list[dict[str, Any]]]:
                 "power": int(power),
             }
         )
-        ship2 = replace(ship, hull=hull, power=power)
-        state = replace(state, ship=ship2)
 
-    if getattr(state.ship, "power", 0) == 0:
+    if power == 0:
         events.append({"type": "power_down"})
-    if getattr(state.ship, "hull", 0) == 0:
+    if hull == 0:
         events.append({"type": "game_over"})
 
+    return hull, power, txt, events
+
+
+def apply_rules(state: Any) -> tuple[Any, list[str], list[dict[str, Any]]]:
+    """
+    Post-rules run AFTER reducer applies an action.
+    - clamp hull/power to 0..100
+    - emit power_down when power==0
+    - emit game_over when hull==0
+    """
+    ship = getattr(state, "ship", None)
+    if ship is None:
+        return state, [], []
+
+    hull0 = getattr(ship, "hull", 0)
+    power0 = getattr(ship, "power", 0)
+    hull, power, txt, events = _check(hull0, power0)
+
+    if hull != hull0 or power != power0:
+        state = replace(state, ship=replace(ship, hull=hull, power=power))
+
     return state, txt, events
+
+
+def apply_rules_inplace(state: Any) -> tuple[list[str], list[dict[str, Any]]]:
+    """apply_rules for a mutable WorkingState: clamps in place, same text/events."""
+    ship = getattr(state, "ship", None)
+    if ship is None:
+        return [], []
+
+    hull, power, txt, events = _check(getattr(ship, "hull", 0), getattr(ship, "power", 0))
+    ship.hull = hull
+    ship.power = power
+    return txt, events
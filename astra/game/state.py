@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import sys
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any
 
+_intern = sys.intern
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class ShipState:
     sector: str = "Mostek"
     hull: int = 100
@@ -16,13 +21,13 @@ class ShipState:
     @classmethod
     def from_dict(cls, d: dict[str, Any]) -> ShipState:
         return cls(
-            sector=str(d.get("sector", "Mostek")),
+            sector=_intern(str(d.get("sector", "Mostek"))),
             hull=int(d.get("hull", 100)),
             power=int(d.get("power", 100)),
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PlayerState:
     xp: int = 0
     level: int = 1
@@ -35,7 +40,7 @@ class PlayerState:
         return cls(xp=int(d.get("xp", 0)), level=int(d.get("level", 1)))
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class QuestState:
     quest_id: str
     status: str = "active"
@@ -47,50 +52,141 @@ class QuestState:
     @classmethod
     def from_dict(cls, d: dict[str, Any]) -> QuestState:
         return cls(
-            quest_id=str(d.get("quest_id", "")),
-            status=str(d.get("status", "active")),
+            quest_id=_intern(str(d.get("quest_id", ""))),
+            status=_intern(str(d.get("status", "active"))),
             progress=int(d.get("progress", 0)),
         )
 
 
-def _default_quests() -> list[QuestState]:
-    return [
+def _as_quest(q: Any) -> QuestState | None:
+    if type(q) is QuestState:
+        return q
+    if isinstance(q, dict):
+        return QuestState.from_dict(q)
+    # object-style (e.g. quests.QuestProgress)
+    if hasattr(q, "quest_id") and hasattr(q, "status") and hasattr(q, "progress"):
+        return QuestState(_intern(str(q.quest_id)), _intern(str(q.status)), int(q.progress))
+    return None
+
+
+@lru_cache(maxsize=256)
+def _index_of(ids: tuple[str, ...]) -> dict[str, int]:
+    # shared read-only: every book with the same id order uses the same index
+    index: dict[str, int] = {}
+    for i, qid in enumerate(ids):
+        index.setdefault(qid, i)
+    return index
+
+
+@dataclass(frozen=True, slots=True)
+class QuestBook:
+    """
+    Immutable quest vector with O(1) lookup by quest_id (first entry wins on duplicate ids).
+    put() returns a new book sharing the untouched entries, and the id index when the ids stay the same.
+    """
+
+    items: tuple[QuestState, ...] = ()
+    _index: dict[str, int] = field(init=False, repr=False, compare=False)
+    _digest: bytes | None = field(default=None, init=False, repr=False, compare=False)  # fingerprint memo
+
+    def __post_init__(self) -> None:
+        if type(self.items) is not tuple:
+            object.__setattr__(self, "items", tuple(self.items))
+        object.__setattr__(self, "_index", _index_of(tuple(q.quest_id for q in self.items)))
+
+    @classmethod
+    def _make(cls, items: tuple[QuestState, ...], index: dict[str, int]) -> QuestBook:
+        book = object.__new__(cls)
+        object.__setattr__(book, "items", items)
+        object.__setattr__(book, "_index", index)
+        object.__setattr__(book, "_digest", None)
+        return book
+
+    @classmethod
+    def of(cls, quests: Iterable[Any]) -> QuestBook:
+        """Book from QuestState/dict/QuestProgress entries; anything else is dropped."""
+        if type(quests) is QuestBook:
+            return quests
+        return cls(tuple(q for q in map(_as_quest, quests) if q is not None))
+
+    def __iter__(self) -> Iterator[QuestState]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __getitem__(self, i: int) -> QuestState:
+        return self.items[i]
+
+    def __contains__(self, quest_id: object) -> bool:
+        return quest_id in self._index
+
+    def get(self, quest_id: str, default: QuestState | None = None) -> QuestState | None:
+        i = self._index.get(quest_id)
+        return default if i is None else self.items[i]
+
+    def put(self, q: QuestState) -> QuestBook:
+        """Replace the entry with q's quest_id in place, or append q."""
+        i = self._index.get(q.quest_id)
+        if i is None:
+            return QuestBook((*self.items, q))
+        if self.items[i] == q:
+            return self
+        return QuestBook._make((*self.items[:i], q, *self.items[i + 1 :]), self._index)
+
+    def to_list(self) -> list[dict[str, Any]]:
+        return [q.to_dict() for q in self.items]
+
+
+# QuestState is immutable, so every fresh state can share the same default book.
+_DEFAULT_QUESTS = QuestBook(
+    (
         QuestState("q_doctor_once", "active", 0),
         QuestState("q_ticks_3", "active", 0),
         QuestState("q_airi_status", "active", 0),
-    ]
+    )
+)
 
 
-@dataclass(frozen=True)
+def with_default_quests(quests: Iterable[Any]) -> QuestBook:
+    """
+    Loaded quests merged over the default book: required defaults always exist, untouched
+    defaults stay shared. Entries that are not QuestState or have no quest_id are dropped.
+    """
+    book = _DEFAULT_QUESTS
+    for q in quests:
+        if isinstance(q, QuestState) and q.quest_id:
+            book = book.put(q)
+    return book
+
+
+@dataclass(frozen=True, slots=True)
 class GameState:
     schema_version: int = 3
     day: int = 0
     ship: ShipState = field(default_factory=ShipState)
     player: PlayerState = field(default_factory=PlayerState)
-    achievements: list[str] = field(default_factory=list)
-    quests: list[Any] = field(default_factory=list)  # QuestState OR dict (back-compat)
+    achievements: tuple[str, ...] = ()
+    quests: QuestBook = QuestBook()
     last_seed: int = 0
+    _fp: str | None = field(default=None, init=False, repr=False, compare=False)  # fingerprint.state_fingerprint memo
+
+    def __post_init__(self) -> None:
+        # Immutable containers so successive states can share them; lists (of QuestState or
+        # dict quests, back-compat) from older callers are converted.
+        if type(self.achievements) is not tuple:
+            object.__setattr__(self, "achievements", tuple(self.achievements))
+        if type(self.quests) is not QuestBook:
+            object.__setattr__(self, "quests", QuestBook.of(self.quests))
 
     def to_dict(self) -> dict[str, Any]:
-        q_out: list[dict[str, Any]] = []
-        for q in self.quests:
-            if isinstance(q, dict):
-                q_out.append(
-                    {
-                        "quest_id": str(q.get("quest_id", "")),
-                        "status": str(q.get("status", "")),
-                        "progress": int(q.get("progress", 0)),
-                    }
-                )
-            elif hasattr(q, "to_dict"):
-                q_out.append(q.to_dict())
         return {
             "schema_version": int(self.schema_version),
             "day": int(self.day),
             "ship": self.ship.to_dict(),
             "player": self.player.to_dict(),
             "achievements": list(self.achievements),
-            "quests": q_out,
+            "quests": self.quests.to_list(),
             "last_seed": int(self.last_seed),
         }
 
@@ -103,31 +199,12 @@ class GameState:
         player = PlayerState.from_dict(player_d) if isinstance(player_d, dict) else PlayerState()
 
         ach = d.get("achievements", [])
-        achievements = [str(x) for x in ach] if isinstance(ach, list) else []
+        achievements = tuple(_intern(str(x)) for x in ach) if isinstance(ach, list) else ()
 
-        # parse quests (support dict/list), then ENSURE required defaults exist
+        # parse quests (support dict/list)
         quests_in = d.get("quests", [])
-        parsed: list[QuestState] = []
-        if isinstance(quests_in, list):
-            for q in quests_in:
-                if isinstance(q, QuestState):
-                    parsed.append(q)
-                elif isinstance(q, dict):
-                    qs = QuestState.from_dict(q)
-                    if qs.quest_id:
-                        parsed.append(qs)
-
-        defaults = _default_quests()
-        by_id: dict[str, QuestState] = {q.quest_id: q for q in defaults}
-        extras: list[QuestState] = []
-
-        for q in parsed:
-            if q.quest_id in by_id:
-                by_id[q.quest_id] = q
-            else:
-                extras.append(q)
-
-        quests: list[QuestState] = list(by_id.values()) + extras
+        parsed = (QuestState.from_dict(q) if isinstance(q, dict) else q for q in quests_in)
+        quests = with_default_quests(parsed if isinstance(quests_in, list) else ())
 
         return cls(
             schema_version=int(d.get("schema_version", 3)),
@@ -146,10 +223,10 @@ def default_state() -> GameState:
         day=0,
         ship=ShipState(sector="Mostek", hull=100, power=100),
         player=PlayerState(xp=0, level=1),
-        achievements=[],
-        quests=_default_quests(),
+        achievements=(),
+        quests=_DEFAULT_QUESTS,
         last_seed=0,
     )
 
 
-__all__ = ["ShipState", "PlayerState", "QuestState", "GameState", "default_state"]
+__all__ = ["ShipState", "PlayerState", "QuestState", "QuestBook", "GameState", "default_state", "with_default_quests"]
@@ -1,39 +1,303 @@
 from __future__ import annotations
 
 import json
-import re
+import os
+import stat
+import tempfile
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
-from .migrations import migrate_dict
+from ..config import config_path, load_config
+from ..paths import profiles_root
+from .codec import decode_state, encode_state
+from .db import ProfileDB, active_db
+from .migrations import is_current, migrate_dict
+from .profiles import list_profiles, profile_dir, rebuild_index, safe_profile
 from .state import GameState, default_state
 
-PROFILES_ROOT = Path("data") / "profiles"
+STATE_FILES = {"json": "game_state.json", "bin": "game_state.bin"}
+FSYNC_POLICIES = ("always", "never")  # always: durable against power loss; never: atomic against crashes only
 
 
-def safe_profile(name: str) -> str:
-    name = (name or "default").strip()
-    if not re.fullmatch(r"[A-Za-z0-9_-]{1,32}", name):
-        return "default"
-    return name
+def state_path(profile: str, *, fmt: str = "json") -> Path:
+    if fmt not in STATE_FILES:
+        raise ValueError(f"unknown state format: {fmt!r} (expected one of: {', '.join(STATE_FILES)})")
+    return profile_dir(profile) / STATE_FILES[fmt]
 
 
-def state_path(profile: str) -> Path:
-    p = safe_profile(profile)
-    return PROFILES_ROOT / p / "game_state.json"
+_FORMATS: dict[str, tuple[tuple[Any, ...] | None, str]] = {}  # profile -> (config.json stat key, format)
+
+
+def state_format(profile: str) -> str:
+    """
+    Format new saves use: state_format from the profile config.json ("json" unless set). The config is
+    re-read only when the file's (st_dev, st_ino, st_mtime_ns, st_size), or the database's files_version(),
+    changes, like BalanceCache.
+    """
+    name = safe_profile(profile)
+    db = active_db()
+    key: tuple[Any, ...] | None
+    if db is not None:
+        key = (os.fspath(db.path), *db.files_version())
+    else:
+        try:
+            st = config_path(profile=name).stat()
+            key = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+        except OSError:
+            key = None
+    hit = _FORMATS.get(name)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    fmt = load_config(profile=name).state_format
+    _FORMATS[name] = (key, fmt)
+    return fmt
+
+
+def read_state_file(path: Path, *, profile: str | None = None) -> GameState:
+    """
+    Load a state file; the format follows the extension (.bin = astra.game.codec, else JSON).
+    An old JSON file of a profile with migrate_on_read set in its config is rewritten (atomically)
+    in the current schema, so it is migrated once instead of on every load.
+    """
+    p = Path(path)
+    if p.suffix == ".bin":
+        return decode_state(p.read_bytes())
+    raw: dict[str, Any] = json.loads(p.read_text("utf-8"))
+    if is_current(raw):
+        return GameState.from_dict(raw)
+    state = GameState.from_dict(migrate_dict(raw))
+    if profile is not None and load_config(profile=safe_profile(profile)).migrate_on_read:
+        write_state_file(state, p)
+    return state
+
+
+def _fsync_dir(d: Path) -> None:
+    try:
+        fd = os.open(d, os.O_RDONLY)
+    except OSError:  # e.g. Windows: directories cannot be opened, rename durability is the OS's job
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+_UMASK = _umask()  # read once: os.umask can only be queried by setting it
+
+
+def _file_mode(p: Path) -> int:
+    """Mode a plain write to p would leave: the existing file's, else 0o666 minus the umask."""
+    try:
+        return stat.S_IMODE(p.stat().st_mode)
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+def atomic_write(path: Path, data: bytes, *, fsync: str = "always") -> None:
+    """
+    Write via a temp file in the same directory + os.replace: readers see the old or the new
+    content, never a torn file. fsync="always" also syncs the file and its directory entry.
+    The file keeps the mode a plain write would give it (mkstemp alone would leave 0600).
+    """
+    if fsync not in FSYNC_POLICIES:
+        raise ValueError(f"unknown fsync policy: {fsync!r} (expected one of: {', '.join(FSYNC_POLICIES)})")
+    p = Path(path)
+    mode = _file_mode(p)
+    fd, tmp = tempfile.mkstemp(dir=p.parent, prefix=f".{p.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if hasattr(os, "fchmod"):
+                os.fchmod(f.fileno(), mode)
+            else:  # Windows: only the read-only bit exists
+                os.chmod(tmp, mode)
+            f.write(data)
+            if fsync == "always":
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, p)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    if fsync == "always":
+        _fsync_dir(p.parent)
+
+
+def encode_state_file(state: GameState, path: Path) -> bytes:
+    """File content for path: .bin = astra.game.codec, else indented JSON."""
+    if Path(path).suffix == ".bin":
+        return encode_state(state)
+    return (json.dumps(state.to_dict(), ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+
+
+def decode_state_file(data: bytes, path: Path) -> GameState:
+    """The state a read of path returns when it holds data (inverse of encode_state_file)."""
+    if Path(path).suffix == ".bin":
+        return decode_state(data)
+    return GameState.from_dict(migrate_dict(json.loads(data.decode("utf-8"))))
+
+
+def write_state_file(state: GameState, path: Path, *, fsync: str = "always") -> None:
+    atomic_write(Path(path), encode_state_file(state, path), fsync=fsync)
+
+
+class StateCache:
+    """
+    LRU of built GameStates keyed by state file: an entry is reused while the file's
+    (st_dev, st_ino, st_mtime_ns, st_size) is unchanged, so a hit costs the one stat() that
+    produced `st`. GameState is immutable, so a hit hands out the cached instance itself.
+    Atomic saves create a new inode, and save_state stores what it wrote right away. Paths are
+    keyed as given (no resolve): the same relative path under another cwd is a different inode.
+    """
+
+    def __init__(self, maxsize: int = 64) -> None:
+        self.maxsize = int(maxsize)
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[tuple[int, int, int, int], GameState]] = OrderedDict()
+
+    @staticmethod
+    def _key(st: os.stat_result) -> tuple[int, int, int, int]:
+        return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def get(self, path: Path, st: os.stat_result, *, profile: str | None = None) -> GameState:
+        """State of path (stat result `st`), read and built only on a miss (see read_state_file for profile)."""
+        name = os.fspath(path)
+        key = self._key(st)
+        hit = self._entries.get(name)
+        if hit is not None and hit[0] == key:
+            self.hits += 1
+            self._entries.move_to_end(name)
+            return hit[1]
+        self.misses += 1
+        state = read_state_file(path, profile=profile)
+        if profile is not None:
+            key = self._key(Path(path).stat())  # the read may have written the file back
+        self._store(name, key, state)
+        return state
+
+    def put(self, path: Path, state: GameState) -> None:
+        """Record a state just written to path."""
+        self._store(os.fspath(path), self._key(Path(path).stat()), state)
+
+    def invalidate(self, path: Path | None = None) -> None:
+        if path is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(os.fspath(path), None)
+
+    def info(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+    def _store(self, name: str, key: tuple[int, int, int, int], state: GameState) -> None:
+        self._entries[name] = (key, state)
+        self._entries.move_to_end(name)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+STATE_CACHE = StateCache()
 
 
 def load_state(*, profile: str) -> GameState:
-    path = state_path(profile)
-    if not path.exists():
-        return default_state()
-    raw: dict[str, Any] = json.loads(path.read_text("utf-8"))
-    migrated = migrate_dict(raw)
-    return GameState.from_dict(migrated)
-
-
-def save_state(state: GameState, *, profile: str) -> None:
-    path = state_path(profile)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    payload = json.dumps(state.to_dict(), ensure_ascii=False, indent=2) + "\n"
-    path.write_text(payload, encoding="utf-8")
+    db = active_db()
+    if db is not None:
+        state = db.load_state(safe_profile(profile))
+        return default_state() if state is None else state
+    for fmt in STATE_FILES:
+        path = state_path(profile, fmt=fmt)
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        return STATE_CACHE.get(path, st, profile=profile)
+    return default_state()
+
+
+def save_state(state: GameState, *, profile: str, fmt: str | None = None, fsync: str = "always") -> None:
+    """
+    Atomic save (see atomic_write) in fmt, or the profile's configured state_format.
+    With the SQLite backend the state row is replaced in one transaction (fmt/fsync do not apply).
+    """
+    db = active_db()
+    if db is not None:
+        db.save_state(safe_profile(profile), state)
+        return
+    fmt = state_format(profile) if fmt is None else fmt
+    profile_dir(profile, create=True)
+    path = state_path(profile, fmt=fmt)
+    data = encode_state_file(state, path)
+    atomic_write(path, data, fsync=fsync)
+    STATE_CACHE.put(path, decode_state_file(data, path))  # normalized like a cold read (e.g. default quests merged)
+    for other in STATE_FILES:
+        if other != fmt:  # a single state file per profile: switching formats drops the old one
+            state_path(profile, fmt=other).unlink(missing_ok=True)
+
+
+def migrate_profiles_to_db(db: ProfileDB, *, root: Path | None = None) -> dict[str, Any]:
+    """
+    Copy every profile under root (default: the hot profiles root, flat or sharded; rescanned first, so
+    dirs the index does not know yet are included) into db: state (migrated to the current schema),
+    logbook records, config.json and balance.json; one transaction per profile. Logbook segments are
+    read from the cold tier by default, from root itself when root is given.
+    Profiles already in db are skipped (so a rerun never duplicates or overwrites newer data); a profile
+    that cannot be read is rolled back and listed in error_list. The directories are left in place.
+    Returns counts.
+    """
+    from .logbook import segment_paths  # logbook imports this module
+
+    base = profiles_root() if root is None else Path(root)
+    cold = profiles_root("cold") if root is None else base
+    counts: dict[str, Any] = {"profiles": 0, "skipped": 0, "states": 0, "records": 0, "files": 0, "errors": 0}
+    errors: list[str] = []
+    if not base.is_dir():
+        return {**counts, "error_list": errors}
+    known = set(db.profiles())
+    rebuild_index(base)
+    for name in list_profiles(base):
+        if name in known:
+            counts["skipped"] += 1
+            continue
+        d = profile_dir(name, root=base)
+        got = {"states": 0, "records": 0, "files": 0}
+        try:
+            with db.batch():
+                for fname in STATE_FILES.values():
+                    if (d / fname).exists():
+                        db.save_state(name, read_state_file(d / fname))
+                        got["states"] += 1
+                        break
+                recs = []
+                for lb in [*segment_paths(name, root=cold), d / "logbook.jsonl"]:  # segments, then the tail
+                    if not lb.exists():
+                        continue
+                    for line in lb.read_text(encoding="utf-8").splitlines():
+                        try:
+                            obj = json.loads(line)
+                        except ValueError:
+                            continue
+                        if isinstance(obj, dict):
+                            recs.append(obj)
+                if recs:
+                    db.append(name, recs)
+                    got["records"] += len(recs)
+                for fname in ("config.json", "balance.json"):
+                    if (d / fname).exists():
+                        db.write_file(name, fname, (d / fname).read_text(encoding="utf-8"))
+                        got["files"] += 1
+        except (OSError, ValueError, TypeError) as e:
+            counts["errors"] += 1
+            errors.append(f"{name}: {e}")
+            continue
+        counts["profiles"] += 1
+        for k, v in got.items():
+            counts[k] += v
+    return {**counts, "error_list": errors}
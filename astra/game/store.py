@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import atexit
+import threading
+from typing import Any
+
+from .state import GameState
+from .storage import FSYNC_POLICIES, load_state, save_state
+
+
+class StateStore:
+    """
+    Saves of one profile's GameState, always atomic (temp file + rename, see storage.atomic_write).
+
+    write_behind=False: every save() writes through.
+    write_behind=True: save() only keeps the latest state; it is written once `every` saves are
+    pending or `interval` seconds after the first pending save, on flush()/close(), and at exit.
+    load() returns the pending state, so readers through the store never see stale data.
+    """
+
+    def __init__(
+        self,
+        profile: str,
+        *,
+        fmt: str | None = None,
+        fsync: str = "always",
+        write_behind: bool = False,
+        interval: float = 1.0,
+        every: int = 50,
+    ) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"unknown fsync policy: {fsync!r} (expected one of: {', '.join(FSYNC_POLICIES)})")
+        if interval <= 0 or every < 1:
+            raise ValueError("StateStore: interval must be > 0 and every >= 1")
+        self.profile = profile
+        self.fmt = fmt
+        self.fsync = fsync
+        self.write_behind = bool(write_behind)
+        self.interval = float(interval)
+        self.every = int(every)
+
+        self.saves = 0  # save() calls
+        self.writes = 0  # files actually written
+        self._pending: GameState | None = None
+        self._n_pending = 0
+        self._timer: threading.Timer | None = None
+        self._lock = threading.RLock()
+        self._closed = False
+        if self.write_behind:
+            atexit.register(self.flush)
+
+    def save(self, state: GameState) -> None:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("StateStore is closed")
+            self.saves += 1
+            if not self.write_behind:
+                self._write(state)
+                return
+            self._pending = state
+            self._n_pending += 1
+            if self._n_pending >= self.every:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def load(self) -> GameState:
+        with self._lock:
+            if self._pending is not None:
+                return self._pending
+        return load_state(profile=self.profile)
+
+    def flush(self) -> None:
+        """Write the pending state now (no-op when nothing is pending)."""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            self._closed = True
+        if self.write_behind:
+            atexit.unregister(self.flush)
+
+    @property
+    def pending(self) -> bool:
+        return self._pending is not None
+
+    def _flush_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        state = self._pending
+        if state is None:
+            return
+        self._write(state)
+        self._pending = None
+        self._n_pending = 0
+
+    def _write(self, state: GameState) -> None:
+        save_state(state, profile=self.profile, fmt=self.fmt, fsync=self.fsync)
+        self.writes += 1
+
+    def __enter__(self) -> StateStore:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+__all__ = ["StateStore"]
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import csv
+import itertools
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from .balance import BalanceConfig
+from .engine import tick_day_inplace
+from .rng import seed_stream
+from .rules import apply_rules_inplace
+from .state import default_state
+from .working import thaw
+
+
+@dataclass(frozen=True)
+class RunStats:
+    """Per-run outcome for one (config, seed) pair."""
+
+    game_over_day: int  # -1 if the ship survived all days
+    level: int
+    power_down: int  # ticks that ended with power == 0
+
+
+@dataclass(frozen=True)
+class PointResult:
+    cfg: BalanceConfig
+    days: int
+    seeds: tuple[int, ...]
+    runs: tuple[RunStats, ...]
+
+    def summary(self) -> dict[str, float | int | str]:
+        n = len(self.runs)
+        over = sorted(r.game_over_day for r in self.runs if r.game_over_day >= 0)
+        levels = sorted(r.level for r in self.runs)
+        return {
+            "xp_per_tick": self.cfg.xp_per_tick,
+            "anomaly_hull_loss": self.cfg.anomaly_hull_loss,
+            "anomaly_power_loss": self.cfg.anomaly_power_loss,
+            "runs": n,
+            "days": self.days,
+            "game_over_rate": round(len(over) / n, 4) if n else 0.0,
+            "game_over_day_p10": _pct(over, 0.10),
+            "game_over_day_p50": _pct(over, 0.50),
+            "game_over_day_p90": _pct(over, 0.90),
+            "level_mean": round(sum(levels) / n, 3) if n else 0.0,
+            "level_p50": _pct(levels, 0.50),
+            "power_down_freq": round(sum(r.power_down for r in self.runs) / (n * self.days), 4) if n else 0.0,
+        }
+
+
+def _pct(sorted_vals: Sequence[int], q: float) -> int | str:
+    """Nearest-rank percentile; "" when there is nothing to rank."""
+    if not sorted_vals:
+        return ""
+    idx = min(len(sorted_vals) - 1, max(0, int(q * len(sorted_vals) + 0.5) - 1))
+    return sorted_vals[idx]
+
+
+def make_grid(xp: Iterable[int], hull_loss: Iterable[int], power_loss: Iterable[int]) -> list[BalanceConfig]:
+    return [BalanceConfig(int(a), int(b), int(c)) for a, b, c in itertools.product(xp, hull_loss, power_loss)]
+
+
+def run_one(cfg: BalanceConfig, seed: int, days: int) -> RunStats:
+    """One ship from default_state, days ticks with reducer semantics (tick_day + apply_rules), mutated in place."""
+    state = thaw(default_state())
+    power_down = 0
+    for s in seed_stream(seed, days):
+        tick_day_inplace(state, seed=int(s), balance=cfg)
+        apply_rules_inplace(state)
+        if state.ship.power == 0:
+            power_down += 1
+        if state.ship.hull == 0:
+            return RunStats(state.day, state.player.level, power_down)  # policy blocks further ticks
+    return RunStats(-1, state.player.level, power_down)
+
+
+def _runs_numpy(cfg: BalanceConfig, seeds: Sequence[int], days: int) -> tuple[RunStats, ...] | None:
+    try:
+        import numpy as np
+
+        from .batch import Population
+    except ImportError:
+        return None
+    sched = np.stack([seed_stream(s, days) for s in seeds], axis=1) if days else None
+    pop = Population.uniform(len(seeds))
+    pop.run(days, sched, balance=cfg)
+    return tuple(RunStats(int(g), int(lv), int(pd)) for g, lv, pd in zip(pop.game_over_day, pop.level, pop.power_down))
+
+
+def evaluate_point(cfg: BalanceConfig, seeds: Sequence[int], days: int) -> PointResult:
+    runs = _runs_numpy(cfg, seeds, days) if seeds else ()
+    if runs is None:
+        runs = tuple(run_one(cfg, s, days) for s in seeds)
+    return PointResult(cfg=cfg, days=int(days), seeds=tuple(seeds), runs=runs)
+
+
+def sweep(grid: Sequence[BalanceConfig], seeds: Sequence[int], days: int, *, jobs: int = 1) -> list[PointResult]:
+    """Evaluate every grid point over the seed corpus; jobs > 1 uses a process pool (one task per point)."""
+    seeds_t = tuple(int(s) for s in seeds)
+    if jobs <= 1 or len(grid) <= 1:
+        return [evaluate_point(cfg, seeds_t, days) for cfg in grid]
+    with ProcessPoolExecutor(max_workers=jobs) as ex:
+        futs = [ex.submit(evaluate_point, cfg, seeds_t, days) for cfg in grid]
+        return [f.result() for f in futs]
+
+
+def write_csv(results: Sequence[PointResult], path: Path) -> Path:
+    rows = [r.summary() for r in results]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=list(rows[0].keys()) if rows else ["xp_per_tick"])
+        w.writeheader()
+        w.writerows(rows)
+    return path
+
+
+def write_npz(results: Sequence[PointResult], path: Path) -> Path:
+    """Per-run arrays: grid (G,3), seeds (S,), game_over_day/level/power_down (G,S)."""
+    import numpy as np
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(
+        path,
+        grid=np.array([[r.cfg.xp_per_tick, r.cfg.anomaly_hull_loss, r.cfg.anomaly_power_loss] for r in results]),
+        seeds=np.array(results[0].seeds if results else ()),
+        days=np.array(results[0].days if results else 0),
+        game_over_day=np.array([[x.game_over_day for x in r.runs] for r in results]),
+        level=np.array([[x.level for x in r.runs] for r in results]),
+        power_down=np.array([[x.power_down for x in r.runs] for r in results]),
+    )
+    return path
+
+
+__all__ = ["RunStats", "PointResult", "make_grid", "run_one", "evaluate_point", "sweep", "write_csv", "write_npz"]
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from .state import GameState, PlayerState, QuestBook, ShipState
+
+
+@dataclass
+class WorkingShip:
+    sector: str = "Mostek"
+    hull: int = 100
+    power: int = 100
+
+
+@dataclass
+class WorkingPlayer:
+    xp: int = 0
+    level: int = 1
+
+
+@dataclass
+class WorkingState:
+    """
+    Mutable counterpart of GameState for simulations/lookahead.
+    reduce_inplace/tick_day_inplace mutate it without copying the tree; freeze() gives an
+    ordinary GameState at commit points. The QuestBook is immutable and simply handed over;
+    freeze() only copies achievements into a tuple.
+    """
+
+    schema_version: int = 3
+    day: int = 0
+    ship: WorkingShip = field(default_factory=WorkingShip)
+    player: WorkingPlayer = field(default_factory=WorkingPlayer)
+    achievements: list[str] = field(default_factory=list)
+    quests: QuestBook = field(default_factory=QuestBook)
+    last_seed: int = 0
+
+    @classmethod
+    def thaw(cls, state: GameState) -> WorkingState:
+        return cls(
+            schema_version=int(state.schema_version),
+            day=int(state.day),
+            ship=WorkingShip(sector=state.ship.sector, hull=int(state.ship.hull), power=int(state.ship.power)),
+            player=WorkingPlayer(xp=int(state.player.xp), level=int(state.player.level)),
+            achievements=list(state.achievements),
+            quests=state.quests,
+            last_seed=int(state.last_seed),
+        )
+
+    def freeze(self) -> GameState:
+        return GameState(
+            schema_version=self.schema_version,
+            day=self.day,
+            ship=ShipState(sector=self.ship.sector, hull=self.ship.hull, power=self.ship.power),
+            player=PlayerState(xp=self.player.xp, level=self.player.level),
+            achievements=tuple(self.achievements),
+            quests=self.quests,
+            last_seed=self.last_seed,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return self.freeze().to_dict()
+
+
+def thaw(state: GameState) -> WorkingState:
+    return WorkingState.thaw(state)
+
+
+__all__ = ["WorkingShip", "WorkingPlayer", "WorkingState", "thaw"]
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+# Data root resolution. Two tiers:
+#   hot  - read/written on every action: game states, logbook tails, profile index, SQLite db, configs
+#   cold - written rarely, read for replays/support: archived logbook segments, reports, error logs
+# ASTRA_DATA moves the whole tree (e.g. onto tmpfs/NVMe); ASTRA_DATA_COLD moves the cold tier only.
+# Unset, both are "data" under the app root (the cwd), i.e. the historical single-directory layout.
+ENV_DATA = "ASTRA_DATA"
+ENV_DATA_COLD = "ASTRA_DATA_COLD"
+DEFAULT_DATA = "data"
+TIERS = ("hot", "cold")
+
+
+def data_root(tier: str = "hot", *, root: Path | None = None) -> Path:
+    """
+    Directory of a tier. Relative settings are taken under root (default: the cwd, kept relative),
+    absolute ones are used as they are.
+    """
+    if tier not in TIERS:
+        raise ValueError(f"unknown data tier: {tier!r} (expected one of: {', '.join(TIERS)})")
+    raw = os.environ.get(ENV_DATA_COLD) if tier == "cold" else None
+    p = Path(raw or os.environ.get(ENV_DATA) or DEFAULT_DATA)
+    return p if root is None or p.is_absolute() else Path(root) / p
+
+
+def profiles_root(tier: str = "hot", *, root: Path | None = None) -> Path:
+    return data_root(tier, root=root) / "profiles"
+
+
+def is_tiered(*, root: Path | None = None) -> bool:
+    """True when the cold tier is a separate directory."""
+    return os.path.abspath(data_root("cold", root=root)) != os.path.abspath(data_root("hot", root=root))
+
+
+__all__ = ["ENV_DATA", "ENV_DATA_COLD", "TIERS", "data_root", "profiles_root", "is_tiered"]
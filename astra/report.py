@@ -3,19 +3,21 @@ from __future__ import annotations
 from pathlib import Path
 from zipfile import ZIP_DEFLATED, ZipFile
 
+from .game.profiles import profile_dir
+from .paths import data_root, profiles_root
+
 
 def make_latest_report_zip(*, profile: str) -> str | None:
-    """Creates data/profiles/<profile>/report_latest.zip from data/errors/error_*.log.
+    """Creates <cold>/profiles/<profile>/report_latest.zip from <cold>/errors/error_*.log (cold tier, see astra.paths).
     Returns zip path as string, or None if no errors exist.
     """
     root = Path.cwd()
-    err_dir = root / "data" / "errors"
+    err_dir = data_root("cold", root=root) / "errors"
     logs = sorted(err_dir.glob("error_*.log"))
     if not logs:
         return None
 
-    out_dir = root / "data" / "profiles" / profile
-    out_dir.mkdir(parents=True, exist_ok=True)
+    out_dir = profile_dir(profile, root=profiles_root("cold", root=root), create=True)
     out_zip = out_dir / "report_latest.zip"
 
     with ZipFile(out_zip, "w", compression=ZIP_DEFLATED) as z:
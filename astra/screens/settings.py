@@ -8,5 +8,7 @@ def run(*, profile: str) -> None:
     print("USTAWIENIA")
     print(f"- profile: {cfg.profile}")
     print(f"- log_enabled: {cfg.log_enabled}")
+    print(f"- state_format: {cfg.state_format}")
+    print(f"- migrate_on_read: {cfg.migrate_on_read}")
     print(f"- config_path: {config_path(profile)}")
     print("Tip: edycja ręczna config.json (na razie bez interaktywnego input).")
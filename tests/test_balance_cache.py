@@ -0,0 +1,50 @@
+import json
+import os
+from pathlib import Path
+
+from astra.game import balance as balance_mod
+from astra.game import engine
+from astra.game.balance import BalanceCache, BalanceConfig, save_balance
+from astra.game.reducer import reduce
+from astra.game.state import default_state
+
+
+def test_balance_cache_stat_invalidation(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    reads = []
+    real = balance_mod._read_balance
+    monkeypatch.setattr(balance_mod, "_read_balance", lambda p: reads.append(p) or real(p))
+
+    cache = BalanceCache()
+    assert cache.get(profile="dev") == BalanceConfig()
+
+    p = Path("data/profiles/dev/balance.json")
+    p.parent.mkdir(parents=True)
+    p.write_text(json.dumps({"xp_per_tick": 7}), encoding="utf-8")
+    assert cache.get(profile="dev").xp_per_tick == 7
+    assert cache.get(profile="dev").xp_per_tick == 7
+    assert len(reads) == 1
+
+    p.write_text(json.dumps({"xp_per_tick": 11, "anomaly_hull_loss": 2}), encoding="utf-8")
+    os.utime(p, ns=(1, 1))
+    assert cache.get(profile="dev").xp_per_tick == 11
+    assert len(reads) == 2
+
+
+def test_save_balance_invalidates_shared_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_balance(profile="dev", cfg=BalanceConfig(xp_per_tick=9))
+    r1 = reduce(default_state(), "tick", seed=123, profile="dev")
+    assert r1.state.player.xp == 9
+    save_balance(profile="dev", cfg=BalanceConfig(xp_per_tick=4))
+    assert reduce(default_state(), "tick", seed=123, profile="dev").state.player.xp == 4
+
+
+def test_reduce_accepts_resolved_balance(monkeypatch):
+    def _no_lookup(**_kw):
+        raise AssertionError("balance lookup in hot path")
+
+    monkeypatch.setattr(engine, "cached_balance", _no_lookup)
+    r = reduce(default_state(), "tick", seed=123, balance=BalanceConfig(xp_per_tick=3))
+    assert r.ok
+    assert r.state.player.xp == 3
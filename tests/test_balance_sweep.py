@@ -0,0 +1,40 @@
+import csv
+import subprocess
+import sys
+
+import pytest
+
+from astra.game import sweep as sweep_mod
+from astra.game.balance import BalanceConfig
+from astra.game.sweep import evaluate_point, make_grid, run_one, sweep
+
+
+def test_sweep_numpy_matches_pure_python():
+    pytest.importorskip("numpy")
+    cfg = BalanceConfig(xp_per_tick=5, anomaly_hull_loss=20, anomaly_power_loss=30)
+    seeds = list(range(1, 21))
+    got = evaluate_point(cfg, seeds, 30).runs
+    assert got == tuple(run_one(cfg, s, 30) for s in seeds)
+
+
+def test_sweep_pool_and_summary(monkeypatch):
+    monkeypatch.setattr(sweep_mod, "_runs_numpy", lambda *a: None)
+    grid = make_grid([5], [1, 50], [1])
+    res = sweep(grid, range(1, 9), 10, jobs=2)
+    assert [r.cfg for r in res] == grid
+    assert res[0].summary()["game_over_rate"] == 0.0
+    assert res[1].summary()["game_over_rate"] > 0.0
+
+
+def test_balance_sweep_cli(tmp_path):
+    out = tmp_path / "sweep.csv"
+    r = subprocess.run(
+        [sys.executable, "-m", "astra", "balance", "sweep", "--hull-loss", "1,40", "--seeds", "5", "--days", "20"]
+        + ["--out", str(out)],
+        capture_output=True,
+        text=True,
+    )
+    assert r.returncode == 0
+    assert "BALANCE SWEEP" in r.stdout
+    rows = list(csv.DictReader(out.read_text(encoding="utf-8").splitlines()))
+    assert [row["anomaly_hull_loss"] for row in rows] == ["1", "40"]
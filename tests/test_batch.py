@@ -0,0 +1,66 @@
+from dataclasses import replace
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from astra.game.balance import BalanceConfig, save_balance  # noqa: E402
+from astra.game.batch import Population  # noqa: E402
+from astra.game.engine import tick_day  # noqa: E402
+from astra.game.rng import seed_stream  # noqa: E402
+from astra.game.rules import apply_rules  # noqa: E402
+from astra.game.state import default_state  # noqa: E402
+
+
+def _reference(state, seeds, cfg):
+    power_down = 0
+    game_over_day = -1
+    for seed in seeds:
+        if state.ship.hull == 0:
+            continue
+        state, _t, _e = tick_day(state, seed=seed, balance=cfg)
+        state, _t, ev = apply_rules(state)
+        types = {e["type"] for e in ev}
+        power_down += "power_down" in types
+        if "game_over" in types:
+            game_over_day = state.day
+    return state, power_down, game_over_day
+
+
+def test_population_matches_reducer_semantics():
+    cfg = BalanceConfig(xp_per_tick=3, anomaly_hull_loss=9, anomaly_power_loss=13)
+    base = default_state()
+    starts = [base, replace(base, ship=replace(base.ship, hull=20, power=5)), replace(base, last_seed=999)]
+    days = 60
+    scheds = [list(seed_stream(s, days)) for s in (123, 999, 7)]
+
+    pop = Population.from_states(starts)
+    pop.run(days, [[scheds[j][d] for j in range(3)] for d in range(days)], balance=cfg)
+
+    for i, s0 in enumerate(starts):
+        ref, pd, god = _reference(s0, scheds[i], cfg)
+        got = pop.state(i)
+        assert (got.day, got.ship.hull, got.ship.power) == (ref.day, ref.ship.hull, ref.ship.power)
+        assert (got.player.xp, got.player.level, got.last_seed) == (ref.player.xp, ref.player.level, ref.last_seed)
+        assert int(pop.power_down[i]) == pd
+        assert int(pop.game_over_day[i]) == god
+
+
+def test_population_uniform_seedless_tick():
+    pop = Population.uniform(4, replace(default_state(), last_seed=123))
+    pop.tick()
+    ref, _t, _e = tick_day(replace(default_state(), last_seed=123), balance=BalanceConfig())
+    assert len(pop) == 4
+    assert pop.hull.tolist() == [ref.ship.hull] * 4
+    assert pop.alive.all()
+
+
+def test_population_uses_the_profile_balance(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cfg = BalanceConfig(xp_per_tick=7, anomaly_hull_loss=11, anomaly_power_loss=0)
+    save_balance(profile="p1", cfg=cfg)
+    pop = Population.uniform(2, replace(default_state(), last_seed=123))
+    pop.run(3, profile="p1")
+    ref, _pd, _god = _reference(replace(default_state(), last_seed=123), [None] * 3, cfg)
+    assert pop.xp.tolist() == [ref.player.xp] * 2 == [21] * 2
+    assert pop.hull.tolist() == [ref.ship.hull] * 2
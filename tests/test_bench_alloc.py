@@ -0,0 +1,11 @@
+from astra.game.bench import tick_allocations
+
+# measured ~20 blocks/tick with the single-pass tick (28 before it); the bound leaves 2 blocks of slack,
+# so sliding back toward the old allocation count fails
+MAX_BLOCKS_PER_TICK = 22
+
+
+def test_tick_allocations_hold_the_line():
+    r = tick_allocations(200)
+    assert r["ticks"] == 200
+    assert 0 < r["blocks_per_tick"] <= MAX_BLOCKS_PER_TICK
@@ -0,0 +1,91 @@
+import json
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from astra.config import Config, load_config, save_config
+from astra.game import storage
+from astra.game.codec import CodecError, decode_state, encode_state
+from astra.game.engine import tick_days
+from astra.game.logbook import append_command, append_snapshot, iter_logbook
+from astra.game.replay import replay_state
+from astra.game.state import QuestState, default_state
+from astra.game.storage import load_state, save_state, state_format, state_path
+
+
+def _mid_game():
+    s, _txt, _events = tick_days(default_state(), 4, seed_schedule=[1, 2, 3, 4])
+    return replace(s, quests=s.quests.put(QuestState("q_extra", "claimed", -2)), last_seed=2**40)
+
+
+def test_roundtrip_keeps_content_and_is_much_smaller():
+    s = _mid_game()
+    data = encode_state(s)
+    back = decode_state(data)
+    assert back == s
+    assert back.to_dict() == s.to_dict()
+    assert len(data) * 4 < len(json.dumps(s.to_dict(), indent=2))
+    assert back.quests[0] is default_state().quests[0]  # untouched defaults stay shared
+
+
+@pytest.mark.parametrize("bad", [b"", b"{}", b"ASTB\x02\x03\x00", b"ASTB\x01\x03\x40\x00"])
+def test_bad_input_raises_codec_error(bad):
+    with pytest.raises(CodecError):
+        decode_state(bad)
+
+
+def test_truncated_input_raises_codec_error():
+    data = encode_state(_mid_game())
+    for cut in (5, 7, len(data) - 1):
+        with pytest.raises(CodecError):
+            decode_state(data[:cut])
+
+
+def test_schema_version_is_checked_and_migrated():
+    s = _mid_game()
+    old = decode_state(encode_state(replace(s, schema_version=2)))
+    assert old.schema_version == 3 and old == s
+    for sv in (0, 99):
+        with pytest.raises(CodecError, match="schema_version"):
+            decode_state(encode_state(replace(s, schema_version=sv)))
+
+
+def test_storage_follows_config_format(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    s = _mid_game()
+    save_state(s, profile="p1")
+    assert state_path("p1").exists()
+
+    save_config(Config(profile="p1", root=tmp_path, state_format="bin"))
+    save_state(s, profile="p1")
+    assert Path("data/profiles/p1/game_state.bin").exists()
+    assert not state_path("p1").exists()
+    assert load_state(profile="p1") == s
+
+    with pytest.raises(ValueError, match="unknown state format"):
+        save_state(s, profile="p1", fmt="xml")
+
+
+def test_state_format_reads_the_config_only_when_it_changes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_config(Config(profile="p1", root=tmp_path, state_format="bin"))
+    assert state_format("p1") == "bin"
+    reads = []
+    monkeypatch.setattr(storage, "load_config", lambda **kw: reads.append(kw) or load_config(**kw))
+    for _ in range(3):
+        save_state(default_state(), profile="p1")
+        append_snapshot("p1", default_state())
+    assert reads == []
+    save_config(Config(profile="p1", root=tmp_path, state_format="json"))
+    assert state_format("p1") == "json" and len(reads) == 1
+
+
+def test_binary_snapshots_replay(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    s = _mid_game()
+    append_snapshot("p1", s, fmt="bin")
+    append_command("p1", "move", sector="AIRI")
+    snap = next(iter_logbook("p1"))
+    assert snap["codec"] == "bin" and isinstance(snap["state"], str)
+    assert replay_state(profile="p1") == replace(s, ship=replace(s.ship, sector="AIRI"))
@@ -0,0 +1,59 @@
+from dataclasses import replace
+from pathlib import Path
+
+from astra.config import Config, load_config, save_config
+from astra.game import logbook
+from astra.game.logbook import append_command, iter_logbook, logbook_path, segment_paths
+from astra.game.state import default_state
+from astra.game.storage import load_state, save_state, state_path
+from astra.paths import data_root, is_tiered
+from astra.report import make_latest_report_zip
+
+
+def test_default_layout_is_data_under_the_cwd(tmp_path, monkeypatch):
+    monkeypatch.delenv("ASTRA_DATA", raising=False)
+    monkeypatch.delenv("ASTRA_DATA_COLD", raising=False)
+    assert data_root() == data_root("cold") == Path("data")
+    assert data_root(root=tmp_path) == tmp_path / "data"
+    assert not is_tiered()
+
+
+def test_env_moves_the_hot_tree(tmp_path, monkeypatch):
+    hot = tmp_path / "nvme"
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("ASTRA_DATA", str(hot))
+    monkeypatch.delenv("ASTRA_DATA_COLD", raising=False)
+
+    save_state(replace(default_state(), day=4), profile="p1")
+    save_config(Config(profile="p1", root=tmp_path, log_enabled=True))
+    assert state_path("p1") == hot / "profiles" / "p1" / "game_state.json"
+    assert load_state(profile="p1").day == 4 and load_config(profile="p1").log_enabled
+    assert not (tmp_path / "data").exists()
+
+
+def test_logbook_segments_rotate_to_the_cold_tier(tmp_path, monkeypatch):
+    hot, cold = tmp_path / "hot", tmp_path / "cold"
+    monkeypatch.setenv("ASTRA_DATA", str(hot))
+    monkeypatch.setenv("ASTRA_DATA_COLD", str(cold))
+    monkeypatch.setattr(logbook, "SEGMENT_BYTES", 200)
+    assert is_tiered()
+
+    for i in range(20):
+        append_command("p1", "tick", seed=i)
+    segs = segment_paths("p1")
+    assert len(segs) > 1 and all(cold in s.parents for s in segs)
+    assert [s.name for s in segs[:2]] == ["000001.jsonl", "000002.jsonl"]
+    assert hot in logbook_path("p1").parents
+    assert [r["seed"] for r in iter_logbook("p1")] == list(range(20))
+
+
+def test_reports_go_to_the_cold_tier(tmp_path, monkeypatch):
+    cold = tmp_path / "cold"
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("ASTRA_DATA", raising=False)
+    monkeypatch.setenv("ASTRA_DATA_COLD", str(cold))
+    (cold / "errors").mkdir(parents=True)
+    (cold / "errors" / "error_0001.log").write_text("boom\n", encoding="utf-8")
+
+    out = Path(make_latest_report_zip(profile="p1"))
+    assert out == cold / "profiles" / "p1" / "report_latest.zip" and out.exists()
@@ -0,0 +1,153 @@
+import json
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from astra.cli import main
+from astra.config import Config, load_config, save_config
+from astra.game import db as dbmod
+from astra.game.balance import BALANCE_CACHE, BalanceConfig, cached_balance, save_balance
+from astra.game.logbook import append_command, append_tx, iter_logbook
+from astra.game.replay import replay_state
+from astra.game.state import default_state
+from astra.game.storage import load_state, migrate_profiles_to_db, save_state, state_path
+
+
+@pytest.fixture(autouse=True)
+def _close_dbs():
+    yield
+    dbmod.close_all()
+
+
+def test_directory_layout_migrates_and_api_keeps_working(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    save_state(replace(default_state(), day=4), profile="p1")
+    append_tx("p1", "move", [{"type": "sector_moved", "sector": "AIRI"}], sector="AIRI")
+    save_balance(profile="p1", cfg=BalanceConfig(xp_per_tick=7))
+    d = default_state().to_dict()
+    d.update(schema_version=2, day=9)
+    del d["last_seed"]
+    Path("data/profiles/old").mkdir(parents=True)
+    Path("data/profiles/old/game_state.json").write_text(json.dumps(d), encoding="utf-8")
+
+    assert main(["db", "migrate"]) == 0  # "old" was copied in after the index existed: the rescan finds it
+    out = capsys.readouterr().out
+    assert "- profiles: 2" in out and "- records: 2" in out
+
+    state_path("p1").unlink()  # the database is the source of truth from now on
+    assert dbmod.active_db() is not None
+    assert load_state(profile="p1").day == 4
+    assert load_state(profile="old").day == 9  # migrated v2 -> v3 on the way in
+    assert cached_balance(profile="p1").xp_per_tick == 7
+    assert [r["type"] for r in iter_logbook("p1")] == ["command", "sector_moved"]
+    assert replay_state(profile="p1").ship.sector == "AIRI"
+
+    save_state(replace(default_state(), day=5), profile="p1")
+    append_command("p1", "tick", seed=1)
+    assert load_state(profile="p1").day == 5
+    assert len(list(iter_logbook("p1"))) == 3
+    assert not Path("data/profiles/p1/game_state.json").exists()
+
+    main(["db", "migrate"])  # rerun: known profiles are skipped, nothing duplicated
+    assert "- skipped: 2" in capsys.readouterr().out
+    assert len(list(iter_logbook("p1"))) == 3
+
+
+def test_migrate_reads_segments_under_an_explicit_root(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("ASTRA_DATA", raising=False)
+    monkeypatch.delenv("ASTRA_DATA_COLD", raising=False)
+    base = tmp_path / "elsewhere" / "profiles"
+    (base / "p1" / "logbook").mkdir(parents=True)
+    (base / "p1" / "logbook" / "000001.jsonl").write_text('{"type": "a"}\n', encoding="utf-8")
+    (base / "p1" / "logbook.jsonl").write_text('{"type": "b"}\n', encoding="utf-8")
+    Path("data/profiles/p1/logbook").mkdir(parents=True)  # same name under the default root: must not be read
+    Path("data/profiles/p1/logbook/000001.jsonl").write_text('{"type": "stale"}\n', encoding="utf-8")
+
+    pdb = dbmod.ProfileDB(tmp_path / "x.sqlite3")
+    assert migrate_profiles_to_db(pdb, root=base)["records"] == 2
+    assert [r["type"] for r in pdb.iter_records("p1")] == ["a", "b"]
+    pdb.close()
+
+
+def test_db_migrate_of_a_legacy_tree_copies_every_profile(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    Path("data/profiles/old").mkdir(parents=True)  # no index.tsv: a tree from before it
+    Path("data/profiles/old/game_state.json").write_text('{"schema_version": 3, "day": 42}', encoding="utf-8")
+    assert main(["db", "migrate"]) == 0
+    assert "- profiles: 1" in capsys.readouterr().out
+    Path("data/profiles/old/game_state.json").unlink()
+    assert load_state(profile="old").day == 42
+
+
+def test_failed_db_migrate_leaves_no_database_behind(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    save_state(replace(default_state(), day=42), profile="good")
+    Path("data/profiles/bad").mkdir()
+    Path("data/profiles/bad/game_state.json").write_text("{not json", encoding="utf-8")
+
+    assert main(["db", "migrate"]) == 1
+    out = capsys.readouterr().out
+    assert "- errors: 1" in out and "bad:" in out and "now use the database" not in out
+    assert not dbmod.db_path().exists() and dbmod.active_db() is None
+    assert load_state(profile="good").day == 42
+
+
+def test_config_lives_in_the_database(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    dbmod.enable_db()
+    assert save_config(Config(profile="p1", root=tmp_path, log_enabled=True)) == dbmod.db_path(tmp_path)
+    assert load_config(tmp_path, profile="p1").log_enabled is True
+    assert not Path("data/profiles/p1/config.json").exists()
+
+
+def test_batch_is_one_transaction(tmp_path):
+    pdb = dbmod.ProfileDB(tmp_path / "x.sqlite3")
+    with pytest.raises(RuntimeError):
+        with pdb.batch():
+            pdb.save_state("p", default_state())
+            raise RuntimeError("boom")
+    assert pdb.load_state("p") is None
+    with pdb.batch():
+        pdb.save_state("p", default_state())
+        pdb.append("p", [{"type": "a"}, {"type": "b"}])
+    assert pdb.load_state("p") == default_state()
+    assert pdb.profiles() == ["p"]
+    pdb.close()
+
+
+def test_backend_is_an_explicit_switch(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_state(replace(default_state(), day=3), profile="p1")
+    dbmod.open_db()  # a database file alone does not switch anything
+    assert dbmod.active_db() is None and load_state(profile="p1").day == 3
+    monkeypatch.setenv("ASTRA_BACKEND", "sqlite")
+    assert dbmod.active_db() is not None
+    monkeypatch.setenv("ASTRA_BACKEND", "files")
+    dbmod.enable_db()
+    assert dbmod.active_db() is None  # the environment wins over the BACKEND file
+    monkeypatch.delenv("ASTRA_BACKEND")
+    assert dbmod.active_db() is not None
+    monkeypatch.setenv("ASTRA_BACKEND", "mysql")
+    with pytest.raises(ValueError):
+        dbmod.active_db()
+
+
+def test_balance_cache_in_database_mode(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    db = dbmod.enable_db()
+    save_balance(profile="p1", cfg=BalanceConfig(xp_per_tick=7))
+    assert cached_balance(profile="p1").xp_per_tick == 7
+    reads = []
+    read_file = db.read_file
+    monkeypatch.setattr(db, "read_file", lambda *a: reads.append(a) or read_file(*a))
+    save_state(default_state(), profile="p1")  # state saves leave the cached balance valid
+    assert cached_balance(profile="p1").xp_per_tick == 7 and reads == []
+    save_balance(profile="p1", cfg=BalanceConfig(xp_per_tick=9))
+    assert cached_balance(profile="p1").xp_per_tick == 9
+
+    other = dbmod.ProfileDB(db.path)  # another process writing the table
+    other.write_file("p1", "balance.json", '{"xp_per_tick": 4}')
+    other.close()
+    assert BALANCE_CACHE.get(profile="p1").xp_per_tick == 4
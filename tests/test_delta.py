@@ -0,0 +1,37 @@
+import json
+
+from astra.game.balance import BalanceConfig
+from astra.game.delta import StateDelta, diff
+from astra.game.logbook import append_delta, append_snapshot
+from astra.game.reducer import reduce
+from astra.game.replay import replay_state
+from astra.game.state import default_state
+
+
+def test_reduce_delta_roundtrip():
+    cfg = BalanceConfig()
+    s = default_state()
+    for action, kw in [("tick", {"seed": 123}), ("move", {"sector": "AIRI"}), ("tick", {"seed": 999})]:
+        r = reduce(s, action, delta=True, balance=cfg, **kw)
+        d = StateDelta.from_dict(json.loads(json.dumps(r.delta.to_dict())))
+        assert d.apply(s).to_dict() == r.state.to_dict()
+        s = r.state
+
+    r = reduce(s, "tick", seed=5, delta=True, balance=cfg)
+    assert set(r.delta.changes) >= {"day", "last_seed", "player.xp"}
+    assert "ship.sector" not in r.delta.changes
+    assert not reduce(s, "move", sector="NOPE-404", delta=True).delta
+    assert reduce(s, "tick", seed=5).delta is None
+    assert not diff(s, s)
+
+
+def test_replay_applies_delta_records(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    s0 = default_state()
+    append_snapshot("dev", s0)
+    r = reduce(s0, "tick", seed=123, delta=True)
+    append_delta("dev", r.delta, action="tick")
+    r2 = reduce(r.state, "move", sector="AIRI", delta=True)
+    append_delta("dev", r2.delta, action="move")
+
+    assert replay_state(profile="dev").to_dict() == r2.state.to_dict()
@@ -0,0 +1,49 @@
+from dataclasses import replace
+
+from astra.game.engine import tick_day
+from astra.game.fingerprint import state_fingerprint
+from astra.game.state import GameState, default_state
+from astra.game.working import thaw
+
+
+def test_fingerprint_follows_content_not_identity():
+    a = default_state()
+    b = GameState.from_dict(a.to_dict())
+    assert a is not b
+    assert state_fingerprint(a) == state_fingerprint(b)
+    assert len(state_fingerprint(a)) == 32
+    assert state_fingerprint(thaw(a)) == state_fingerprint(a)
+
+    s1, _txt, _events = tick_day(a, seed=123)
+    assert state_fingerprint(s1) != state_fingerprint(a)
+    assert state_fingerprint(replace(a, ship=replace(a.ship, sector="AIRI"))) != state_fingerprint(a)
+
+
+def test_fingerprint_is_stable_across_runs():
+    # pinned: must not change between processes or releases without a migration of stored keys
+    assert state_fingerprint(default_state()) == "0ae32f00c5e7d0de67e05198a601a6cd"
+
+
+def test_fingerprint_is_memoized_and_reset_by_replace():
+    s = default_state()
+    fp = state_fingerprint(s)
+    assert s._fp == fp
+    assert s == GameState.from_dict(s.to_dict())  # the memo does not take part in ==
+    assert replace(s, day=5)._fp is None
+
+
+def test_fingerprint_handles_values_beyond_int64():
+    s = default_state()
+    big = replace(s, player=replace(s.player, xp=2**70))
+    assert state_fingerprint(big) != state_fingerprint(replace(s, player=replace(s.player, xp=2**70 + 1)))
+
+
+def test_wide_heads_hash_in_their_own_domain(monkeypatch):
+    from astra.game import fingerprint
+
+    s = default_state()
+    wide = replace(s, schema_version=-1, day=2**64)  # packed heads with schema_version -1 start with 0xff too
+    fp = state_fingerprint(wide)
+    assert fp != state_fingerprint(replace(s, schema_version=-1))
+    monkeypatch.setattr(fingerprint, "_WIDE", b"other")
+    assert state_fingerprint(replace(wide, day=2**64)) != fp  # the personalization is part of the hash
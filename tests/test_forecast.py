@@ -0,0 +1,59 @@
+from dataclasses import replace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from astra.game.balance import BalanceConfig, save_balance  # noqa: E402
+from astra.game.forecast import forecast  # noqa: E402
+from astra.game.reducer import reduce  # noqa: E402
+from astra.game.rng import seed_stream  # noqa: E402
+from astra.game.state import default_state  # noqa: E402
+
+
+def _stepped(state, seeds, cfg):
+    rows = []
+    for s in seeds:
+        r = reduce(state, "tick", seed=int(s), balance=cfg)
+        state = r.state
+        rows.append((state.day, state.ship.hull, state.ship.power, state.player.xp, state.player.level))
+    return rows
+
+
+@pytest.mark.parametrize(
+    "cfg",
+    [
+        BalanceConfig(),
+        BalanceConfig(xp_per_tick=7, anomaly_hull_loss=9, anomaly_power_loss=12),
+        BalanceConfig(xp_per_tick=2, anomaly_hull_loss=-1, anomaly_power_loss=3),
+    ],
+)
+def test_forecast_matches_reducer(cfg):
+    start = replace(default_state(), ship=replace(default_state().ship, hull=60, power=40), day=3)
+    horizon = 80
+    scheds = np.stack([seed_stream(s, horizon) for s in (1, 123, 999)])
+    out = forecast(start, horizon, scheds, balance=cfg)
+
+    for i, seeds in enumerate(scheds):
+        ref = _stepped(start, seeds, cfg)
+        got = list(zip(*(out[k][i].tolist() for k in ("day", "hull", "power", "xp", "level"))))
+        assert got == ref
+
+
+def test_forecast_single_schedule_and_seedless():
+    s = replace(default_state(), last_seed=123)
+    out = forecast(s, 10)
+    assert out["hull"].shape == (1, 10)
+    ref = _stepped(s, [123] * 10, BalanceConfig())
+    assert out["hull"][0].tolist() == [r[1] for r in ref]
+    assert forecast(s, 0)["xp"].shape == (1, 0)
+
+
+def test_forecast_uses_the_profile_balance(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cfg = BalanceConfig(xp_per_tick=7, anomaly_hull_loss=9, anomaly_power_loss=12)
+    save_balance(profile="p1", cfg=cfg)
+    s = replace(default_state(), last_seed=123)
+    out = forecast(s, 10, profile="p1")
+    ref = _stepped(s, [123] * 10, cfg)
+    assert list(zip(*(out[k][0].tolist() for k in ("day", "hull", "power", "xp", "level")))) == ref
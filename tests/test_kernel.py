@@ -0,0 +1,54 @@
+from dataclasses import replace
+
+from astra.game.balance import BalanceConfig
+from astra.game.bench import stage_timings
+from astra.game.engine import tick_day
+from astra.game.kernel import ENGINE_KERNEL, STAGE_ORDER, StageTimer, TickKernel
+from astra.game.state import default_state
+
+
+def test_stage_order_is_fixed_and_pluggable():
+    seen = []
+    k = TickKernel(quests=lambda f: seen.append("quests"), anomaly=lambda f: seen.append("anomaly"))
+    s1, txt, events = k.run(default_state(), cfg=BalanceConfig())
+    assert seen == ["anomaly", "quests"]
+    assert s1.day == 1
+    assert events == [{"type": "tick_done", "amount": 1, "day": 1}]
+    assert [name for name, _ in ENGINE_KERNEL.stages] == list(STAGE_ORDER)
+
+    calm = replace(ENGINE_KERNEL, anomaly=None)
+    s2, _t, _e = calm.run(default_state(), cfg=BalanceConfig(), seeds=[123])
+    assert (s2.ship.hull, s2.ship.power) == (100, 100)
+
+
+def test_stage_timer_reports_every_stage():
+    timer = StageTimer()
+    tick_day(default_state(), seed=123, balance=BalanceConfig(), timer=timer)
+    assert list(timer.report()) == list(STAGE_ORDER)
+    assert set(stage_timings(50)) == set(STAGE_ORDER)
+
+
+def test_kernel_tick_invariants():
+    kernel = ENGINE_KERNEL
+    s0 = replace(default_state(), achievements=["x"])
+    seeds = [123, 999, 7, None, 42]
+    s, txt, events = kernel.run(s0, cfg=BalanceConfig(), seeds=seeds)
+    assert s0 == replace(default_state(), achievements=["x"])  # the input state is left alone
+    assert [name for name, _ in kernel.stages] == list(STAGE_ORDER)
+    assert [e for e in events if e["type"] == "tick_done"] == [
+        {"type": "tick_done", "amount": 1, "day": d} for d in range(1, len(seeds) + 1)
+    ]
+    assert [t for t in txt if t.startswith("Dzień")] == [f"Dzień {d} -> {d + 1}" for d in range(len(seeds))]
+
+    prev = s0
+    for seed in seeds:  # one day at a time ends where the batch ends
+        nxt, _t, _e = kernel.run(prev, cfg=BalanceConfig(), seeds=[seed])
+        assert nxt.day == prev.day + 1 and nxt.ship.sector == prev.ship.sector
+        assert nxt.ship.hull <= prev.ship.hull and nxt.ship.power <= prev.ship.power
+        assert nxt.player.xp > prev.player.xp and nxt.player.level >= prev.player.level
+        assert list(nxt.achievements)[: len(prev.achievements)] == list(prev.achievements)
+        assert "Pierwszy dzień" in nxt.achievements
+        old_q = {q.quest_id: q for q in prev.quests}
+        assert all(q.progress >= old_q[q.quest_id].progress for q in nxt.quests if q.quest_id in old_q)
+        prev = nxt
+    assert prev == s
@@ -0,0 +1,77 @@
+import json
+import shutil
+from pathlib import Path
+
+from astra.cli import main
+from astra.game.migrate_all import CHECKPOINT_FILE, migrate_all
+from astra.game.state import default_state
+from astra.game.storage import load_state, save_state, state_path
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _legacy(name: str, fixture: str) -> Path:
+    d = Path("data/profiles") / name
+    d.mkdir(parents=True, exist_ok=True)
+    shutil.copy(FIXTURES / fixture, d / "game_state.json")
+    return d / "game_state.json"
+
+
+def _sv(p: Path) -> int:
+    return json.loads(p.read_text("utf-8"))["schema_version"]
+
+
+def test_dry_run_counts_per_version_and_writes_nothing(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    v1 = _legacy("a", "state_v1.json")
+    _legacy("b", "state_v2.json")
+    _legacy("c", "state_v2.json")
+    save_state(default_state(), profile="d")
+
+    r = migrate_all(dry_run=True)
+    assert r["by_version"] == {1: 1, 2: 2, 3: 1}
+    assert (r["migrated"], r["current"], r["errors"]) == (3, 1, 0)
+    assert _sv(v1) == 1
+    assert not Path("data/profiles", CHECKPOINT_FILE).exists()
+
+
+def test_migrates_in_place_with_a_pool(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    paths = [_legacy(f"p{i}", "state_v1.json" if i % 2 else "state_v2.json") for i in range(6)]
+    expected = load_state(profile="p1")
+
+    r = migrate_all(jobs=2, chunk=2)
+    assert (r["profiles"], r["migrated"], r["errors"]) == (6, 6, 0)
+    assert all(_sv(p) == 3 for p in paths)
+    assert load_state(profile="p1") == expected
+    assert not Path("data/profiles", CHECKPOINT_FILE).exists()
+    assert migrate_all()["current"] == 6
+
+
+def test_resumes_from_checkpoint_and_keeps_it_on_errors(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    done = _legacy("done", "state_v1.json")
+    todo = _legacy("todo", "state_v1.json")
+    bad = _legacy("bad", "state_v1.json")
+    bad.write_text('{"schema_version": 99}', encoding="utf-8")
+    Path("data/profiles", CHECKPOINT_FILE).write_text("done\n", encoding="utf-8")
+
+    assert main(["migrate", "--all", "--jobs", "1"]) == 1
+    out = capsys.readouterr().out
+    assert "- resumed: 1" in out and "- migrated: 1" in out and "- errors: 1" in out
+    assert _sv(done) == 1 and _sv(todo) == 3
+    assert Path("data/profiles", CHECKPOINT_FILE).read_text("utf-8").split() == ["done", "todo"]
+
+    bad.unlink()
+    assert main(["migrate", "--all"]) == 0
+    assert not Path("data/profiles", CHECKPOINT_FILE).exists()
+    assert state_path("todo").exists()
+
+
+def test_cli_dry_run_sees_a_legacy_tree(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    _legacy("a", "state_v2.json")
+    _legacy("b", "state_v2.json")
+    assert main(["migrate", "--all", "--dry-run"]) == 0
+    out = capsys.readouterr().out
+    assert "- profiles: 2" in out and "- schema_version 2: 2" in out
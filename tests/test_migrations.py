@@ -27,3 +27,46 @@ def test_migrate_v2_to_v3():
     assert "last_seed" in out
     s = GameState.from_dict(out)
     assert s.schema_version == 3
+
+
+def test_chains_are_composed_once_and_current_docs_pass_through():
+    from astra.game.migrations import MIGRATIONS, _chain, is_current
+
+    assert set(MIGRATIONS) == {1, 2}
+    assert _chain(1) is _chain(1) and len(_chain(1)) == 2 and _chain(3) == ()
+    d = {"schema_version": 3, "day": 1}
+    assert is_current(d) and migrate_dict(d) is d
+
+    v1 = _read("state_v1.json")
+    out = migrate_dict(v1)
+    assert "active_quests" not in out and out["quests"] is not None and out["last_seed"] == 0
+    assert v1["schema_version"] == 1  # source left untouched
+
+
+def test_unsupported_versions_fail_fast():
+    import pytest
+
+    for sv in (0, 4, 99):
+        with pytest.raises(ValueError, match="Unsupported schema_version"):
+            migrate_dict({"schema_version": sv})
+
+
+def test_migrate_on_read_writes_old_files_back_once(tmp_path, monkeypatch):
+    import shutil
+
+    from astra.config import Config, save_config
+    from astra.game.storage import STATE_CACHE, load_state, state_path
+
+    monkeypatch.chdir(tmp_path)
+    for name in ("lazy", "eager"):
+        state_path(name).parent.mkdir(parents=True)
+        shutil.copy(Path(__file__).parent / "fixtures" / "state_v1.json", state_path(name))
+    save_config(Config(profile="eager", root=tmp_path, migrate_on_read=True))
+    STATE_CACHE.invalidate()
+
+    assert load_state(profile="lazy") == load_state(profile="eager")
+    assert json.loads(state_path("lazy").read_text("utf-8"))["schema_version"] == 1
+    assert json.loads(state_path("eager").read_text("utf-8"))["schema_version"] == 3
+    h = STATE_CACHE.hits
+    load_state(profile="eager")
+    assert STATE_CACHE.hits == h + 1  # the cache entry matches the rewritten file
@@ -0,0 +1,190 @@
+import io
+import json
+import tarfile
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from astra.cli import main
+from astra.config import Config, load_config, save_config
+from astra.game import db as dbmod
+from astra.game import logbook
+from astra.game.archive import ArchiveError, export_profiles, import_profiles
+from astra.game.balance import BalanceConfig, load_balance, save_balance
+from astra.game.logbook import append_command, iter_logbook, segment_paths
+from astra.game.state import default_state
+from astra.game.storage import load_state, save_state
+
+
+@pytest.fixture(autouse=True)
+def _close_dbs():
+    yield
+    dbmod.close_all()
+
+
+def _make(root, monkeypatch, names=("p1", "p2")):
+    monkeypatch.chdir(root)
+    monkeypatch.setattr(logbook, "SEGMENT_BYTES", 300)
+    for i, name in enumerate(names):
+        save_state(replace(default_state(), day=10 + i), profile=name)
+        save_balance(profile=name, cfg=BalanceConfig(xp_per_tick=3 + i))
+        save_config(Config(profile=name, root=root, log_enabled=True))
+        for k in range(12):
+            append_command(name, "tick", seed=k)
+    assert segment_paths("p1")
+
+
+def test_round_trip_between_roots_with_parallel_import(tmp_path, monkeypatch):
+    src, dst = tmp_path / "a", tmp_path / "b"
+    src.mkdir()
+    dst.mkdir()
+    _make(src, monkeypatch)
+    assert main(["profiles", "export", str(tmp_path / "all.tar.gz"), "--all"]) == 0
+
+    monkeypatch.chdir(dst)
+    r = import_profiles(tmp_path / "all.tar.gz", jobs=2)
+    assert (r["profiles"], r["imported"], r["errors"]) == (2, 2, 0)
+    assert load_state(profile="p2").day == 11
+    assert load_balance(profile="p2").xp_per_tick == 4 and load_config(profile="p1").log_enabled
+    assert [x["seed"] for x in iter_logbook("p1")] == list(range(12))
+    assert segment_paths("p1")  # segments stay segments
+    assert not list((dst / "data" / "profiles").glob(".import-*"))
+
+    assert import_profiles(tmp_path / "all.tar.gz")["skipped"] == 2
+    save_state(replace(default_state(), day=99), profile="p1")
+    assert import_profiles(tmp_path / "all.tar.gz", replace=True)["imported"] == 2
+    assert load_state(profile="p1").day == 10
+    assert [x["seed"] for x in iter_logbook("p1")] == list(range(12))
+
+
+def test_selected_profiles_through_a_stream_into_sqlite(tmp_path, monkeypatch):
+    src, dst = tmp_path / "a", tmp_path / "b"
+    src.mkdir()
+    dst.mkdir()
+    _make(src, monkeypatch)
+    buf = io.BytesIO()
+    assert export_profiles(buf, ["p2", "nope"])["profiles"] == 1
+
+    monkeypatch.chdir(dst)
+    dbmod.enable_db()
+    buf.seek(0)
+    assert import_profiles(buf)["imported"] == 1
+    assert load_state(profile="p2").day == 11 and load_balance(profile="p2").xp_per_tick == 4
+    assert len(list(iter_logbook("p2"))) == 12
+
+    out = io.BytesIO()
+    assert export_profiles(out) == {"profiles": 1, "files": 4}  # state, logbook, balance, config
+    out.seek(0)
+    with tarfile.open(fileobj=out, mode="r|") as tar:
+        assert [m.name for m in tar][0] == "MANIFEST.json"
+
+
+def test_export_all_includes_legacy_and_copied_in_profiles(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    Path("data/profiles/legacy").mkdir(parents=True)
+    Path("data/profiles/legacy/game_state.json").write_text('{"schema_version": 3, "day": 42}', encoding="utf-8")
+    save_state(default_state(), profile="p1")
+    Path("data/profiles/copied").mkdir()  # after the index exists
+    Path("data/profiles/copied/game_state.json").write_text('{"schema_version": 3, "day": 7}', encoding="utf-8")
+
+    assert main(["profile", "export", "all.tar", "--all"]) == 0
+    assert "- profiles: 3" in capsys.readouterr().out
+    with tarfile.open("all.tar") as tar:
+        assert json.loads(tar.extractfile("MANIFEST.json").read())["profiles"] == ["copied", "legacy", "p1"]
+
+
+def test_rejects_foreign_and_unsafe_archives(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    def tar_with(*names):
+        buf = io.BytesIO()
+        with tarfile.open(fileobj=buf, mode="w") as tar:
+            for n in names:
+                data = b'{"format": "astra-profiles", "version": 1, "profiles": []}'
+                info = tarfile.TarInfo(n)
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+        buf.seek(0)
+        return buf
+
+    with pytest.raises(ArchiveError, match="not a profile archive"):
+        import_profiles(tar_with("profiles/p1/game_state.json"))
+    with pytest.raises(ArchiveError, match="unexpected archive member"):
+        import_profiles(tar_with("MANIFEST.json", "profiles/../../evil.json"))
+    with pytest.raises(ArchiveError):
+        import_profiles(io.BytesIO(b"not a tar at all"))
+    assert not (tmp_path / "evil.json").exists()
+
+
+def test_replace_is_all_or_nothing_and_clears_stale_segments(tmp_path, monkeypatch):
+    from astra.game import archive
+
+    src, dst = tmp_path / "a", tmp_path / "b"
+    src.mkdir()
+    dst.mkdir()
+    _make(src, monkeypatch, names=("p1",))
+    export_profiles(tmp_path / "p1.tar", ["p1"])
+
+    monkeypatch.chdir(dst)
+    save_state(replace(default_state(), day=99), profile="p1")
+    real_swap = archive._swap
+    calls = []
+
+    def failing_swap(d, new, aside):
+        calls.append(d)
+        if len(calls) == 2:  # hot dir already swapped in, segments fail
+            raise OSError("cold volume unavailable")
+        real_swap(d, new, aside)
+
+    monkeypatch.setattr(archive, "_swap", failing_swap)
+    r = import_profiles(tmp_path / "p1.tar", replace=True)
+    assert r["errors"] == 1 and "cold volume unavailable" in r["error_list"][0]
+    assert load_state(profile="p1").day == 99  # old profile restored
+    monkeypatch.setattr(archive, "_swap", real_swap)
+
+    assert not list((dst / "data" / "profiles").glob(".*"))
+
+
+def test_install_clears_stale_cold_segments(tmp_path, monkeypatch):
+    src, dst = tmp_path / "a", tmp_path / "b"
+    src.mkdir()
+    dst.mkdir()
+    _make(src, monkeypatch, names=("p1",))
+    export_profiles(tmp_path / "p1.tar", ["p1"])
+
+    monkeypatch.chdir(dst)
+    monkeypatch.setenv("ASTRA_DATA_COLD", str(tmp_path / "cold"))
+    stale = tmp_path / "cold" / "profiles" / "p1" / "logbook"
+    stale.mkdir(parents=True)  # only cold leftovers, no hot profile dir
+    (stale / "000099.jsonl").write_text('{"type": "command", "action": "tick", "seed": 777}\n', encoding="utf-8")
+
+    assert import_profiles(tmp_path / "p1.tar")["imported"] == 1
+    assert [x["seed"] for x in iter_logbook("p1")] == list(range(12))
+    assert not (stale / "000099.jsonl").exists()
+    assert not list((tmp_path / "cold" / "profiles").glob(".*"))
+
+
+def test_sqlite_import_rolls_back_when_profile_files_cannot_be_placed(tmp_path, monkeypatch):
+    from astra.game import archive
+
+    src, dst = tmp_path / "a", tmp_path / "b"
+    src.mkdir()
+    dst.mkdir()
+    _make(src, monkeypatch, names=("p1",))
+    (src / "data" / "profiles" / "p1" / "balance_sweep.csv").write_text("xp\n3\n", encoding="utf-8")
+    export_profiles(tmp_path / "p1.tar", ["p1"])
+
+    monkeypatch.chdir(dst)
+    db = dbmod.enable_db()
+
+    def broken_replace(a, b):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(archive.os, "replace", broken_replace)
+    assert import_profiles(tmp_path / "p1.tar")["errors"] == 1
+    assert "p1" not in db.profiles()
+    monkeypatch.undo()
+    monkeypatch.chdir(dst)
+    assert import_profiles(tmp_path / "p1.tar")["imported"] == 1
+    assert (dst / "data" / "profiles" / "p1" / "balance_sweep.csv").exists()
@@ -0,0 +1,86 @@
+from pathlib import Path
+
+from astra.cli import main
+from astra.game.logbook import append_command, iter_logbook
+from astra.game.profiles import list_profiles, profile_dir, read_index, shard_of
+from astra.game.state import default_state
+from astra.game.storage import load_state, save_state, state_path
+
+
+def test_flat_is_default_and_indexed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_state(default_state(), profile="p1")
+    append_command("p1", "tick", seed=1)
+    assert state_path("p1") == Path("data/profiles/p1/game_state.json")
+    assert Path("data/profiles/index.tsv").read_text(encoding="utf-8") == "p1\tp1\n"
+    assert list_profiles() == ["p1"] and "p2" not in read_index()
+
+
+def test_legacy_tree_is_indexed_on_first_use(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    for name in ("old1", "old2"):
+        Path("data/profiles", name).mkdir(parents=True)
+        Path("data/profiles", name, "game_state.json").write_text('{"schema_version": 3, "day": 42}', encoding="utf-8")
+
+    main(["profiles", "list"])
+    assert "- count: 2" in capsys.readouterr().out
+    assert load_state(profile="old1").day == 42
+
+
+def test_first_new_profile_in_a_legacy_tree_keeps_the_old_ones(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    Path("data/profiles/old").mkdir(parents=True)
+    save_state(default_state(), profile="new")
+    assert list_profiles() == ["new", "old"]
+
+
+def test_sharded_layout_keeps_legacy_flat_profiles(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    legacy = Path("data/profiles/old")
+    legacy.mkdir(parents=True)
+    (legacy / "game_state.json").write_text('{"schema_version": 3, "day": 7}', encoding="utf-8")
+
+    assert main(["profiles", "shard"]) == 0
+    assert list_profiles() == ["old"]  # picked up by the one-time scan
+
+    save_state(default_state(), profile="new")
+    append_command("new", "tick", seed=1)
+    d = Path("data/profiles") / shard_of("new") / "new"
+    assert profile_dir("new") == d
+    assert (d / "game_state.json").exists() and (d / "logbook.jsonl").exists()
+    assert not Path("data/profiles/new").exists()
+    assert [r["action"] for r in iter_logbook("new")] == ["tick"]
+
+    assert load_state(profile="old").day == 7
+    save_state(load_state(profile="old"), profile="old")
+    assert (legacy / "game_state.json").exists()
+
+    main(["profiles", "list"])
+    out = capsys.readouterr().out
+    assert "- layout: sharded" in out and "- count: 2" in out
+
+
+def test_create_recovers_a_removed_profile_dir(tmp_path, monkeypatch):
+    import shutil
+
+    monkeypatch.chdir(tmp_path)
+    save_state(default_state(), profile="p1")
+    shutil.rmtree(profile_dir("p1"))
+    save_state(default_state(), profile="p1")
+    assert state_path("p1").exists()
+
+
+def test_reindex_tells_flat_hex_profiles_from_shard_dirs(tmp_path, monkeypatch):
+    from astra.game.profiles import enable_sharding, rebuild_index
+
+    monkeypatch.chdir(tmp_path)
+    root = Path("data/profiles")
+    (root / "ab").mkdir(parents=True)  # empty flat profile with a hex-looking name
+    (root / "cd").mkdir()
+    (root / "cd" / "game_state.json").write_text("{}", encoding="utf-8")
+    enable_sharding()
+    save_state(default_state(), profile="new")
+    (root / "index.tsv").unlink()
+
+    assert rebuild_index() == 3
+    assert list_profiles() == ["ab", "cd", "new"]
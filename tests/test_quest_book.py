@@ -0,0 +1,47 @@
+from astra.game.engine import tick_day, tick_days
+from astra.game.state import GameState, QuestBook, QuestState, default_state
+
+
+def test_lookup_and_put_share_entries_and_index():
+    book = default_state().quests
+    assert "q_ticks_3" in book
+    assert book.get("q_ticks_3") == QuestState("q_ticks_3", "active", 0)
+    assert book.get("missing") is None
+
+    b2 = book.put(QuestState("q_ticks_3", "active", 1))
+    assert [q.quest_id for q in b2] == [q.quest_id for q in book]
+    assert b2[0] is book[0] and b2[2] is book[2]
+    assert b2._index is book._index
+    assert book.put(book[1]) is book
+
+    b3 = b2.put(QuestState("q_extra"))
+    assert len(b3) == 4 and b3.get("q_extra").status == "active"
+
+
+def test_of_normalizes_dict_and_object_quests():
+    book = QuestBook.of([{"quest_id": "q_ticks_3", "status": "active", "progress": 2}, "junk"])
+    assert book.items == (QuestState("q_ticks_3", "active", 2),)
+    assert QuestBook.of(book) is book
+
+
+def test_tick_keeps_golden_dicts_and_shares_unchanged_books():
+    s = default_state()
+    for _ in range(3):
+        s, _txt, _events = tick_day(s, seed=1)
+    assert s.to_dict()["quests"][1] == {"quest_id": "q_ticks_3", "status": "completed", "progress": 3}
+    s4, _txt, _events = tick_day(s, seed=1)
+    assert s4.quests is s.quests
+
+
+def test_dict_quests_from_old_callers_tick_like_before():
+    s = GameState(quests=[{"quest_id": "q_ticks_3", "status": "active", "progress": 1}])
+    s2, _txt, _events = tick_days(s, 2)
+    assert s2.to_dict()["quests"] == [{"quest_id": "q_ticks_3", "status": "completed", "progress": 3}]
+
+
+def test_from_dict_keeps_shared_default_entries():
+    d = default_state().to_dict()
+    d["quests"][1]["progress"] = 2
+    s = GameState.from_dict(d)
+    assert s.quests[0] is default_state().quests[0]
+    assert s.quests.get("q_ticks_3").progress == 2
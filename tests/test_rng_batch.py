@@ -0,0 +1,33 @@
+import pytest
+
+from astra.game import rng
+from astra.game.rng import Rng, next_seed, rng_raw15, rng_raw15_batch, seed_stream
+
+
+def _expected_stream(seed: int, n: int) -> list[int]:
+    out = []
+    for _ in range(n):
+        seed = next_seed(seed)
+        out.append(seed)
+    return out
+
+
+@pytest.mark.parametrize("numpy", [False, True])
+def test_batch_matches_scalar(numpy, monkeypatch):
+    if numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(rng, "np", None)
+
+    seeds = [0, 1, 123, 999, 0x7FFFFFFF]
+    assert rng_raw15_batch(seeds).tolist() == [rng_raw15(s) for s in seeds]
+    for odd in ([-1, -123, -(2**40), 5], [2**64 + 3, -(2**70), 7], [2**63 + 9]):  # negative and wide seeds
+        assert rng_raw15_batch(odd).tolist() == [rng_raw15(s) for s in odd]
+
+    for n in (0, 1, 2, 7, 64, 1000):
+        assert seed_stream(123, n).tolist() == _expected_stream(123, n)
+
+    a, b = Rng(999), Rng(999)
+    draws = b.fill(500).tolist()
+    assert draws == [int(a.random() * 32768) for _ in range(500)]
+    assert a.seed == b.seed
@@ -0,0 +1,22 @@
+from astra.game.rng import Rng, next_seed, seed_at
+
+
+def test_seed_at_matches_repeated_steps():
+    for seed in (0, 1, 123, 999, 0x7FFFFFFF):
+        s = seed
+        for n in range(1, 70):
+            s = next_seed(s)
+            assert seed_at(seed, n) == s
+    assert seed_at(123, 0) == 123
+    assert (seed_at(-1, 0), seed_at(2**31 + 5, 0)) == (0x7FFFFFFF, 5)  # the 31-bit state, as for any n
+    assert next_seed(seed_at(-7, 0)) == seed_at(-7, 1)
+
+
+def test_rng_jump_matches_draws():
+    a = Rng(123)
+    for _ in range(1000):
+        a.randint(0, 9)
+    b = Rng(123).jump(1000)
+    assert a.seed == b.seed
+    assert a.randint(1, 100) == b.randint(1, 100)
+    assert seed_at(999, 2**31) == seed_at(999, 0)
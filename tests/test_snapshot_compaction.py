@@ -0,0 +1,80 @@
+import json
+from collections import OrderedDict
+
+from astra.game import logbook
+from astra.game.actions import apply_action
+from astra.game.logbook import append_snapshot, append_tx, iter_logbook, logbook_path
+from astra.game.profiles import profile_dir
+from astra.game.replay import replay_state
+from astra.game.state import default_state
+
+
+def _play(profile: str, steps: int, **kw):
+    s = default_state()
+    kinds = []
+    for i in range(steps):
+        if i % 3 == 2:
+            s, _t, events = apply_action(s, "move", sector="Mostek" if s.ship.sector == "AIRI" else "AIRI")
+            append_tx(profile, "move", events, sector=s.ship.sector)
+        else:
+            s, _t, events = apply_action(s, "tick", seed=100 + i)
+            append_tx(profile, "tick", events, seed=100 + i)
+        kinds.append(append_snapshot(profile, s, **kw))
+        assert replay_state(profile=profile) == s
+    return s, kinds
+
+
+def test_keyframes_and_deltas_replay(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    s, kinds = _play("p1", 9, keyframe_every=4)
+    assert kinds[:5] == ["full", "delta", "delta", "delta", "full"]
+    snaps = [r for r in iter_logbook("p1") if r.get("type") == "snapshot"]
+    assert all("fp" in r for r in snaps)
+    assert all(r["base"] == snaps[0]["fp"] for r in snaps[1:4])
+    assert len(json.dumps(snaps[1])) < len(json.dumps(snaps[0]))
+
+
+def test_unchanged_state_is_not_snapshotted_again(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    s, _ = _play("p1", 2)
+    n = len(list(iter_logbook("p1")))
+    assert append_snapshot("p1", s) == "skipped"
+    assert append_snapshot("p1", s, fmt="bin") == "skipped"
+    assert len(list(iter_logbook("p1"))) == n
+    assert replay_state(profile="p1") == s
+
+
+def test_delta_without_its_keyframe_falls_back_to_commands(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    s, _ = _play("p1", 5, keyframe_every=8)
+    p = logbook_path("p1")
+    lines = p.read_text("utf-8").splitlines()
+    lines.remove(next(x for x in lines if '"state"' in x))  # drop the only keyframe
+    p.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    assert replay_state(profile="p1") == s
+
+
+def test_keyframe_is_written_only_when_cut(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(logbook, "_KEYS", OrderedDict())
+    head, key = profile_dir("p1") / logbook.SNAPSHOT_HEAD, profile_dir("p1") / logbook.SNAPSHOT_KEY
+    s, kinds = _play("p1", 2, keyframe_every=4)
+    assert kinds == ["full", "delta"]
+    assert set(json.loads(head.read_text("utf-8"))) == {"fp", "key_fp", "n"}
+    ino = key.stat().st_ino
+    logbook._KEYS.clear()  # another process: the keyframe comes from the key file
+    s, _t, _ev = apply_action(s, "tick", seed=7)
+    assert append_snapshot("p1", s, keyframe_every=4) == "delta"
+    assert key.stat().st_ino == ino  # deltas leave the keyframe alone
+
+
+def test_key_file_of_another_keyframe_cuts_a_new_one(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(logbook, "_KEYS", OrderedDict())
+    s, _ = _play("p1", 2, keyframe_every=8)
+    key = profile_dir("p1") / logbook.SNAPSHOT_KEY
+    key.write_text(json.dumps({"fp": "other", "state": default_state().to_dict()}), encoding="utf-8")
+    logbook._KEYS.clear()
+    s, _t, _ev = apply_action(s, "tick", seed=7)
+    assert append_snapshot("p1", s, keyframe_every=8) == "full"
+    assert replay_state(profile="p1") == s
@@ -0,0 +1,58 @@
+import json
+from dataclasses import replace
+
+from astra.game.state import GameState, default_state
+from astra.game.storage import STATE_CACHE, StateCache, load_state, save_state, state_path
+
+
+def test_repeated_loads_hit_the_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    STATE_CACHE.invalidate()
+    save_state(replace(default_state(), day=3), profile="p1")
+    STATE_CACHE.invalidate()
+
+    h0, m0 = STATE_CACHE.hits, STATE_CACHE.misses
+    a = load_state(profile="p1")
+    b = load_state(profile="p1")
+    assert a is b and a.day == 3
+    assert (STATE_CACHE.hits - h0, STATE_CACHE.misses - m0) == (1, 1)
+
+
+def test_save_and_external_edits_are_seen(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_state(replace(default_state(), day=1), profile="p1")
+    assert load_state(profile="p1").day == 1
+
+    s2 = replace(default_state(), day=2)
+    save_state(s2, profile="p1")
+    h = STATE_CACHE.hits
+    assert load_state(profile="p1") == s2  # save_state primes the cache
+    assert STATE_CACHE.hits == h + 1
+
+    d = s2.to_dict()
+    d["day"] = 12
+    state_path("p1").write_text(json.dumps(d), encoding="utf-8")  # edited behind our back
+    assert load_state(profile="p1").day == 12
+
+
+def test_primed_entry_equals_a_cold_read(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for fmt in ("json", "bin"):
+        save_state(GameState(day=2, achievements=["x"]), profile="p1", fmt=fmt)
+        warm = load_state(profile="p1")
+        STATE_CACHE.invalidate()
+        cold = load_state(profile="p1")
+        assert warm == cold and len(warm.quests) == 3
+
+
+def test_lru_evicts_oldest(tmp_path):
+    cache = StateCache(maxsize=2)
+    paths = []
+    for i in range(3):
+        p = tmp_path / f"s{i}.json"
+        p.write_text(json.dumps(replace(default_state(), day=i).to_dict()), encoding="utf-8")
+        paths.append(p)
+        cache.get(p, p.stat())
+    assert cache.info()["size"] == 2
+    cache.get(paths[0], paths[0].stat())
+    assert (cache.hits, cache.misses) == (0, 4)
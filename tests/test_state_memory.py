@@ -0,0 +1,47 @@
+import pytest
+
+from astra.game.bench import state_memory
+from astra.game.reducer import reduce
+from astra.game.state import GameState, QuestBook, default_state
+
+# measured ~259 bytes/state (421 before slots + tuples) and ~369 loaded (736 before)
+MAX_BYTES_PER_STATE = 320
+MAX_BYTES_PER_LOADED_STATE = 450
+
+
+def test_states_are_slotted():
+    s = default_state()
+    assert not hasattr(s, "__dict__")
+    assert not hasattr(s.ship, "__dict__")
+    with pytest.raises(AttributeError):
+        object.__setattr__(s, "extra", 1)
+
+
+def test_lists_are_stored_as_tuples():
+    s = GameState(achievements=["a"], quests=[])
+    assert s.achievements == ("a",)
+    assert s.quests == QuestBook()
+    assert s.to_dict()["achievements"] == ["a"]
+
+
+def test_successive_states_share_unchanged_parts():
+    s1 = reduce(default_state(), "tick", seed=123).state
+    s2 = reduce(s1, "tick", seed=123).state
+    assert s2.achievements is s1.achievements
+    s3 = reduce(s2, "move", sector="AIRI").state
+    assert s3.quests is s2.quests
+    assert s3.player is s2.player
+
+
+def test_loaded_states_intern_strings():
+    d = default_state().to_dict()
+    a = GameState.from_dict({**d, "ship": {**d["ship"], "sector": "".join(["Sek", "tor"])}})
+    b = GameState.from_dict({**d, "ship": {**d["ship"], "sector": "".join(["Sekt", "or"])}})
+    assert a.ship.sector is b.ship.sector
+    assert a.quests == default_state().quests
+
+
+def test_state_memory_hold_the_line():
+    r = state_memory(2000)
+    assert 0 < r["bytes_per_state"] <= MAX_BYTES_PER_STATE
+    assert 0 < r["bytes_per_loaded_state"] <= MAX_BYTES_PER_LOADED_STATE
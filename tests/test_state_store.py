@@ -0,0 +1,80 @@
+import os
+import stat
+import time
+from dataclasses import replace
+
+import pytest
+
+from astra.game import storage
+from astra.game.state import default_state
+from astra.game.storage import load_state, save_state, state_path
+from astra.game.store import StateStore
+
+
+def _day(n):
+    return replace(default_state(), day=n)
+
+
+def test_save_state_is_atomic_on_failure(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    save_state(_day(1), profile="p1")
+
+    def boom(*_a, **_k):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(storage.os, "replace", boom)
+    with pytest.raises(OSError):
+        save_state(_day(2), profile="p1")
+    assert load_state(profile="p1").day == 1
+    assert os.listdir(state_path("p1").parent) == ["game_state.json"]  # no temp file left behind
+
+
+def test_write_through_writes_every_save(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with StateStore("p1", fsync="never") as st:
+        st.save(_day(1))
+        st.save(_day(2))
+        assert (st.saves, st.writes) == (2, 2)
+    assert load_state(profile="p1").day == 2
+
+
+def test_write_behind_coalesces_every_n(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    st = StateStore("p1", write_behind=True, every=10, interval=60)
+    for d in range(1, 26):
+        st.save(_day(d))
+    assert st.writes == 2
+    assert load_state(profile="p1").day == 20
+    assert st.load().day == 25  # pending state is visible through the store
+    st.close()
+    assert st.writes == 3
+    assert load_state(profile="p1").day == 25
+    with pytest.raises(RuntimeError):
+        st.save(_day(26))
+
+
+def test_write_behind_flushes_after_interval(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with StateStore("p1", write_behind=True, interval=0.05) as st:
+        st.save(_day(7))
+        deadline = time.monotonic() + 5
+        while st.pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not st.pending
+        assert load_state(profile="p1").day == 7
+
+
+def test_bad_policy_is_rejected():
+    with pytest.raises(ValueError, match="fsync"):
+        StateStore("p1", fsync="sometimes")
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permission bits")
+def test_atomic_write_keeps_plain_write_permissions(tmp_path):
+    p = tmp_path / "a.json"
+    storage.atomic_write(p, b"{}", fsync="never")
+    (tmp_path / "plain.json").write_bytes(b"{}")
+    assert stat.S_IMODE(p.stat().st_mode) == stat.S_IMODE((tmp_path / "plain.json").stat().st_mode)
+    p.chmod(0o640)
+    storage.atomic_write(p, b"[]", fsync="never")
+    assert stat.S_IMODE(p.stat().st_mode) == 0o640  # an existing file keeps its mode
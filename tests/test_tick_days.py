@@ -0,0 +1,42 @@
+from dataclasses import replace
+
+import pytest
+
+from astra.game.engine import tick_day, tick_days
+from astra.game.rng import seed_stream
+from astra.game.state import default_state
+
+
+def _sequential(state, seeds):
+    txt, events = [], []
+    for seed in seeds:
+        state, t, e = tick_day(state, seed=seed)
+        txt += t
+        events += e
+    return state, txt, events
+
+
+@pytest.mark.parametrize(
+    "seeds",
+    [
+        [123] * 5,
+        [None] * 40,
+        [999, None, None, 123, None, 7],
+        list(seed_stream(123, 1000)),
+    ],
+)
+def test_tick_days_matches_sequential(seeds):
+    s0 = replace(default_state(), last_seed=999)
+    a, a_txt, a_ev = _sequential(s0, seeds)
+    b, b_txt, b_ev = tick_days(s0, len(seeds), seed_schedule=seeds)
+    assert b.to_dict() == a.to_dict()
+    assert b_txt == a_txt
+    assert b_ev == a_ev
+
+
+def test_tick_days_edges():
+    s0 = default_state()
+    assert tick_days(s0, 0) == (s0, [], [])
+    assert tick_days(s0, 3)[0].to_dict() == _sequential(s0, [None] * 3)[0].to_dict()
+    with pytest.raises(ValueError):
+        tick_days(s0, 2, seed_schedule=[1])
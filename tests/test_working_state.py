@@ -0,0 +1,36 @@
+from astra.game.balance import BalanceConfig
+from astra.game.reducer import reduce, reduce_inplace
+from astra.game.state import default_state
+from astra.game.working import WorkingState, thaw
+
+ACTIONS = [
+    ("tick", {"seed": 123}),
+    ("move", {"sector": "Sektor A-1"}),
+    ("move", {"sector": "NOPE-404"}),
+    ("tick", {"seed": -1}),
+    ("tick", {}),
+    ("jump", {}),
+] + [("tick", {"seed": s}) for s in range(1, 60)]
+
+
+def test_reduce_inplace_matches_reduce():
+    cfg = BalanceConfig(xp_per_tick=5, anomaly_hull_loss=3, anomaly_power_loss=4)
+    s = default_state()
+    ws = thaw(s)
+    for action, kw in ACTIONS:
+        r1 = reduce(s, action, balance=cfg, **kw)
+        r2 = reduce_inplace(ws, action, balance=cfg, **kw)
+        assert r2.state is ws
+        assert (r2.text, r2.events, r2.errors) == (r1.text, r1.events, r1.errors)
+        assert ws.to_dict() == r1.state.to_dict()
+        s = r1.state
+    assert ws.freeze().to_dict() == s.to_dict()
+
+
+def test_freeze_does_not_alias_working_lists():
+    ws = WorkingState.thaw(default_state())
+    frozen = ws.freeze()
+    reduce_inplace(ws, "tick", seed=123, balance=BalanceConfig())
+    assert frozen.day == 0
+    assert frozen.achievements == ()
+    assert [q.progress for q in frozen.quests] == [0, 0, 0]